@@ -12,14 +12,42 @@ Autor: AI Assistant
 Versión: 1.0
 """
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+import csv
 import re
 import os
 import sys
-from typing import Dict, List, Tuple, Optional, Union
+from typing import BinaryIO, Dict, List, Tuple, Optional, Union
+
+from backend.services.cpm import calcular_cpm, actualizar_actividad
+from backend.services.schedule_graph import ScheduleGraph, separar_predecesoras
+from backend.services.work_calendar import WorkCalendar, obtener_calendario, fines_con_calendarios
+from backend.services.resource_leveling import PREFIJO_RECURSO, nivelar_recursos
+from backend.services.risk_simulation import simular_riesgo
+from backend.services.schedule_snapshot import ScheduleSnapshot, guardar_snapshot
+from backend.services.schedule_store import ScheduleStore
+from backend.services.reachability import LIMITE_CIERRE, obtener_alcance, aristas_redundantes
+from backend.services.dependency_validation import validar_red, describir_ciclos
+from backend.services.keyword_matcher import KeywordAutomaton
+from backend.services.mspdi_import import leer_mspdi
+from backend.services.parse_cache import CAPACIDAD_CACHE, ParseCache, clave_archivo, clave_texto
+from backend.services.text_parsing import extraer_actividad, extraer_actividades
+from backend.services.table_ingestion import (MESES, PATRON_FECHA_ESPANOL, InputError, abrir_en_memoria,
+                                      extraer_duraciones_dias, formato_archivo, leer_csv_por_bloques,
+                                      leer_encabezado_excel, leer_excel_por_bloques, leer_primera_columna_csv,
+                                      normalizar_encabezado, normalizar_tabla, olfatear_csv,
+                                      parsear_fechas_espanol, posicion_hoja, rebobinar)
+
+# Campo del formato con comillas anidadas: texto, comillas dobles literales o un
+# tramo entre comillas (hasta la comilla de cierre o el final), seguido de coma o fin
+_CAMPO_CSV_ESPECIAL = re.compile(r'((?:[^",]+|""|"(?:[^"]+|"")*(?:"|\Z))*)(,|\Z)')
+
+# Fila cuyos campos el módulo csv lee igual que `_parsear_fila_csv_especial`
+_FILA_CSV_SIMPLE = re.compile(r'(?:"[^"\n\r]+"|[^",\n\r]*)(?:,(?:"[^"\n\r]+"|[^",\n\r]*))*')
 
 # Importar servicio de Gemini
 try:
@@ -45,9 +73,44 @@ class AIBuilderScheduler:
     def __init__(self, fecha_inicio=None):
         """Inicializa el scheduler con configuraciones por defecto."""
         self.df_actividades = None
+        self.grafo = None  # ScheduleGraph del último cronograma generado
         self.fecha_inicio = fecha_inicio if fecha_inicio else datetime.now().date()
         self.conversacion_activa = True
         
+        # Calendario laboral del proyecto (por defecto todos los días son laborables)
+        # y calendarios por actividad, referenciados por nombre en la columna Calendario
+        self.calendario = obtener_calendario()
+        self.calendarios: Dict[str, WorkCalendar] = {}
+        
+        # Capacidad diaria de cada recurso (columnas Recurso_<nombre>). Si hay
+        # capacidades configuradas el cronograma se programa con recursos limitados
+        self.capacidades_recursos: Dict[str, float] = {}
+        
+        # Reducción transitiva opcional tras leer la entrada y dependencias que quitó
+        self.reduccion_transitiva = False
+        self.dependencias_eliminadas: List[Tuple[str, str]] = []
+        
+        # Informe de validación de dependencias del último cronograma generado
+        self.validacion: Optional[Dict] = None
+        
+        # Procesos para extraer actividades de textos largos (None: uno por CPU)
+        self.procesos_texto: Optional[int] = None
+        
+        # Hoja a leer de los archivos de Excel: nombre o posición (None: la primera)
+        self.hoja_excel: Optional[Union[str, int]] = None
+        
+        # Lecturas anteriores por contenido: repetir un archivo o una descripción no
+        # los vuelve a leer. Las lecturas que terminaron en un respaldo no se guardan
+        self.cache_lecturas = ParseCache()
+        self._lectura_cacheable = True
+        self._fecha_leida = None
+        
+        # Almacén de snapshots compartido entre procesos (ver `configurar_almacen`),
+        # proyecto que se publica en él y versión cargada en este proceso
+        self.almacen: Optional[ScheduleStore] = None
+        self.proyecto: Optional[str] = None
+        self.version_cargada: Optional[int] = None
+        
         # Patrones para extraer información de texto natural
         self.patrones_actividades = {
             'excavacion': ['excavación', 'excavar', 'excavado', 'movimiento de tierras'],
@@ -58,6 +121,48 @@ class AIBuilderScheduler:
             'instalaciones': ['instalaciones', 'plomería', 'electricidad', 'gas'],
             'acabados': ['acabados', 'pintura', 'pisos', 'revestimientos']
         }
+        
+        # Duración estimada por tipo de actividad (en días)
+        self.duraciones_estimadas = {
+            'excavacion': 5,
+            'cimentacion': 10,
+            'estructura': 15,
+            'muros': 8,
+            'techos': 6,
+            'instalaciones': 12,
+            'acabados': 10
+        }
+        
+        # Autómata con todas las palabras clave, para detectarlas en una sola pasada
+        self.automata_actividades = KeywordAutomaton(self.patrones_actividades)
+    
+    @property
+    def grafo(self) -> Optional[ScheduleGraph]:
+        """
+        ScheduleGraph del último cronograma. El de un cronograma cargado de un
+        snapshot se arma la primera vez que se usa (ver `cargar_cronograma`).
+        """
+        if self._snapshot_grafo is not None:
+            snapshot, self._snapshot_grafo = self._snapshot_grafo, None
+            self._grafo = self._grafo_de_snapshot(snapshot)
+        return self._grafo
+    
+    @grafo.setter
+    def grafo(self, grafo: Optional[ScheduleGraph]) -> None:
+        self._grafo = grafo
+        self._snapshot_grafo = None
+    
+    def _grafo_de_snapshot(self, snapshot: ScheduleSnapshot) -> Optional[ScheduleGraph]:
+        grafo = snapshot.grafo()
+        if 'Calendario' in snapshot.metadatos['columnas']:
+            try:
+                self._aplicar_calendarios(grafo, snapshot.tabla.column('Calendario').to_pandas())
+            except ValueError as e:
+                # Sin el calendario registrado no se puede editar con el grafo guardado;
+                # la próxima edición regenera el cronograma e informa el error
+                print(f"⚠️ {e}")
+                return None
+        return grafo
     
     def configurar_fecha_inicio(self, fecha_inicio):
         """
@@ -83,259 +188,476 @@ class AIBuilderScheduler:
         
         print(f"Fecha de inicio configurada: {self.fecha_inicio}")
         
-        # Si ya hay un cronograma, recalcularlo con la nueva fecha
-        if self.df_actividades is not None:
-            print("Recalculando cronograma con nueva fecha de inicio...")
-            # Crear una copia del DataFrame sin las columnas de fecha
-            df_sin_fechas = self.df_actividades[['Actividad', 'Duración', 'Predecesoras']].copy()
-            self.df_actividades = self.generar_cronograma(df_sin_fechas)
-            print("Cronograma recalculado exitosamente")
+        # El cronograma guarda días hábiles desde la fecha de inicio, así que basta
+        # con mover la fecha de referencia: no hace falta recalcularlo
+        self._recalcular_si_hay_calendarios_propios()
         
         return True
+    
+    def configurar_calendario(self, weekmask: str = '1111100', feriados=None) -> WorkCalendar:
+        """
+        Configura el calendario laboral del proyecto.
         
-        # Duración estimada por tipo de actividad (en días)
-        self.duraciones_estimadas = {
-            'excavacion': 5,
-            'cimentacion': 10,
-            'estructura': 15,
-            'muros': 8,
-            'techos': 6,
-            'instalaciones': 12,
-            'acabados': 10
-        }
+        Args:
+            weekmask (str): Días laborables de lunes a domingo, p. ej. '1111100'
+            feriados (str o list, opcional): Nombre de un conjunto registrado o lista de fechas
+            
+        Returns:
+            WorkCalendar: Calendario configurado (compartido entre proyectos iguales)
+        """
+        self.calendario = obtener_calendario(weekmask, feriados)
+        print(f"Calendario del proyecto configurado: {self.calendario}")
+        
+        # Las duraciones ya están en días hábiles: solo cambian las fechas materializadas
+        self._recalcular_si_hay_calendarios_propios()
+        return self.calendario
     
-    def leer_entrada(self, entrada: str) -> pd.DataFrame:
+    def registrar_calendario(self, nombre: str, weekmask: str, feriados=None) -> WorkCalendar:
         """
-        Procesa la entrada del usuario (texto natural o ruta de archivo CSV).
+        Registra un calendario que las actividades pueden usar en la columna Calendario.
         
         Args:
-            entrada (str): Texto descriptivo del proyecto o ruta a archivo CSV
+            nombre (str): Nombre del calendario
+            weekmask (str): Días laborables de lunes a domingo
+            feriados (str o list, opcional): Nombre de un conjunto registrado o lista de fechas
             
         Returns:
-            pd.DataFrame: DataFrame con columnas [Actividad, Duración, Predecesoras]
+            WorkCalendar: Calendario registrado
+        """
+        self.calendarios[nombre] = obtener_calendario(weekmask, feriados)
+        return self.calendarios[nombre]
+    
+    def configurar_cache_lecturas(self, ruta_disco: Optional[str] = None,
+                                  capacidad: int = CAPACIDAD_CACHE) -> ParseCache:
         """
-        print(f"Procesando entrada: {entrada[:50]}...")
+        Reemplaza la caché de lecturas de entradas (la anterior se descarta).
         
-        # Verificar si es una ruta de archivo
-        if entrada.lower().endswith(('.csv', '.xlsx', '.xls')):
-            return self._leer_archivo(entrada)
-        else:
-            return self._procesar_texto_natural(entrada)
+        Args:
+            ruta_disco (str, opcional): Base SQLite donde copiar las lecturas para
+                conservarlas entre reinicios y compartirlas entre procesos
+            capacidad (int): Lecturas guardadas en memoria
+            
+        Returns:
+            ParseCache: Caché configurada
+        """
+        self.cache_lecturas = ParseCache(capacidad, ruta_disco)
+        print(f"Caché de lecturas configurada: {capacidad} en memoria"
+              + (f", copia en {ruta_disco}" if ruta_disco else ""))
+        return self.cache_lecturas
     
-    def _leer_archivo(self, ruta_archivo: str) -> pd.DataFrame:
+    def configurar_recursos(self, capacidades: Dict[str, float]) -> Dict[str, float]:
         """
-        Lee y procesa un archivo CSV o Excel.
+        Configura la capacidad diaria de los recursos y reprograma el cronograma actual.
+        
+        Las actividades indican su demanda en columnas Recurso_<nombre>. Los recursos
+        sin capacidad configurada se consideran ilimitados; un diccionario vacío
+        vuelve a la programación solo por precedencias.
         
         Args:
-            ruta_archivo (str): Ruta al archivo
+            capacidades (Dict[str, float]): Capacidad diaria por nombre de recurso
             
         Returns:
-            pd.DataFrame: DataFrame procesado
+            Dict[str, float]: Capacidades configuradas (nombres en minúsculas)
         """
-        try:
-            if ruta_archivo.endswith('.csv'):
-                # Leer el CSV con configuración específica para este formato
-                df = pd.read_csv(ruta_archivo, encoding='utf-8', sep=',', quotechar='"', skipinitialspace=True, doublequote=True)
-            else:
-                df = pd.read_excel(ruta_archivo)
+        nuevas = {}
+        for nombre, capacidad in capacidades.items():
+            capacidad = float(capacidad)
+            if capacidad < 0:
+                raise ValueError(f"Capacidad negativa para el recurso {nombre}")
+            nuevas[str(nombre).strip().lower()] = capacidad
+        anteriores, self.capacidades_recursos = self.capacidades_recursos, nuevas
+        print(f"Recursos configurados: {nuevas}")
+        
+        if self.df_actividades is not None:
+            try:
+                self.df_actividades = self.generar_cronograma(self.df_actividades)
+            except ValueError:
+                self.capacidades_recursos = anteriores
+                raise
+        return self.capacidades_recursos
+    
+    def _recalcular_si_hay_calendarios_propios(self) -> None:
+        """
+        Recalcula el cronograma actual si alguna actividad usa un calendario propio,
+        ya que su duración efectiva depende de las fechas reales.
+        """
+        if self.df_actividades is not None and self.grafo is not None and self.grafo.ajuste_fin is not None:
+            print("Recalculando cronograma por calendarios de actividad...")
+            self.df_actividades = self.generar_cronograma(self.df_actividades)
+    
+    def leer_entrada(self, entrada: Union[str, bytes, BinaryIO], reducir: Optional[bool] = None,
+                     hoja: Optional[Union[str, int]] = None) -> pd.DataFrame:
+        """
+        Procesa la entrada del usuario (texto natural, ruta de archivo CSV/Excel/
+        MS Project XML o archivo en memoria).
+        
+        Args:
+            entrada (str | bytes | BinaryIO): Texto descriptivo del proyecto, ruta a
+                archivo CSV/Excel/XML, o contenido de un archivo (bytes u objeto de archivo
+                binario, p. ej. el flujo de un archivo subido) cuyo formato se detecta
+                por sus primeros bytes
+            reducir (bool, opcional): Quitar dependencias redundantes; por defecto
+                usa `self.reduccion_transitiva`
+            hoja (str | int, opcional): Hoja a leer si la entrada es un archivo de
+                Excel; por defecto `self.hoja_excel`
             
-            # Normalizar nombres de columnas
-            df.columns = df.columns.str.strip().str.lower()
+        Returns:
+            pd.DataFrame: DataFrame con columnas [Actividad, Duración, Predecesoras]
             
-            # Verificar si es el formato con Nombre, Duracion, Comienzo, Fin
-            if 'nombre' in df.columns and 'duracion' in df.columns and 'comienzo' in df.columns:
-                print("Detectado formato con columnas Nombre, Duracion, Comienzo, Fin...")
-                return self._procesar_formato_nombre_duracion(df)
+        Raises:
+            InputError: Si el archivo se lee pero no es válido (ver `_leer_archivo`)
+        """
+        # El informe y las dependencias eliminadas del cronograma anterior no deben
+        # acompañar a un error de esta lectura
+        self.dependencias_eliminadas = []
+        self.validacion = None
+        
+        if not isinstance(entrada, str):
+            print("Procesando entrada: archivo en memoria...")
+            df = self._leer_con_cache(abrir_en_memoria(entrada), True, hoja)
+        # Verificar si es una ruta de archivo
+        elif entrada.lower().endswith(('.csv', '.xlsx', '.xls', '.xml')):
+            print(f"Procesando entrada: {entrada[:50]}...")
+            df = self._leer_con_cache(entrada, True, hoja)
+        else:
+            print(f"Procesando entrada: {entrada[:50]}...")
+            df = self._leer_con_cache(entrada, False, hoja)
+        
+        if self.reduccion_transitiva if reducir is None else reducir:
+            df, self.dependencias_eliminadas = self.reducir_dependencias(df)
+        return df
+    
+    def _leer_con_cache(self, entrada: Union[str, BinaryIO], es_archivo: bool,
+                        hoja: Optional[Union[str, int]] = None) -> pd.DataFrame:
+        """
+        Lee una entrada o recupera la lectura anterior del mismo contenido.
+        
+        La clave es el SHA-256 de los bytes del archivo (con su formato y hoja) o
+        del texto normalizado, junto con la versión del analizador; ver
+        `services.parse_cache`. La fecha de inicio detectada en el archivo se
+        guarda con la lectura y se vuelve a aplicar al recuperarla.
+        
+        Args:
+            entrada (str | BinaryIO): Ruta, archivo en memoria o texto
+            es_archivo (bool): Si la entrada es un archivo
+            hoja (str | int, opcional): Hoja de Excel a leer; por defecto `self.hoja_excel`
             
-            # Mapear nombres de columnas comunes
-            mapeo_columnas = {
-                'actividad': 'Actividad',
-                'tarea': 'Actividad',
-                'task': 'Actividad',
-                'nombre': 'Actividad',
-                'duracion': 'Duración',
-                'duration': 'Duración',
-                'dias': 'Duración',
-                'predecesoras': 'Predecesoras',
-                'predecessors': 'Predecesoras',
-                'dependencias': 'Predecesoras'
-            }
+        Returns:
+            pd.DataFrame: DataFrame con las actividades leídas
+        """
+        if es_archivo:
+            if hoja is None:
+                hoja = self.hoja_excel
+            formato = formato_archivo(entrada)
+            try:
+                clave = clave_archivo(entrada, formato, hoja if formato in ('xlsx', 'xls') else None)
+            except OSError:
+                # Archivo inaccesible: `_leer_archivo` informa el error
+                clave = None
+        else:
+            # El resultado cambia según se use Gemini o el análisis con regex
+            clave = clave_texto(entrada, GEMINI_AVAILABLE and get_gemini_service() is not None)
+        
+        guardada = self.cache_lecturas.obtener(clave) if clave else None
+        if guardada is not None:
+            df, fecha_leida = guardada
+            if fecha_leida is not None:
+                self.fecha_inicio = fecha_leida
+            print(f"Entrada recuperada de la caché: {len(df)} actividades")
+            return df.copy()
+        
+        self._lectura_cacheable = True
+        self._fecha_leida = None
+        df = self._leer_archivo(entrada, hoja) if es_archivo else self._procesar_texto_natural(entrada)
+        if clave and self._lectura_cacheable:
+            self.cache_lecturas.guardar(clave, (df.copy(), self._fecha_leida))
+        return df
+    
+    def validar_dependencias(self, df: pd.DataFrame) -> Dict:
+        """
+        Valida las predecesoras sin generar el cronograma: ciclos, autorreferencias
+        y nombres que no corresponden a ninguna actividad.
+        
+        Args:
+            df (pd.DataFrame): DataFrame con columnas [Actividad, Duración, Predecesoras]
             
-            df = df.rename(columns=mapeo_columnas)
+        Returns:
+            Dict: Informe de validación (ver `validar_red`)
+        """
+        return validar_red(ScheduleGraph.desde_dataframe(df))
+    
+    def reducir_dependencias(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Tuple[str, str]]]:
+        """
+        Quita las predecesoras redundantes (A -> C cuando ya existe A -> B -> C).
+        Las fechas y holguras no cambian, pero cada pasada recorre menos aristas.
+        
+        Args:
+            df (pd.DataFrame): DataFrame con columnas [Actividad, Duración, Predecesoras]
             
-            # Validar que existan las columnas necesarias
-            columnas_requeridas = ['Actividad', 'Duración']
-            for col in columnas_requeridas:
-                if col not in df.columns:
-                    raise ValueError(f"Columna '{col}' no encontrada en el archivo")
+        Returns:
+            Tuple[pd.DataFrame, List[Tuple[str, str]]]: DataFrame con la red mínima y
+            dependencias eliminadas como pares (predecesora, actividad)
+        """
+        if 'Predecesoras' not in df.columns or not len(df):
+            return df, []
+        
+        grafo = ScheduleGraph.desde_dataframe(df)
+        if grafo.n > LIMITE_CIERRE:
+            print(f"Reducción transitiva omitida: {grafo.n} actividades superan el límite de {LIMITE_CIERRE}")
+            return df, []
+        
+        try:
+            redundantes = np.flatnonzero(aristas_redundantes(grafo))
+        except ValueError as e:
+            # Con ciclos no hay reducción posible; la validación los informará
+            print(f"Reducción transitiva omitida: {e}")
+            return df, []
+        if not redundantes.size:
+            return df, []
+        
+        destino = np.searchsorted(grafo.pred_ptr, redundantes, side='right') - 1
+        origen = grafo.pred_idx[redundantes]
+        eliminadas = [(grafo.nombres[i], grafo.nombres[j]) for i, j in zip(origen.tolist(), destino.tolist())]
+        
+        # Reescribir solo las filas afectadas; las referencias que no se resolvieron se conservan
+        quitar: Dict[int, set] = {}
+        for i, j in zip(origen.tolist(), destino.tolist()):
+            quitar.setdefault(j, set()).add(i)
+        predecesoras = df['Predecesoras'].tolist()
+        for j, ids in quitar.items():
+            predecesoras[j] = ', '.join(p for p in separar_predecesoras(predecesoras[j])
+                                        if grafo.indice.resolver(p, aproximado=True) not in ids)
+        df = df.assign(Predecesoras=predecesoras)
+        
+        print(f"Reducción transitiva: {len(eliminadas)} de {grafo.num_aristas} dependencias redundantes eliminadas")
+        return df, eliminadas
+    
+    def _leer_archivo(self, ruta_archivo: Union[str, bytes, BinaryIO],
+                      hoja: Optional[Union[str, int]] = None) -> pd.DataFrame:
+        """
+        Lee y procesa un archivo CSV, Excel o MS Project XML (MSPDI).
+        
+        Args:
+            ruta_archivo (str | bytes | BinaryIO): Ruta al archivo o su contenido en
+                memoria; en ese caso el formato se detecta por la firma de los primeros bytes
+            hoja (str | int, opcional): Hoja de Excel a leer; por defecto `self.hoja_excel`
             
-            # Agregar columna Predecesoras si no existe
-            if 'Predecesoras' not in df.columns:
-                df['Predecesoras'] = ''
+        Returns:
+            pd.DataFrame: DataFrame procesado; si el archivo no se puede leer, el
+            proyecto de ejemplo
             
-            # Limpiar datos
-            df['Predecesoras'] = df['Predecesoras'].fillna('').astype(str)
-            df['Duración'] = pd.to_numeric(df['Duración'], errors='coerce')
+        Raises:
+            InputError: Si el archivo se lee pero no es válido: la hoja no existe,
+                faltan columnas requeridas o no contiene actividades
+        """
+        if hoja is None:
+            hoja = self.hoja_excel
+        try:
+            if not isinstance(ruta_archivo, str):
+                ruta_archivo = abrir_en_memoria(ruta_archivo)
+            formato = formato_archivo(ruta_archivo)
             
-            # Filtrar filas con duración válida
-            df = df[df['Duración'] > 0]
+            if formato == 'csv':
+                # Examinar solo los primeros KB (codificación, separador, encabezado)
+                # para ir directo al lector adecuado
+                muestra = olfatear_csv(ruta_archivo)
+                columnas = muestra['encabezado']
+                if self._es_formato_nombre_duracion(columnas):
+                    print("Detectado formato con columnas Nombre, Duracion, Comienzo, Fin...")
+                    if 'nombre' in columnas[0]:
+                        # Filas completas entre comillas en la primera columna: basta el módulo csv
+                        return self._procesar_formato_nombre_duracion(
+                            None, leer_primera_columna_csv(ruta_archivo, muestra['opciones']))
+                    df = pd.read_csv(rebobinar(ruta_archivo), **muestra['opciones'])
+                    df.columns = normalizar_encabezado(df.columns)
+                    return self._procesar_formato_nombre_duracion(df)
+                
+                # Formato estándar: lectura por bloques con memoria acotada
+                df = leer_csv_por_bloques(ruta_archivo, opciones=muestra['opciones'])
+            elif formato == 'xlsx':
+                # Solo se lee la hoja elegida, como flujo de filas
+                columnas = leer_encabezado_excel(ruta_archivo, hoja)
+                if self._es_formato_nombre_duracion(columnas):
+                    print("Detectado formato con columnas Nombre, Duracion, Comienzo, Fin...")
+                    df = pd.read_excel(rebobinar(ruta_archivo), sheet_name=hoja or 0)
+                    df.columns = normalizar_encabezado(df.columns)
+                    return self._procesar_formato_nombre_duracion(df)
+                
+                df = leer_excel_por_bloques(ruta_archivo, hoja)
+            elif formato == 'xml':
+                # MS Project: flujo de tareas con sus vínculos, sin cargar el XML completo
+                df, informe = leer_mspdi(rebobinar(ruta_archivo))
+                print(f"Proyecto de MS Project: {informe['omitidas']} tareas de resumen, hitos o nulas omitidas")
+                if informe['vinculos_aproximados']:
+                    print(f"{informe['vinculos_aproximados']} vínculos de otro tipo o con desfase "
+                          "se importaron como fin-comienzo sin desfase")
+                if informe['fecha_inicio']:
+                    self.fecha_inicio = self._fecha_leida = informe['fecha_inicio']
+                    print(f"Fecha de inicio detectada del archivo: {self.fecha_inicio}")
+            else:
+                with pd.ExcelFile(rebobinar(ruta_archivo)) as libro:
+                    df = libro.parse(posicion_hoja(hoja, libro.sheet_names))
+                df.columns = normalizar_encabezado(df.columns)
+                if self._es_formato_nombre_duracion(df.columns):
+                    print("Detectado formato con columnas Nombre, Duracion, Comienzo, Fin...")
+                    return self._procesar_formato_nombre_duracion(df)
+                
+                # Mapear columnas, limpiar datos y filtrar filas con duración válida
+                df = normalizar_tabla(df)
             
             print(f"Archivo leído exitosamente: {len(df)} actividades encontradas")
-            return df[['Actividad', 'Duración', 'Predecesoras']]
+            return df
             
+        except InputError:
+            # Archivo legible pero no válido (hoja, columnas): se informa al usuario
+            self._lectura_cacheable = False
+            raise
         except Exception as e:
             print(f"Error al leer archivo: {e}")
+            self._lectura_cacheable = False
             return self._crear_dataframe_ejemplo()
     
-    def _procesar_formato_nombre_duracion(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _es_formato_nombre_duracion(columnas) -> bool:
+        """Indica si el encabezado corresponde al formato con Nombre, Duracion, Comienzo, Fin."""
+        return 'nombre' in columnas and 'duracion' in columnas and 'comienzo' in columnas
+    
+    def _procesar_formato_nombre_duracion(self, df: Optional[pd.DataFrame],
+                                          filas: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Procesa el formato con columnas Nombre, Duracion, Comienzo, Fin.
         Este CSV tiene un formato especial donde los datos están en comillas anidadas.
         
         Args:
             df (pd.DataFrame): DataFrame con el formato nombre/duracion
+            filas (List[str], opcional): Primera columna ya leída (ver
+                `leer_primera_columna_csv`); si se indica, `df` no se usa
             
         Returns:
             pd.DataFrame: DataFrame procesado en formato estándar
         """
         try:
-            actividades_procesadas = []
-            fecha_inicio_proyecto = None
-            
             # Verificar si los datos están en la primera columna (formato con comillas anidadas)
-            primera_columna = df.columns[0].lower()
+            if filas is None and 'nombre' in df.columns[0].lower():
+                filas = [str(valor) for valor in df[df.columns[0]].tolist()]
             
-            if 'nombre' in primera_columna:
+            if filas is not None:
                 # Los datos están mezclados en la primera columna
-                # Necesitamos parsear cada fila manualmente
-                for _, row in df.iterrows():
-                    fila_str = str(row[df.columns[0]])
-                    
-                    if pd.isna(fila_str) or fila_str == 'nan':
-                        continue
-                    
-                    # Parsear la fila para extraer campos
-                    campos = self._parsear_fila_csv_especial(fila_str)
-                    
-                    if campos and len(campos) >= 7:
-                        nombre = campos[0]
-                        duracion_str = campos[4]
-                        comienzo_str = campos[5]
-                        fin_str = campos[6]
-                        
-                        # Extraer duración numérica
-                        if 'día' in duracion_str.lower():
-                            match = re.search(r'(\d+(?:[.,]\d+)?)\s*d[ií]as?', duracion_str, re.IGNORECASE)
-                            if match:
-                                duracion_num = float(match.group(1).replace(',', '.'))
-                                duracion_int = round(duracion_num)
-                                
-                                if duracion_int > 0:
-                                    # Parsear fecha de inicio
-                                    fecha_inicio = self._parsear_fecha_espanol(comienzo_str)
-                                    fecha_fin = self._parsear_fecha_espanol(fin_str)
-                                    
-                                    # Guardar la primera fecha de inicio válida
-                                    if fecha_inicio and not fecha_inicio_proyecto:
-                                        fecha_inicio_proyecto = fecha_inicio
-                                    
-                                    actividades_procesadas.append({
-                                        'Actividad': nombre,
-                                        'Duración': duracion_int,
-                                        'Predecesoras': ''
-                                    })
+                # Se parsea la columna completa de una vez
+                campos = [c for c in self._parsear_filas_csv_especiales([f for f in filas if f != 'nan'])
+                          if c and len(c) >= 7]
+                nombres = [c[0] for c in campos]
+                duraciones = [c[4] for c in campos]
+                comienzos = [c[5] for c in campos]
             else:
                 # Formato normal con columnas separadas
-                for _, row in df.iterrows():
-                    nombre = str(row['nombre']).strip()
-                    
-                    if pd.isna(nombre) or nombre == '' or nombre == 'nan':
-                        continue
-                    
-                    duracion_str = str(row['duracion']).strip()
-                    
-                    if 'día' in duracion_str.lower():
-                        match = re.search(r'(\d+(?:[.,]\d+)?)\s*d[ií]as?', duracion_str, re.IGNORECASE)
-                        if match:
-                            duracion_num = float(match.group(1).replace(',', '.'))
-                            duracion_int = round(duracion_num)
-                            
-                            if duracion_int > 0:
-                                # Intentar parsear fecha de inicio si existe
-                                if 'comienzo' in df.columns:
-                                    comienzo_str = str(row['comienzo'])
-                                    fecha_inicio = self._parsear_fecha_espanol(comienzo_str)
-                                    if fecha_inicio and not fecha_inicio_proyecto:
-                                        fecha_inicio_proyecto = fecha_inicio
-                                
-                                actividades_procesadas.append({
-                                    'Actividad': nombre,
-                                    'Duración': duracion_int,
-                                    'Predecesoras': ''
-                                })
+                nombres = [str(valor).strip() for valor in df['nombre'].tolist()]
+                presentes = [nombre not in ('', 'nan') for nombre in nombres]
+                nombres = [nombre for nombre, presente in zip(nombres, presentes) if presente]
+                duraciones = [str(valor).strip() for valor, presente in zip(df['duracion'].tolist(), presentes) if presente]
+                comienzos = None
+                if 'comienzo' in df.columns:
+                    comienzos = [str(valor) for valor, presente in zip(df['comienzo'].tolist(), presentes) if presente]
             
-            if not actividades_procesadas:
-                raise ValueError("No se encontraron actividades válidas en el archivo")
+            # Duraciones y fechas se convierten por columnas, no fila por fila
+            duracion_num = np.round(extraer_duraciones_dias(duraciones))
+            validas = duracion_num > 0
+            actividades_procesadas = pd.DataFrame({
+                'Actividad': np.array(nombres, dtype=object)[validas],
+                'Duración': duracion_num[validas].astype(np.int64),
+                'Predecesoras': ''
+            })
+            
+            # La fecha de inicio del proyecto es la primera fecha de comienzo válida
+            fecha_inicio_proyecto = None
+            if comienzos is not None:
+                fechas = parsear_fechas_espanol(np.array(comienzos, dtype=object)[validas])
+                con_fecha = np.flatnonzero(~np.isnat(fechas))
+                if con_fecha.size:
+                    fecha_inicio_proyecto = fechas[con_fecha[0]].item()
+            
+            if actividades_procesadas.empty:
+                raise InputError("No se encontraron actividades válidas en el archivo")
             
             # Si encontramos una fecha de inicio en el archivo, usarla
             if fecha_inicio_proyecto:
-                self.fecha_inicio = fecha_inicio_proyecto.date()
+                self.fecha_inicio = self._fecha_leida = fecha_inicio_proyecto.date()
                 print(f"Fecha de inicio detectada del archivo: {self.fecha_inicio}")
             
-            df_resultado = pd.DataFrame(actividades_procesadas)
+            df_resultado = actividades_procesadas
             print(f"Archivo procesado: {len(df_resultado)} actividades encontradas")
             return df_resultado
             
+        except InputError:
+            self._lectura_cacheable = False
+            raise
         except Exception as e:
             print(f"Error al procesar archivo: {e}")
             import traceback
             traceback.print_exc()
+            self._lectura_cacheable = False
             return self._crear_dataframe_ejemplo()
     
+    def _parsear_filas_csv_especiales(self, filas: List[str]) -> List[list]:
+        """
+        Parsea una columna completa de filas con el formato de `_parsear_fila_csv_especial`.
+        
+        Las filas cuyos campos son simples (sin comillas o completamente entre
+        comillas, sin comillas internas ni saltos de línea) se leen todas juntas con
+        el lector del módulo csv; el resto pasa por el tokenizador de una fila.
+        
+        Args:
+            filas (List[str]): Filas a parsear
+            
+        Returns:
+            List[list]: Campos de cada fila, en el mismo orden
+        """
+        simples = [_FILA_CSV_SIMPLE.fullmatch(fila) is not None for fila in filas]
+        lector = csv.reader([fila for fila, simple in zip(filas, simples) if simple])
+        
+        resultado = []
+        for fila, simple in zip(filas, simples):
+            if not simple:
+                resultado.append(self._parsear_fila_csv_especial(fila))
+                continue
+            campos = next(lector)
+            # Una coma final no abre un campo vacío
+            if fila.endswith(','):
+                campos.pop()
+            resultado.append([campo.strip() for campo in campos])
+        return resultado
+    
     def _parsear_fila_csv_especial(self, fila_str: str) -> list:
         """
         Parsea una fila del CSV que tiene campos separados por comas con comillas anidadas.
         Formato: "campo1","campo2",campo3,campo4,"campo5",...
         
+        Una comilla doble ("") es siempre una comilla literal y una comilla sola abre
+        o cierra un tramo donde las comas no separan campos. Cada campo se obtiene con
+        una sola expresión regular compilada.
+        
         Args:
             fila_str (str): String de la fila a parsear
             
         Returns:
             list: Lista de campos extraídos
         """
-        campos = []
-        actual = ""
-        dentro_comillas = False
-        
-        i = 0
-        while i < len(fila_str):
-            char = fila_str[i]
-            
-            if char == '"':
-                # Verificar si es comilla doble escapada
-                if i + 1 < len(fila_str) and fila_str[i + 1] == '"':
-                    actual += '"'
-                    i += 2
-                    continue
-                else:
-                    dentro_comillas = not dentro_comillas
-                    i += 1
-                    continue
-            
-            if char == ',' and not dentro_comillas:
-                # Fin de campo
-                campos.append(actual.strip())
-                actual = ""
-                i += 1
-                continue
-            
-            actual += char
-            i += 1
-        
-        # Agregar último campo
-        if actual:
-            campos.append(actual.strip())
+        if '"' not in fila_str:
+            campos = fila_str.split(',')
+            if not campos[-1]:
+                campos.pop()
+            return [campo.strip() for campo in campos]
         
+        campos = []
+        for crudo, separador in _CAMPO_CSV_ESPECIAL.findall(fila_str):
+            if '"' in crudo:
+                # "" es una comilla literal y las comillas sueltas se descartan
+                crudo = '"'.join(parte.replace('"', '') for parte in crudo.split('""'))
+            # El último campo solo se agrega si no está vacío
+            if separador or crudo:
+                campos.append(crudo.strip())
+            if not separador:
+                break
         return campos
     
     def _parsear_fecha_espanol(self, fecha_str: str):
@@ -353,23 +675,12 @@ class AIBuilderScheduler:
             return None
             
         try:
-            from datetime import datetime
-            
-            # Patrón para fechas en español: "DD mes YYYY H:MM a./p. m."
-            patron = r'(\d{1,2})\s+(\w+)\s+(\d{4})\s+(\d{1,2}):(\d{2})\s+(a\.|p\.)\s+m\.'
-            match = re.search(patron, fecha_str)
+            match = PATRON_FECHA_ESPANOL.search(fecha_str)
             
             if match:
                 dia, mes_str, año, hora, minuto, periodo = match.groups()
                 
-                # Mapeo de meses en español
-                meses = {
-                    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
-                    'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
-                    'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
-                }
-                
-                mes = meses.get(mes_str.lower())
+                mes = MESES.get(mes_str.lower())
                 if mes:
                     hora_int = int(hora)
                     if periodo == 'p.' and hora_int != 12:
@@ -417,27 +728,19 @@ class AIBuilderScheduler:
                         return df
                     else:
                         print("Gemini no pudo analizar el proyecto, usando fallback...")
+                        self._lectura_cacheable = False
                 else:
                     print("Gemini no configurado, usando fallback...")
             except Exception as e:
                 print(f"Error con Gemini: {e}, usando fallback...")
+                self._lectura_cacheable = False
         
         # Fallback: usar regex como antes
         print("Usando análisis con regex...")
-        actividades_extraidas = []
         
-        # Dividir el texto en líneas para procesar cada actividad
-        lineas = texto.split('\n')
-        
-        for linea in lineas:
-            linea = linea.strip()
-            if not linea:
-                continue
-            
-            # Intentar extraer actividad, duración y dependencias con regex
-            actividad_extraida = self._extraer_actividad_con_regex(linea)
-            if actividad_extraida:
-                actividades_extraidas.append(actividad_extraida)
+        # Extraer actividad, duración y dependencias de cada línea; los textos
+        # grandes se reparten por lotes en `self.procesos_texto` procesos
+        actividades_extraidas = extraer_actividades(texto, self.procesos_texto)
         
         # Si no se encontraron actividades con regex, usar el método anterior
         if not actividades_extraidas:
@@ -464,52 +767,7 @@ class AIBuilderScheduler:
         Returns:
             Optional[Dict]: Diccionario con la actividad extraída o None
         """
-        # Patrones regex para diferentes formatos
-        patrones = [
-            # Formato: "Actividad — X días (después de Predecesora)"
-            r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?\s*\(despu[eé]s de\s+(?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+)\)',
-            
-            # Formato: "Actividad - X días después de Predecesora"
-            r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?\s+despu[eé]s de\s+(?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+)',
-            
-            # Formato: "Actividad: X días después de Predecesora"
-            r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*:\s*(?P<duracion>\d+)\s*d[ií]as?\s+despu[eé]s de\s+(?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+)',
-            
-            # Formato: "Actividad: X días (Predecesora)"
-            r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*:\s*(?P<duracion>\d+)\s*d[ií]as?\s*\((?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+)\)',
-            
-            # Formato: "Actividad — X días (Predecesora)"
-            r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?\s*\((?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+)\)',
-            
-            # Formato: "Actividad — X días: Predecesora"
-            r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?\s*:\s*(?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+)',
-            
-            # Formato: "Actividad: X días Predecesora" (sin paréntesis)
-            r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*:\s*(?P<duracion>\d+)\s*d[ií]as?\s+(?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)(?:\s|$)',
-            
-            # Formato: "Actividad - X días"
-            r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?',
-            
-            # Formato: "Actividad: X días"
-            r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*:\s*(?P<duracion>\d+)\s*d[ií]as?',
-        ]
-        
-        for patron in patrones:
-            match = re.search(patron, linea, re.IGNORECASE)
-            if match:
-                actividad = match.group('actividad').strip()
-                duracion = int(match.group('duracion'))
-                
-                # Extraer predecesora si existe
-                predecesora = match.group('predecesora').strip() if 'predecesora' in match.groupdict() and match.group('predecesora') else ''
-                
-                return {
-                    'Actividad': actividad,
-                    'Duración': duracion,
-                    'Predecesoras': predecesora
-                }
-        
-        return None
+        return extraer_actividad(linea)
     
     def _procesar_por_patrones(self, texto: str) -> List[Dict]:
         """
@@ -522,19 +780,14 @@ class AIBuilderScheduler:
             List[Dict]: Lista de actividades extraídas
         """
         actividades_extraidas = []
-        texto_lower = texto.lower()
-        
-        # Buscar patrones de actividades
-        for tipo_actividad, patrones in self.patrones_actividades.items():
-            for patron in patrones:
-                if patron in texto_lower:
-                    duracion = self.duraciones_estimadas[tipo_actividad]
-                    actividades_extraidas.append({
-                        'Actividad': tipo_actividad.title(),
-                        'Duración': duracion,
-                        'Predecesoras': ''
-                    })
-                    break
+        
+        # Una sola pasada sobre el texto; las actividades quedan en el orden en que se mencionan
+        for tipo_actividad in self.automata_actividades.primeras_apariciones(texto):
+            actividades_extraidas.append({
+                'Actividad': tipo_actividad.title(),
+                'Duración': self.duraciones_estimadas[tipo_actividad],
+                'Predecesoras': ''
+            })
         
         # Establecer dependencias lógicas si se encontraron actividades
         if actividades_extraidas:
@@ -616,58 +869,413 @@ class AIBuilderScheduler:
     def generar_cronograma(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calcula las fechas de inicio y fin para cada actividad basándose en las dependencias.
-        Versión corregida que respeta las dependencias secuenciales.
+        Usa el método de la ruta crítica (orden topológico + pasadas hacia adelante y
+        hacia atrás), por lo que el orden de las filas no afecta al resultado.
         
         Args:
             df (pd.DataFrame): DataFrame con actividades y dependencias
             
         Returns:
-            pd.DataFrame: DataFrame con fechas calculadas
+            pd.DataFrame: DataFrame con inicio/fin en días desde `self.fecha_inicio`,
+            holguras y ruta crítica. Las fechas absolutas se obtienen con
+            `materializar_fechas`. El informe de dependencias queda en `self.validacion`.
+            
+        Raises:
+            ValueError: Si hay dependencias circulares (detalladas en `self.validacion`)
         """
         print("Generando cronograma...")
         
-        df_cronograma = df.copy()
+        df_cronograma = df.drop(columns=['Fecha_Inicio', 'Fecha_Fin'], errors='ignore')
+        
+        if 'Predecesoras' not in df_cronograma.columns:
+            df_cronograma['Predecesoras'] = ''
+        
+        # Red compacta con ids enteros, compartida por el resto de etapas
+        grafo = ScheduleGraph.desde_dataframe(df_cronograma)
+        if 'Calendario' in df_cronograma.columns:
+            self._aplicar_calendarios(grafo, df_cronograma['Calendario'])
+        
+        # Los ciclos solo se buscan (Tarjan) si el CPM no logra ordenar la red
+        try:
+            grafo = calcular_cpm(grafo)
+        except ValueError:
+            self.validacion = validar_red(grafo)
+            if self.validacion['ciclos']:
+                raise ValueError(f"Dependencias circulares detectadas: {describir_ciclos(self.validacion)}")
+            raise
+        self.validacion = validar_red(grafo, buscar_ciclos=False)
+        for referencia in self.validacion['predecesoras_inexistentes']:
+            print(f"⚠️ Predecesora no encontrada: '{referencia['predecesora']}' en {referencia['actividad']}")
+        for referencia in self.validacion['coincidencias_aproximadas']:
+            print(f"⚠️ Predecesora '{referencia['predecesora']}' en {referencia['actividad']} "
+                  f"enlazada con '{referencia['resuelta']}'")
+        self.grafo = grafo
+        
+        # Guardar inicio y fin como días hábiles desde la fecha de inicio del proyecto
+        df_cronograma['Inicio'] = grafo.inicio
+        df_cronograma['Fin'] = grafo.fin
+        df_cronograma['Holgura_Total'] = grafo.holgura_total
+        df_cronograma['Holgura_Libre'] = grafo.holgura_libre
+        df_cronograma['Critica'] = grafo.critica
+        
+        # Con recursos limitados, inicio y fin salen del esquema serial; las holguras
+        # y la ruta crítica siguen siendo las de la red sin restricción de recursos
+        nivelado = self._nivelar_recursos(grafo, df_cronograma)
+        if nivelado is not None:
+            df_cronograma['Inicio'], df_cronograma['Fin'] = nivelado
+        
+        print(f"Cronograma generado: {int(df_cronograma['Fin'].max()) if len(df_cronograma) else 0} días de duración total")
+        print(f"Actividades procesadas: {len(df_cronograma)}")
         
-        # Diccionarios para almacenar fechas de inicio y fin
-        inicio = {}
-        fin = {}
+        return df_cronograma
+    
+    def _nivelar_recursos(self, grafo: ScheduleGraph, df: pd.DataFrame):
+        """
+        Programa la red con recursos limitados si hay capacidades configuradas para
+        alguna columna Recurso_<nombre> del cronograma.
         
-        # Procesar cada actividad respetando dependencias
-        for i, row in df_cronograma.iterrows():
-            actividad = row["Actividad"]
-            duracion = int(row["Duración"])
-            predecesoras = str(row["Predecesoras"]).strip()
+        Args:
+            grafo (ScheduleGraph): Grafo ya calculado por el CPM
+            df (pd.DataFrame): Cronograma con las columnas de demanda
             
-            # Si no tiene predecesoras, inicia en el día 0 (fecha de inicio del proyecto)
-            if not predecesoras or predecesoras == '' or predecesoras.lower() == 'nan':
-                inicio[actividad] = self.fecha_inicio
+        Returns:
+            Tuple[np.ndarray, np.ndarray] o None: Inicio y fin nivelados, o None si no aplica
+        """
+        columnas = [c for c in df.columns if str(c).startswith(PREFIJO_RECURSO)
+                    and str(c)[len(PREFIJO_RECURSO):].strip().lower() in self.capacidades_recursos]
+        if not columnas or not grafo.n:
+            return None
+        
+        capacidades = [self.capacidades_recursos[c[len(PREFIJO_RECURSO):].strip().lower()] for c in columnas]
+        demandas = df[columnas].apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        inicio, fin = nivelar_recursos(grafo, demandas, capacidades)
+        print(f"Recursos nivelados: {len(columnas)} recursos, {int(fin.max()) - grafo.duracion_total} días de retraso")
+        return inicio, fin
+    
+    def _aplicar_calendarios(self, grafo: ScheduleGraph, columna: pd.Series) -> None:
+        """
+        Asocia a las actividades con calendario propio la función que calcula su fin.
+        
+        La columna admite el nombre de un calendario registrado con `registrar_calendario`
+        o directamente una máscara semanal ('1111110'), que usa los feriados del proyecto.
+        
+        Args:
+            grafo (ScheduleGraph): Grafo del cronograma
+            columna (pd.Series): Columna Calendario del DataFrame
+        """
+        valores = columna.fillna('').astype(str).str.strip()
+        codigos, unicos = pd.factorize(valores)
+        
+        calendarios = []
+        for nombre in unicos:
+            if nombre in self.calendarios:
+                calendarios.append(self.calendarios[nombre])
+            elif nombre == '' or nombre.lower() == 'nan':
+                calendarios.append(self.calendario)
+            elif len(nombre) == 7 and set(nombre) <= {'0', '1'}:
+                calendarios.append(obtener_calendario(nombre, self.calendario.feriados))
             else:
-                # Si tiene predecesoras, inicia después de que termine la última
-                predecesoras_lista = [p.strip() for p in predecesoras.split(',')]
-                max_fin = self.fecha_inicio  # Inicializar con fecha de inicio
-                
-                for pred in predecesoras_lista:
-                    if pred and pred in fin:
-                        if fin[pred] > max_fin:
-                            max_fin = fin[pred]
-                
-                inicio[actividad] = max_fin
+                raise ValueError(f"Calendario no registrado: {nombre}")
+        
+        propios = np.asarray([cal is not self.calendario for cal in calendarios], dtype=bool)[codigos]
+        if not propios.any():
+            return
+        
+        calendario_ids = codigos.astype(np.int32)
+        proyecto = self.calendario
+        ancla = self._ancla()
+        grafo.calendario_propio = propios
+        grafo.ajuste_fin = lambda ids, inicio: fines_con_calendarios(
+            inicio, grafo.duracion[ids].astype(np.int64), calendario_ids[ids], calendarios, proyecto, ancla
+        )
+    
+    def _ancla(self) -> np.datetime64:
+        """Primer día hábil del proyecto: la fecha de inicio ajustada al calendario."""
+        return self.calendario.ajustar(np.datetime64(self.fecha_inicio, 'D'))
+    
+    def fecha_desde_offset(self, dias: int):
+        """
+        Convierte un desplazamiento en días hábiles desde el inicio del proyecto en una fecha.
+        
+        Args:
+            dias (int): Días hábiles desde `self.fecha_inicio`
             
-            # Calcular fecha de fin
-            fin[actividad] = inicio[actividad] + timedelta(days=duracion)
+        Returns:
+            date: Fecha correspondiente
+        """
+        return self.calendario.sumar(self._ancla(), int(dias)).item()
+    
+    def materializar_fechas(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Agrega las columnas Fecha_Inicio y Fecha_Fin a partir de los desplazamientos en días hábiles.
+        El cálculo es vectorizado (busday_offset sobre datetime64[D]) y solo se hace al mostrar o serializar.
         
-        # Asignar fechas al DataFrame
-        df_cronograma['Fecha_Inicio'] = df_cronograma['Actividad'].map(inicio)
-        df_cronograma['Fecha_Fin'] = df_cronograma['Actividad'].map(fin)
+        Args:
+            df (pd.DataFrame): Cronograma con columnas Inicio y Fin
+            
+        Returns:
+            pd.DataFrame: Copia del cronograma con las fechas absolutas
+        """
+        ancla = self._ancla()
+        return df.assign(
+            Fecha_Inicio=self.calendario.sumar(ancla, df['Inicio'].to_numpy(dtype=np.int64)),
+            Fecha_Fin=self.calendario.sumar(ancla, df['Fin'].to_numpy(dtype=np.int64))
+        )
+    
+    def actualizar_actividad(self, actividad: Union[str, int], duracion: Optional[int] = None,
+                             predecesoras: Optional[Union[str, List[str]]] = None) -> pd.DataFrame:
+        """
+        Modifica una actividad del cronograma actual y recalcula solo las actividades
+        afectadas, sin regenerar la tabla completa.
         
-        # Calcular duración total del proyecto
-        fecha_fin_proyecto = df_cronograma['Fecha_Fin'].max()
-        duracion_total = (fecha_fin_proyecto - self.fecha_inicio).days
+        Args:
+            actividad (str o int): Nombre o id (posición) de la actividad
+            duracion (int, opcional): Nueva duración en días
+            predecesoras (str o list, opcional): Nuevas predecesoras, separadas por comas o en lista
+            
+        Returns:
+            pd.DataFrame: Filas del cronograma cuyas fechas u holguras cambiaron, con fechas materializadas
+        """
+        if self.df_actividades is None:
+            raise ValueError("No hay cronograma para actualizar")
+        
+        if self.grafo is None or self.grafo.rango is None or not self.grafo.corresponde_a(self.df_actividades):
+            self.df_actividades = self.generar_cronograma(self.df_actividades)
+        grafo = self.grafo
+        
+        i = actividad if isinstance(actividad, int) else grafo.id_de(actividad)
+        if i is None and str(actividad).isdigit():
+            i = int(actividad)
+        if i is None or not 0 <= i < grafo.n:
+            raise KeyError(f"Actividad no encontrada: {actividad}")
+        
+        ids_predecesoras = None
+        if predecesoras is not None:
+            nombres = separar_predecesoras(predecesoras) if isinstance(predecesoras, str) else \
+                [str(p).strip() for p in predecesoras if str(p).strip()]
+            ids_predecesoras = []
+            for nombre in nombres:
+                j = grafo.id_de(nombre)
+                if j is None:
+                    raise KeyError(f"Predecesora no encontrada: {nombre}")
+                ids_predecesoras.append(j)
+        
+        cambiadas = actualizar_actividad(grafo, i, duracion, ids_predecesoras).tolist()
+        
+        # Un cronograma cargado con `cargar_cronograma` comparte memoria de solo
+        # lectura con su archivo: se copia antes de la primera edición
+        if not all(np.asarray(self.df_actividades[c].array).flags.writeable for c in ('Duración', 'Inicio', 'Fin')):
+            self.df_actividades = self.df_actividades.copy()
+        
+        # Actualizar solo las filas afectadas; las holguras se copian como columna completa
+        df = self.df_actividades
+        columna = df.columns.get_loc
+        if duracion is not None:
+            df.iat[i, columna('Duración')] = duracion
+        if predecesoras is not None:
+            df.iat[i, columna('Predecesoras')] = ', '.join(grafo.nombres[p] for p in grafo.predecesoras(i).tolist())
+        
+        # Con recursos limitados un cambio puede mover actividades no conectadas:
+        # se vuelve a nivelar la red completa y se informan todas las filas movidas
+        nivelado = self._nivelar_recursos(grafo, df)
+        if nivelado is None:
+            df.iloc[cambiadas, columna('Inicio')] = grafo.inicio[cambiadas]
+            df.iloc[cambiadas, columna('Fin')] = grafo.fin[cambiadas]
+        else:
+            inicio, fin = nivelado
+            movidas = np.flatnonzero((df['Inicio'].to_numpy() != inicio) | (df['Fin'].to_numpy() != fin))
+            df['Inicio'], df['Fin'] = inicio, fin
+            cambiadas = sorted(set(cambiadas) | set(movidas.tolist()))
+        df['Holgura_Total'] = grafo.holgura_total
+        df['Holgura_Libre'] = grafo.holgura_libre
+        df['Critica'] = grafo.critica
+        
+        print(f"Actividad actualizada: {grafo.nombres[i]} ({len(cambiadas)} actividades recalculadas)")
+        return self.materializar_fechas(df.iloc[cambiadas])
+    
+    def guardar_cronograma(self, ruta: str) -> None:
+        """
+        Guarda el cronograma actual en un snapshot Arrow con columnas tipadas, la
+        red de dependencias, el estado del CPM, la fecha de inicio y el calendario
+        del proyecto (ver `services.schedule_snapshot`).
         
-        print(f"Cronograma generado: {duracion_total} días de duración total")
-        print(f"Actividades procesadas: {len(df_cronograma)}")
+        Args:
+            ruta (str): Archivo de destino (habitualmente .arrow)
+            
+        Raises:
+            ValueError: Si no hay cronograma calculado
+            ImportError: Si pyarrow no está instalado
+        """
+        if self.df_actividades is None or 'Inicio' not in self.df_actividades.columns:
+            raise ValueError("No hay cronograma para guardar")
+        
+        if self.grafo is None or self.grafo.rango is None or not self.grafo.corresponde_a(self.df_actividades):
+            self.df_actividades = self.generar_cronograma(self.df_actividades)
+        df = self.df_actividades.drop(columns=['Fecha_Inicio', 'Fecha_Fin'], errors='ignore')
+        fechas = self.materializar_fechas(df)
+        guardar_snapshot(ruta, df, self.grafo, self.fecha_inicio,
+                         (fechas['Fecha_Inicio'].to_numpy(), fechas['Fecha_Fin'].to_numpy()),
+                         self.calendario.weekmask, self.calendario.feriados)
+        print(f"Cronograma guardado en {ruta}: {len(df)} actividades")
+    
+    def cargar_cronograma(self, ruta: str) -> pd.DataFrame:
+        """
+        Carga un cronograma guardado con `guardar_cronograma` sin leer la entrada ni
+        programarlo de nuevo: el archivo se mapea en memoria y el DataFrame usa sus
+        páginas sin copiarlas. El grafo se rearma con su estado del CPM al usarlo
+        por primera vez (p. ej. en `actualizar_actividad`), de modo que un proceso
+        que solo consulta el cronograma no lo construye. También restaura la fecha
+        de inicio y el calendario del proyecto.
         
-        return df_cronograma
+        Args:
+            ruta (str): Archivo del snapshot
+            
+        Returns:
+            pd.DataFrame: Cronograma cargado (queda en `self.df_actividades`)
+            
+        Raises:
+            ValueError: Si el archivo no es un snapshot de cronograma compatible
+            ImportError: Si pyarrow no está instalado
+        """
+        snapshot = ScheduleSnapshot(ruta)
+        metadatos = snapshot.metadatos
+        self.fecha_inicio = metadatos['fecha_inicio']
+        self.calendario = obtener_calendario(metadatos['weekmask'], metadatos['feriados'])
+        df = snapshot.cronograma(fechas=False)
+        
+        self.df_actividades = df
+        self.grafo = None
+        self._snapshot_grafo = snapshot
+        self.validacion = None
+        self.dependencias_eliminadas = []
+        print(f"Cronograma cargado de {ruta}: {len(df)} actividades")
+        return df
+    
+    def configurar_almacen(self, directorio: str, proyecto: str = 'cronograma') -> ScheduleStore:
+        """
+        Configura un almacén de snapshots compartido entre procesos, como los workers
+        de gunicorn (ver `services.schedule_store`).
+        
+        Con un almacén, `publicar_cronograma` guarda cada cambio como una versión
+        nueva y `sincronizar_cronograma` carga la última publicada: todos los
+        procesos mapean el mismo archivo de solo lectura y comparten sus páginas
+        en lugar de tener cada uno su propia copia del cronograma.
+        
+        Args:
+            directorio (str): Directorio del almacén (se crea si no existe)
+            proyecto (str): Nombre del proyecto en el almacén
+            
+        Returns:
+            ScheduleStore: Almacén configurado
+            
+        Raises:
+            ValueError: Si el nombre del proyecto tiene caracteres no admitidos
+        """
+        almacen = ScheduleStore(directorio)
+        almacen.ruta(proyecto, 0)
+        self.almacen = almacen
+        self.proyecto = proyecto
+        self.version_cargada = None
+        print(f"Almacén de cronogramas configurado: {almacen.directorio} (proyecto {proyecto})")
+        return almacen
+    
+    def publicar_cronograma(self) -> Optional[int]:
+        """
+        Publica el cronograma actual como una versión nueva del almacén y lo vuelve a
+        cargar desde ese archivo, de modo que este proceso también pasa a compartir
+        la memoria en lugar de conservar su copia. La validación y las dependencias
+        eliminadas del cronograma se conservan.
+        
+        Escribe el snapshot completo, O(N) aunque solo haya cambiado una actividad:
+        al editar varias actividades seguidas conviene publicar una vez al final.
+        
+        Returns:
+            Optional[int]: Versión publicada, o None si no hay almacén o cronograma
+        """
+        if self.almacen is None or self.df_actividades is None or 'Inicio' not in self.df_actividades.columns:
+            return None
+        
+        validacion, eliminadas = self.validacion, self.dependencias_eliminadas
+        version = self.almacen.publicar(self.proyecto, self.guardar_cronograma)
+        self.cargar_cronograma(self.almacen.ruta(self.proyecto, version))
+        self.validacion, self.dependencias_eliminadas = validacion, eliminadas
+        self.version_cargada = version
+        return version
+    
+    def sincronizar_cronograma(self) -> bool:
+        """
+        Carga la última versión publicada en el almacén si no es la de este proceso.
+        
+        Returns:
+            bool: True si se cargó una versión nueva
+        """
+        if self.almacen is None:
+            return False
+        
+        while True:
+            version = self.almacen.version_actual(self.proyecto)
+            if version is None or version == self.version_cargada:
+                return False
+            try:
+                self.cargar_cronograma(self.almacen.ruta(self.proyecto, version))
+            except FileNotFoundError:
+                # Borrada por una publicación posterior: se carga la nueva
+                continue
+            self.version_cargada = version
+            return True
+    
+    def simular_riesgo(self, n: int = 5000, distribucion: str = 'pert', semilla: Optional[int] = None,
+                       procesos: Optional[int] = None) -> Dict:
+        """
+        Simula por Monte Carlo la fecha de término del cronograma actual.
+        
+        Las columnas Optimista y Pesimista, si existen, dan la estimación de tres
+        puntos de cada actividad; la columna Duración es el valor más probable.
+        La simulación considera solo las precedencias, no la capacidad de recursos.
+        
+        Args:
+            n (int): Número de muestras
+            distribucion (str): 'pert' o 'triangular'
+            semilla (int, opcional): Semilla para resultados reproducibles
+            procesos (int, opcional): Procesos para repartir muestras grandes
+            
+        Returns:
+            Dict: Fechas P50/P80/P90, estadísticas de duración e índice de criticidad por actividad
+        """
+        if self.df_actividades is None:
+            raise ValueError("No hay cronograma para simular")
+        
+        df = self.df_actividades
+        grafo = self._obtener_grafo(df)
+        if grafo.rango is None:
+            grafo = calcular_cpm(grafo)
+        
+        columna = lambda c: df[c].to_numpy(dtype=np.float64) if c in df.columns else None
+        resultado = simular_riesgo(grafo, n, columna('Optimista'), columna('Pesimista'),
+                                   distribucion, semilla, procesos)
+        
+        for percentil in ('p50', 'p80', 'p90'):
+            dias = int(np.ceil(resultado[percentil]))
+            resultado[f'fecha_{percentil}'] = self.fecha_desde_offset(dias)
+        resultado['criticidad'] = dict(zip(grafo.nombres, resultado.pop('indice_criticidad').round(4).tolist()))
+        
+        print(f"Simulación de riesgo ({n} muestras): P50 {resultado['p50']:.1f}, "
+              f"P80 {resultado['p80']:.1f}, P90 {resultado['p90']:.1f} días")
+        return resultado
+    
+    def _obtener_grafo(self, df: pd.DataFrame) -> ScheduleGraph:
+        """
+        Devuelve el grafo del cronograma, reutilizando el ya construido si corresponde a `df`.
+        
+        Args:
+            df (pd.DataFrame): DataFrame con actividades y dependencias
+            
+        Returns:
+            ScheduleGraph: Grafo de la red de actividades
+        """
+        if self.grafo is not None and self.grafo.corresponde_a(df):
+            return self.grafo
+        return ScheduleGraph.desde_dataframe(df)
     
     def mostrar_gantt(self, df: pd.DataFrame) -> None:
         """
@@ -678,6 +1286,8 @@ class AIBuilderScheduler:
         """
         print("Generando diagrama de Gantt...")
         
+        df = self.materializar_fechas(df)
+        
         # Preparar datos para Plotly
         fig = go.Figure()
         
@@ -742,6 +1352,9 @@ class AIBuilderScheduler:
         print("RESUMEN DEL CRONOGRAMA")
         print("="*60)
         
+        if 'Fecha_Inicio' not in df.columns:
+            df = self.materializar_fechas(df)
+        
         duracion_total = (df['Fecha_Fin'].max() - df['Fecha_Inicio'].min()).days
         
         print(f"Fecha de inicio: {df['Fecha_Inicio'].min().strftime('%d/%m/%Y')}")
@@ -782,14 +1395,13 @@ class AIBuilderScheduler:
         df_optimizado = df.copy()
         
         # Reducir duraciones de tareas largas (más de 10 días)
-        tareas_largas = df_optimizado[df_optimizado['Duración'] > 10]
-        if len(tareas_largas) > 0:
-            print(f"Reduciendo duración de {len(tareas_largas)} tareas largas...")
-            df_optimizado.loc[df_optimizado['Duración'] > 10, 'Duración'] = \
-                df_optimizado.loc[df_optimizado['Duración'] > 10, 'Duración'] * 0.8
-        
-        # Identificar tareas que pueden ejecutarse en paralelo
-        tareas_paralelas = self._identificar_tareas_paralelas(df_optimizado)
+        largas = df_optimizado['Duración'] > 10
+        if largas.any():
+            print(f"Reduciendo duración de {int(largas.sum())} tareas largas...")
+            df_optimizado['Duración'] = df_optimizado['Duración'].where(~largas, df_optimizado['Duración'] * 0.8)
+        
+        # Identificar dependencias críticas que pueden relajarse para ejecutar tareas en paralelo
+        tareas_paralelas = self._identificar_tareas_paralelizables(df_optimizado)
         if tareas_paralelas:
             print(f"Identificando {len(tareas_paralelas)} oportunidades de paralelización...")
             df_optimizado = self._aplicar_paralelizacion(df_optimizado, tareas_paralelas)
@@ -798,8 +1410,8 @@ class AIBuilderScheduler:
         df_optimizado = self.generar_cronograma(df_optimizado)
         
         # Mostrar mejoras
-        duracion_original = (df['Fecha_Fin'].max() - df['Fecha_Inicio'].min()).days
-        duracion_optimizada = (df_optimizado['Fecha_Fin'].max() - df_optimizado['Fecha_Inicio'].min()).days
+        duracion_original = int(df['Fin'].max() - df['Inicio'].min())
+        duracion_optimizada = int(df_optimizado['Fin'].max() - df_optimizado['Inicio'].min())
         mejora = duracion_original - duracion_optimizada
         porcentaje_mejora = (mejora / duracion_original) * 100
         
@@ -809,32 +1421,68 @@ class AIBuilderScheduler:
         
         return df_optimizado
     
-    def _identificar_tareas_paralelas(self, df: pd.DataFrame) -> List[Tuple[str, str]]:
+    def _identificar_tareas_paralelas(self, df: pd.DataFrame, limite: Optional[int] = None) -> List[Tuple[str, str]]:
         """
-        Identifica tareas que pueden ejecutarse en paralelo.
+        Identifica tareas que pueden ejecutarse en paralelo: pares de actividades
+        independientes, donde ninguna depende directa o indirectamente de la otra.
         
         Args:
             df (pd.DataFrame): DataFrame con actividades
+            limite (int, opcional): Número máximo de pares a devolver
             
         Returns:
             List[Tuple[str, str]]: Lista de pares de tareas que pueden paralelizarse
         """
-        tareas_paralelas = []
-        
-        # Tareas que típicamente pueden ejecutarse en paralelo
-        pares_paralelos = [
-            ('Muros', 'Instalaciones'),
-            ('Techos', 'Acabados'),
-            ('Instalaciones', 'Acabados')
-        ]
-        
-        actividades_disponibles = df['Actividad'].tolist()
+        grafo = self._obtener_grafo(df)
+        if grafo.n > LIMITE_CIERRE:
+            print(f"Red demasiado grande para buscar tareas paralelas ({grafo.n} actividades)")
+            return []
         
-        for tarea1, tarea2 in pares_paralelos:
-            if tarea1 in actividades_disponibles and tarea2 in actividades_disponibles:
-                tareas_paralelas.append((tarea1, tarea2))
+        alcance = obtener_alcance(grafo)
+        return [(grafo.nombres[i], grafo.nombres[j]) for i, j in alcance.pares_independientes(limite)]
+    
+    def _identificar_tareas_paralelizables(self, df: pd.DataFrame, maximo: int = 3) -> List[Tuple[str, str]]:
+        """
+        Busca dependencias de la ruta crítica que, al relajarse, dejarían a las dos
+        tareas independientes: la sucesora empieza justo al terminar la predecesora y
+        no depende de ella por ningún otro camino.
         
-        return tareas_paralelas
+        Args:
+            df (pd.DataFrame): DataFrame con actividades
+            maximo (int): Número máximo de pares a proponer
+            
+        Returns:
+            List[Tuple[str, str]]: Pares (predecesora, sucesora), de mayor a menor ahorro posible
+        """
+        grafo = self._obtener_grafo(df)
+        if grafo.n > LIMITE_CIERRE:
+            return []
+        if grafo.rango is None:
+            grafo = calcular_cpm(grafo)
+        
+        alcance = obtener_alcance(grafo)
+        critica = grafo.critica
+        candidatos = []
+        for j in np.flatnonzero(critica).tolist():
+            for i in grafo.predecesoras(j).tolist():
+                # Solo tiene sentido si la predecesora tiene a su vez predecesoras
+                # (la sucesora pasará a depender de ellas) y fija el inicio de j
+                if not critica[i] or grafo.fin[i] != grafo.inicio[j] or grafo.pred_ptr[i] == grafo.pred_ptr[i + 1]:
+                    continue
+                if not alcance.alcanza_sin_arista(i, j):
+                    ahorro = min(int(grafo.duracion[i]), int(grafo.duracion[j]))
+                    candidatos.append((ahorro, i, j))
+        
+        # Cada actividad participa en un solo par para que las relajaciones no se encadenen
+        candidatos.sort(key=lambda c: (-c[0], c[1], c[2]))
+        elegidos, usadas = [], set()
+        for _, i, j in candidatos:
+            if len(elegidos) == maximo:
+                break
+            if i not in usadas and j not in usadas:
+                elegidos.append((grafo.nombres[i], grafo.nombres[j]))
+                usadas.update((i, j))
+        return elegidos
     
     def _aplicar_paralelizacion(self, df: pd.DataFrame, tareas_paralelas: List[Tuple[str, str]]) -> pd.DataFrame:
         """
@@ -848,17 +1496,28 @@ class AIBuilderScheduler:
             pd.DataFrame: DataFrame con paralelización aplicada
         """
         df_paralelo = df.copy()
+        grafo = self._obtener_grafo(df)
+        col_predecesoras = df_paralelo.columns.get_loc('Predecesoras')
+        modificadas = {}
         
         for tarea1, tarea2 in tareas_paralelas:
-            # Encontrar índices de las tareas
-            idx1 = df_paralelo[df_paralelo['Actividad'] == tarea1].index[0]
-            idx2 = df_paralelo[df_paralelo['Actividad'] == tarea2].index[0]
+            # Posición de las tareas según el grafo (sin recorrer el DataFrame)
+            id1 = grafo.id_de(tarea1)
+            id2 = grafo.id_de(tarea2)
             
             # Modificar dependencias para permitir paralelización
-            # La segunda tarea puede empezar cuando termine la predecesora común
-            predecesora_comun = df_paralelo.loc[idx1, 'Predecesoras']
-            if predecesora_comun:
-                df_paralelo.loc[idx2, 'Predecesoras'] = predecesora_comun
+            # La segunda tarea puede empezar cuando termine la predecesora común;
+            # sus demás predecesoras se conservan
+            predecesoras1 = modificadas.get(id1)
+            if predecesoras1 is None:
+                predecesoras1 = [grafo.nombres[p] for p in grafo.predecesoras(id1).tolist()]
+            if predecesoras1:
+                predecesoras2 = modificadas.get(id2)
+                if predecesoras2 is None:
+                    predecesoras2 = [grafo.nombres[p] for p in grafo.predecesoras(id2).tolist()]
+                nuevas = list(dict.fromkeys(predecesoras1 + [p for p in predecesoras2 if p != grafo.nombres[id1]]))
+                df_paralelo.iat[id2, col_predecesoras] = ', '.join(nuevas)
+                modificadas[id2] = nuevas
         
         return df_paralelo
     
@@ -878,22 +1537,18 @@ class AIBuilderScheduler:
             try:
                 gemini_service = get_gemini_service()
                 if gemini_service:
-                    # Preparar contexto para Gemini
+                    # Preparar contexto para Gemini (fechas como texto para evitar problemas de serialización)
+                    df_fechas = self.materializar_fechas(df)
+                    df_fechas['Fecha_Inicio'] = df_fechas['Fecha_Inicio'].dt.strftime('%d/%m/%Y')
+                    df_fechas['Fecha_Fin'] = df_fechas['Fecha_Fin'].dt.strftime('%d/%m/%Y')
                     contexto = {
-                        "actividades": df.to_dict('records'),
-                        "duracion_total": (df['Fecha_Fin'].max() - df['Fecha_Inicio'].min()).days,
-                        "fecha_inicio": df['Fecha_Inicio'].min().strftime('%d/%m/%Y'),
-                        "fecha_fin": df['Fecha_Fin'].max().strftime('%d/%m/%Y'),
+                        "actividades": df_fechas.to_dict('records'),
+                        "duracion_total": int(df['Fin'].max() - df['Inicio'].min()),
+                        "fecha_inicio": self.fecha_desde_offset(df['Inicio'].min()).strftime('%d/%m/%Y'),
+                        "fecha_fin": self.fecha_desde_offset(df['Fin'].max()).strftime('%d/%m/%Y'),
                         "total_actividades": len(df)
                     }
                     
-                    # Convertir fechas a strings para evitar problemas de serialización
-                    for actividad in contexto["actividades"]:
-                        if 'Fecha_Inicio' in actividad:
-                            actividad['Fecha_Inicio'] = actividad['Fecha_Inicio'].strftime('%d/%m/%Y')
-                        if 'Fecha_Fin' in actividad:
-                            actividad['Fecha_Fin'] = actividad['Fecha_Fin'].strftime('%d/%m/%Y')
-                    
                     respuesta_gemini = gemini_service.responder_pregunta_cronograma(pregunta, contexto)
                     if respuesta_gemini and len(respuesta_gemini.strip()) > 10:
                         return respuesta_gemini
@@ -905,19 +1560,33 @@ class AIBuilderScheduler:
         
         # Análisis de la duración del proyecto
         if any(palabra in pregunta_lower for palabra in ['duración', 'tiempo', 'cuánto', 'días']):
-            duracion_total = (df['Fecha_Fin'].max() - df['Fecha_Inicio'].min()).days
-            return f"El proyecto tiene una duración total de {duracion_total} días, desde el {df['Fecha_Inicio'].min().strftime('%d/%m/%Y')} hasta el {df['Fecha_Fin'].max().strftime('%d/%m/%Y')}."
+            duracion_total = int(df['Fin'].max() - df['Inicio'].min())
+            return f"El proyecto tiene una duración total de {duracion_total} días, desde el {self.fecha_desde_offset(df['Inicio'].min()).strftime('%d/%m/%Y')} hasta el {self.fecha_desde_offset(df['Fin'].max()).strftime('%d/%m/%Y')}."
         
         # Análisis de tareas paralelas
         elif any(palabra in pregunta_lower for palabra in ['paralelo', 'simultáneo', 'mismo tiempo']):
-            tareas_paralelas = self._identificar_tareas_paralelas(df)
+            tareas_paralelas = self._identificar_tareas_paralelas(df, limite=10)
             if tareas_paralelas:
                 respuesta = "Las siguientes tareas pueden ejecutarse en paralelo:\n"
                 for tarea1, tarea2 in tareas_paralelas:
                     respuesta += f"• {tarea1} y {tarea2}\n"
+                total = obtener_alcance(self._obtener_grafo(df)).num_pares_independientes()
+                if total > len(tareas_paralelas):
+                    respuesta += f"... y {total - len(tareas_paralelas)} pares más de tareas independientes.\n"
+                paralelizables = self._identificar_tareas_paralelizables(df)
+                if paralelizables:
+                    respuesta += "\nPara acortar la ruta crítica se podrían solapar:\n"
+                    for tarea1, tarea2 in paralelizables:
+                        respuesta += f"• {tarea1} y {tarea2}\n"
                 return respuesta
             else:
-                return "En el cronograma actual, todas las tareas están secuencialmente dependientes. Se podrían optimizar algunas para ejecutarse en paralelo."
+                paralelizables = self._identificar_tareas_paralelizables(df)
+                respuesta = "En el cronograma actual, todas las tareas están secuencialmente dependientes."
+                if paralelizables:
+                    respuesta += " Se podrían solapar:\n" + ''.join(f"• {t1} y {t2}\n" for t1, t2 in paralelizables)
+                else:
+                    respuesta += " Se podrían optimizar algunas para ejecutarse en paralelo."
+                return respuesta
         
         # Optimización del cronograma
         elif any(palabra in pregunta_lower for palabra in ['optimizar', 'mejorar', 'reducir', 'acelerar']):
@@ -925,6 +1594,12 @@ class AIBuilderScheduler:
         
         # Análisis de la ruta crítica
         elif any(palabra in pregunta_lower for palabra in ['crítica', 'crítico', 'ruta']):
+            if 'Critica' in df.columns:
+                criticas = df.loc[df['Critica'], 'Actividad'].tolist()
+                respuesta = "La ruta crítica es la secuencia de tareas que determina la duración mínima del proyecto. Actividades sin holgura:\n"
+                for actividad in criticas:
+                    respuesta += f"• {actividad}\n"
+                return respuesta
             return "La ruta crítica es la secuencia de tareas que determina la duración mínima del proyecto. En tu cronograma, todas las tareas están en la ruta crítica debido a las dependencias secuenciales."
         
         # Información sobre actividades específicas
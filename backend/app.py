@@ -24,6 +24,15 @@ from typing import Dict, List, Tuple, Optional, Union
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ai_builder_scheduler import AIBuilderScheduler
 
+# Textos aceptados para los indicadores booleanos de la API ("reduce")
+VALORES_VERDADEROS = ('1', 'true', 'yes', 'si', 'sí')
+VALORES_FALSOS = ('0', 'false', 'no', '')
+
+
+class ParameterError(ValueError):
+    """Parámetro de la petición con un valor no válido (se responde con 400)."""
+
+
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": [
     "https://cronograma-obra-ia.vercel.app",
@@ -34,6 +43,20 @@ CORS(app, resources={r"/*": {"origins": [
 # Instancia global del scheduler
 scheduler = AIBuilderScheduler()
 
+# Copia opcional en disco de la caché de lecturas, compartida entre workers
+if os.getenv("PARSE_CACHE_PATH"):
+    scheduler.configurar_cache_lecturas(os.getenv("PARSE_CACHE_PATH"))
+
+# Almacén compartido de cronogramas: cada cambio se publica como una versión nueva
+# y los workers mapean la última en lugar de guardar cada uno su propia copia
+if os.getenv("SCHEDULE_STORE_PATH"):
+    scheduler.configurar_almacen(os.getenv("SCHEDULE_STORE_PATH"))
+
+@app.before_request
+def sincronizar_cronograma():
+    """Carga el último cronograma publicado por cualquier worker (si hay almacén)."""
+    scheduler.sincronizar_cronograma()
+
 @app.route('/')
 def index():
     """Endpoint raíz - redirige a la documentación de la API."""
@@ -43,6 +66,10 @@ def index():
         "endpoints": {
             "POST /api/process": "Procesar entrada (texto o archivo)",
             "POST /api/optimize": "Optimizar cronograma",
+            "PATCH /api/activities/<actividad>": "Modificar una actividad sin recalcular todo el cronograma",
+            "POST /api/calendar": "Configurar días laborables y feriados del proyecto",
+            "POST /api/resources": "Configurar capacidades y programar con recursos limitados",
+            "POST /api/analyze-risks": "Simulación de riesgo (Monte Carlo) y análisis con IA",
             "GET /api/chat": "Chat con el asistente",
             "GET /api/status": "Estado del sistema"
         }
@@ -56,7 +83,8 @@ def process_input():
     Body JSON:
     {
         "input": "texto del proyecto" o "ruta del archivo",
-        "type": "text" o "file"
+        "type": "text" o "file",
+        "reduce": true (opcional, quitar dependencias redundantes)
     }
     """
     try:
@@ -69,30 +97,34 @@ def process_input():
         input_type = data.get('type', 'text')
         
         # Procesar entrada
-        df_actividades = scheduler.leer_entrada(input_text)
+        reducir = leer_booleano(data.get('reduce'), 'reduce')
+        df_actividades = scheduler.leer_entrada(input_text, reducir)
         df_cronograma = scheduler.generar_cronograma(df_actividades)
         
-        # Generar gráfico de Gantt
-        gantt_data = generate_gantt_data(df_cronograma)
+        # Generar gráfico de Gantt (las fechas absolutas solo se calculan aquí)
+        df_fechas = scheduler.materializar_fechas(df_cronograma)
+        gantt_data = generate_gantt_data(df_fechas)
         
         # Preparar respuesta
         response = {
             "success": True,
-            "activities": df_cronograma.to_dict('records'),
+            "activities": df_fechas.to_dict('records'),
             "gantt_data": gantt_data,
-            "summary": {
-                "total_duration": (df_cronograma['Fecha_Fin'].max() - df_cronograma['Fecha_Inicio'].min()).days,
-                "start_date": df_cronograma['Fecha_Inicio'].min().strftime('%Y-%m-%d'),
-                "end_date": df_cronograma['Fecha_Fin'].max().strftime('%Y-%m-%d'),
-                "total_activities": len(df_cronograma)
-            }
+            "summary": generate_summary(df_cronograma),
+            "removed_dependencies": format_dependencies(scheduler.dependencias_eliminadas),
+            "validation": format_validation(scheduler.validacion)
         }
         
         # Guardar el cronograma actual en la instancia
         scheduler.df_actividades = df_cronograma
+        scheduler.publicar_cronograma()
         
         return jsonify(response)
         
+    except ParameterError as e:
+        return jsonify({"error": str(e)}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e), "validation": format_validation(scheduler.validacion)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -109,19 +141,20 @@ def optimize_schedule():
         df_optimizado = scheduler.optimizar_cronograma(scheduler.df_actividades)
         
         # Generar nuevo gráfico
-        gantt_data = generate_gantt_data(df_optimizado)
+        df_fechas = scheduler.materializar_fechas(df_optimizado)
+        gantt_data = generate_gantt_data(df_fechas)
         
         # Calcular mejoras
-        duracion_original = (scheduler.df_actividades['Fecha_Fin'].max() - 
-                           scheduler.df_actividades['Fecha_Inicio'].min()).days
-        duracion_optimizada = (df_optimizado['Fecha_Fin'].max() - 
-                             df_optimizado['Fecha_Inicio'].min()).days
+        duracion_original = int(scheduler.df_actividades['Fin'].max() - 
+                                scheduler.df_actividades['Inicio'].min())
+        duracion_optimizada = int(df_optimizado['Fin'].max() - 
+                                  df_optimizado['Inicio'].min())
         mejora = duracion_original - duracion_optimizada
         porcentaje_mejora = (mejora / duracion_original) * 100 if duracion_original > 0 else 0
         
         response = {
             "success": True,
-            "activities": df_optimizado.to_dict('records'),
+            "activities": df_fechas.to_dict('records'),
             "gantt_data": gantt_data,
             "optimization": {
                 "time_saved": mejora,
@@ -129,22 +162,130 @@ def optimize_schedule():
                 "original_duration": duracion_original,
                 "optimized_duration": duracion_optimizada
             },
-            "summary": {
-                "total_duration": duracion_optimizada,
-                "start_date": df_optimizado['Fecha_Inicio'].min().strftime('%Y-%m-%d'),
-                "end_date": df_optimizado['Fecha_Fin'].max().strftime('%Y-%m-%d'),
-                "total_activities": len(df_optimizado)
-            }
+            "summary": generate_summary(df_optimizado)
         }
         
         # Actualizar cronograma
         scheduler.df_actividades = df_optimizado
+        scheduler.publicar_cronograma()
         
         return jsonify(response)
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/activities/<path:activity>', methods=['PATCH'])
+def update_activity(activity):
+    """
+    Modifica la duración y/o las predecesoras de una actividad del cronograma
+    actual. Solo se recalculan las actividades afectadas por el cambio.
+    
+    Body JSON:
+    {
+        "duration": nueva duración en días (opcional),
+        "predecessors": "A, B" o ["A", "B"] (opcional)
+    }
+    """
+    try:
+        if scheduler.df_actividades is None:
+            return jsonify({"error": "No hay cronograma para modificar"}), 400
+        
+        data = request.get_json() or {}
+        if data.get('duration') is None and data.get('predecessors') is None:
+            return jsonify({"error": "Se requiere 'duration' o 'predecessors'"}), 400
+        
+        duracion = leer_entero(data, 'duration')
+        df_cambios = scheduler.actualizar_actividad(activity, duracion, data.get('predecessors'))
+        scheduler.publicar_cronograma()
+        
+        return jsonify({
+            "success": True,
+            "updated_activities": df_cambios.to_dict('records'),
+            "gantt_data": generate_gantt_data(df_cambios),
+            "summary": generate_summary(scheduler.df_actividades)
+        })
+        
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/calendar', methods=['POST'])
+def configure_calendar():
+    """
+    Configura el calendario laboral del proyecto. Si ya hay un cronograma,
+    devuelve sus fechas recalculadas con el nuevo calendario.
+    
+    Body JSON:
+    {
+        "weekmask": "1111100" (lunes a domingo, 1 = laborable),
+        "holidays": ["2025-01-01", ...] o "nombre_de_conjunto_registrado" (opcional),
+        "calendars": {"nombre": {"weekmask": "...", "holidays": [...]}} (opcional, por actividad)
+    }
+    """
+    try:
+        data = request.get_json() or {}
+        
+        for nombre, config in (data.get('calendars') or {}).items():
+            scheduler.registrar_calendario(nombre, config.get('weekmask', '1111100'), config.get('holidays'))
+        calendario = scheduler.configurar_calendario(data.get('weekmask', '1111100'), data.get('holidays'))
+        
+        response = {
+            "success": True,
+            "calendar": {
+                "weekmask": calendario.weekmask,
+                "holidays": [str(f) for f in calendario.feriados]
+            }
+        }
+        
+        if scheduler.df_actividades is not None:
+            df_fechas = scheduler.materializar_fechas(scheduler.df_actividades)
+            response["gantt_data"] = generate_gantt_data(df_fechas)
+            response["summary"] = generate_summary(scheduler.df_actividades)
+            scheduler.publicar_cronograma()
+        
+        return jsonify(response)
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/resources', methods=['POST'])
+def configure_resources():
+    """
+    Configura la capacidad diaria de los recursos. Si ya hay un cronograma,
+    lo reprograma respetando las capacidades (columnas Recurso_<nombre>).
+    
+    Body JSON:
+    {
+        "capacities": {"albañiles": 4, "grua": 1} (vacío = sin restricción de recursos)
+    }
+    """
+    try:
+        data = request.get_json() or {}
+        capacidades = scheduler.configurar_recursos(data.get('capacities') or {})
+        
+        response = {
+            "success": True,
+            "capacities": capacidades
+        }
+        
+        if scheduler.df_actividades is not None:
+            df_fechas = scheduler.materializar_fechas(scheduler.df_actividades)
+            response["gantt_data"] = generate_gantt_data(df_fechas)
+            response["summary"] = generate_summary(scheduler.df_actividades)
+            scheduler.publicar_cronograma()
+        
+        return jsonify(response)
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """
@@ -183,7 +324,11 @@ def chat():
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
     """
-    Maneja la carga de archivos CSV/Excel.
+    Maneja la carga de archivos CSV/Excel/MS Project XML. El archivo se procesa directamente
+    desde el flujo de la petición, sin copiarlo a disco.
+    
+    Campos de formulario opcionales: "reduce" (true/false) para quitar dependencias
+    redundantes y "sheet" (nombre o posición desde 0) con la hoja de Excel a leer.
     """
     try:
         if 'file' not in request.files:
@@ -195,36 +340,35 @@ def upload_file():
             return jsonify({"error": "No se seleccionó archivo"}), 400
         
         if file and allowed_file(file.filename):
-            # Guardar archivo temporalmente
-            filename = file.filename
-            filepath = os.path.join('uploads', filename)
-            os.makedirs('uploads', exist_ok=True)
-            file.save(filepath)
-            
-            # Procesar archivo
-            df_actividades = scheduler.leer_entrada(filepath)
-            df_cronograma = scheduler.generar_cronograma(df_actividades)
+            # Procesar archivo en memoria
+            hoja = request.form.get('sheet') or None
+            if hoja is not None and hoja.strip().isdigit():
+                hoja = int(hoja)
+            try:
+                reducir = leer_booleano(request.form.get('reduce'), 'reduce')
+                df_actividades = scheduler.leer_entrada(file.stream, reducir, hoja)
+                df_cronograma = scheduler.generar_cronograma(df_actividades)
+            except ParameterError as e:
+                return jsonify({"error": str(e)}), 400
+            except ValueError as e:
+                return jsonify({"error": str(e), "validation": format_validation(scheduler.validacion)}), 400
             
             # Generar gráfico
-            gantt_data = generate_gantt_data(df_cronograma)
-            
-            # Limpiar archivo temporal
-            os.remove(filepath)
+            df_fechas = scheduler.materializar_fechas(df_cronograma)
+            gantt_data = generate_gantt_data(df_fechas)
             
             response = {
                 "success": True,
-                "activities": df_cronograma.to_dict('records'),
+                "activities": df_fechas.to_dict('records'),
                 "gantt_data": gantt_data,
-                "summary": {
-                    "total_duration": (df_cronograma['Fecha_Fin'].max() - df_cronograma['Fecha_Inicio'].min()).days,
-                    "start_date": df_cronograma['Fecha_Inicio'].min().strftime('%Y-%m-%d'),
-                    "end_date": df_cronograma['Fecha_Fin'].max().strftime('%Y-%m-%d'),
-                    "total_activities": len(df_cronograma)
-                }
+                "summary": generate_summary(df_cronograma),
+                "removed_dependencies": format_dependencies(scheduler.dependencias_eliminadas),
+                "validation": format_validation(scheduler.validacion)
             }
             
             # Guardar cronograma
             scheduler.df_actividades = df_cronograma
+            scheduler.publicar_cronograma()
             
             return jsonify(response)
         
@@ -248,47 +392,83 @@ def get_status():
     }
     
     if has_schedule:
-        df = scheduler.df_actividades
-        status["current_schedule"] = {
-            "total_activities": len(df),
-            "total_duration": (df['Fecha_Fin'].max() - df['Fecha_Inicio'].min()).days,
-            "start_date": df['Fecha_Inicio'].min().strftime('%Y-%m-%d'),
-            "end_date": df['Fecha_Fin'].max().strftime('%Y-%m-%d')
-        }
+        status["current_schedule"] = generate_summary(scheduler.df_actividades)
+        if scheduler.grafo is not None:
+            status["current_schedule"]["total_dependencies"] = scheduler.grafo.num_aristas
     
     return jsonify(status)
 
 @app.route('/api/analyze-risks', methods=['POST'])
 def analyze_risks():
     """
-    Analiza riesgos del proyecto usando Gemini AI.
+    Analiza riesgos del proyecto con una simulación de Monte Carlo local y,
+    si está disponible, con el análisis cualitativo de Gemini AI.
+    
+    Body JSON (opcional):
+    {
+        "samples": 5000,
+        "distribution": "pert" | "triangular",
+        "seed": 42,
+        "workers": 4,
+        "ai": true (pedir también el análisis de Gemini)
+    }
     """
     try:
         if scheduler.df_actividades is None:
             return jsonify({"error": "No hay cronograma para analizar"}), 400
         
-        # Importar servicio de Gemini
-        try:
-            from services.gemini_service import get_gemini_service
-            gemini_service = get_gemini_service()
-            
-            if not gemini_service:
-                return jsonify({"error": "Gemini no está configurado"}), 500
-            
-            # Preparar datos para análisis
-            actividades = scheduler.df_actividades.to_dict('records')
-            
-            # Analizar riesgos con Gemini
-            analisis_riesgos = gemini_service.analizar_riesgos_proyecto(actividades)
-            
-            return jsonify({
-                "success": True,
-                "risk_analysis": analisis_riesgos
-            })
-            
-        except ImportError:
-            return jsonify({"error": "Servicio de Gemini no disponible"}), 500
-            
+        data = request.get_json(silent=True) or {}
+        usar_ia = leer_booleano(data.get('ai'), 'ai')
+        procesos = leer_entero(data, 'workers')
+        if procesos is not None and procesos < 1:
+            raise ParameterError("'workers' debe ser un entero positivo")
+        simulacion = scheduler.simular_riesgo(
+            leer_entero(data, 'samples', 5000),
+            data.get('distribution', 'pert'),
+            leer_entero(data, 'seed'),
+            procesos
+        )
+        
+        response = {
+            "success": True,
+            "simulation": {
+                "samples": simulacion['muestras'],
+                "distribution": simulacion['distribucion'],
+                "deterministic_duration": simulacion['determinista'],
+                "mean_duration": simulacion['media'],
+                "std_duration": simulacion['desviacion'],
+                "probability_on_time": simulacion['prob_cumplir'],
+                "percentiles": {
+                    p.upper(): {
+                        "duration": simulacion[p],
+                        "end_date": simulacion[f'fecha_{p}'].strftime('%Y-%m-%d')
+                    }
+                    for p in ('p50', 'p80', 'p90')
+                },
+                "criticality_index": simulacion['criticidad']
+            }
+        }
+        
+        if usar_ia is None or usar_ia:
+            # Importar servicio de Gemini
+            try:
+                from services.gemini_service import get_gemini_service
+                gemini_service = get_gemini_service()
+                
+                if gemini_service:
+                    # Preparar datos para análisis
+                    actividades = scheduler.materializar_fechas(scheduler.df_actividades).to_dict('records')
+                    
+                    # Analizar riesgos con Gemini
+                    response["risk_analysis"] = gemini_service.analizar_riesgos_proyecto(actividades)
+                
+            except ImportError:
+                pass
+        
+        return jsonify(response)
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -310,11 +490,12 @@ def ai_optimize():
                 return jsonify({"error": "Gemini no está configurado"}), 500
             
             # Preparar datos para optimización
-            actividades = scheduler.df_actividades.to_dict('records')
+            actividades = scheduler.materializar_fechas(scheduler.df_actividades).to_dict('records')
+            resumen = generate_summary(scheduler.df_actividades)
             cronograma_actual = {
-                "duracion_total": (scheduler.df_actividades['Fecha_Fin'].max() - scheduler.df_actividades['Fecha_Inicio'].min()).days,
-                "fecha_inicio": scheduler.df_actividades['Fecha_Inicio'].min().strftime('%Y-%m-%d'),
-                "fecha_fin": scheduler.df_actividades['Fecha_Fin'].max().strftime('%Y-%m-%d')
+                "duracion_total": resumen["total_duration"],
+                "fecha_inicio": resumen["start_date"],
+                "fecha_fin": resumen["end_date"]
             }
             
             # Optimizar con Gemini
@@ -334,31 +515,111 @@ def ai_optimize():
 def generate_gantt_data(df):
     """
     Genera datos para el gráfico de Gantt en formato JSON.
+    Recibe un cronograma con fechas ya materializadas.
     """
-    gantt_data = []
+    inicios = df['Fecha_Inicio'].dt.strftime('%Y-%m-%d').tolist()
+    fines = df['Fecha_Fin'].dt.strftime('%Y-%m-%d').tolist()
     
-    for _, row in df.iterrows():
-        gantt_data.append({
-            "task": row['Actividad'],
-            "start": row['Fecha_Inicio'].strftime('%Y-%m-%d'),
-            "end": row['Fecha_Fin'].strftime('%Y-%m-%d'),
-            "duration": row['Duración'],
-            "predecessors": row['Predecesoras']
-        })
+    return [
+        {
+            "task": actividad,
+            "start": inicio,
+            "end": fin,
+            "duration": duracion,
+            "predecessors": predecesoras
+        }
+        for actividad, inicio, fin, duracion, predecesoras in zip(
+            df['Actividad'].tolist(), inicios, fines,
+            df['Duración'].tolist(), df['Predecesoras'].tolist()
+        )
+    ]
+
+def generate_summary(df):
+    """
+    Genera el resumen del cronograma a partir de los días desde el inicio del proyecto.
+    """
+    inicio = int(df['Inicio'].min())
+    fin = int(df['Fin'].max())
+    
+    return {
+        "total_duration": fin - inicio,
+        "start_date": scheduler.fecha_desde_offset(inicio).strftime('%Y-%m-%d'),
+        "end_date": scheduler.fecha_desde_offset(fin).strftime('%Y-%m-%d'),
+        "total_activities": len(df)
+    }
+
+def format_validation(informe):
+    """
+    Convierte el informe de validación de dependencias en JSON.
+    """
+    if informe is None:
+        return None
+    return {
+        "valid": informe['valido'],
+        "cycles": [{"activities": c['actividades'], "cycle": c['ciclo']} for c in informe['ciclos']],
+        "self_references": informe['autorreferencias'],
+        "missing_predecessors": [
+            {"activity": r['actividad'], "predecessor": r['predecesora'], "suggestions": r['sugerencias']}
+            for r in informe['predecesoras_inexistentes']
+        ],
+        "approximate_matches": [
+            {"activity": r['actividad'], "predecessor": r['predecesora'], "resolved_to": r['resuelta']}
+            for r in informe['coincidencias_aproximadas']
+        ]
+    }
+
+def format_dependencies(dependencias):
+    """
+    Convierte pares (predecesora, actividad) en objetos JSON.
+    """
+    return [{"predecessor": predecesora, "activity": actividad} for predecesora, actividad in dependencias]
+
+def leer_booleano(valor, clave):
+    """
+    Interpreta un indicador enviado como booleano JSON, 0/1 o texto
+    ("true"/"false", "sí"/"no", ...). None significa que no se envió.
     
-    return gantt_data
+    Raises:
+        ParameterError: Si el valor no es un indicador reconocible
+    """
+    if valor is None or isinstance(valor, bool):
+        return valor
+    if isinstance(valor, int) and valor in (0, 1):
+        return bool(valor)
+    if isinstance(valor, str):
+        texto = valor.strip().lower()
+        if texto in VALORES_VERDADEROS:
+            return True
+        if texto in VALORES_FALSOS:
+            return False
+    raise ParameterError(f"'{clave}' debe ser true o false: {valor!r}")
+
+def leer_entero(data, clave, defecto=None):
+    """
+    Lee un entero del cuerpo JSON; acepta también cadenas como "4". Sin valor por
+    omisión el parámetro es opcional y puede faltar o ser null.
+    
+    Raises:
+        ParameterError: Si el valor no es un entero
+    """
+    valor = data.get(clave, defecto)
+    if valor is None and defecto is None:
+        return None
+    if isinstance(valor, bool) or (isinstance(valor, float) and not valor.is_integer()):
+        raise ParameterError(f"'{clave}' debe ser un entero: {valor!r}")
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ParameterError(f"'{clave}' debe ser un entero: {valor!r}") from None
 
 def allowed_file(filename):
     """
     Verifica si el tipo de archivo está permitido.
     """
-    ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
+    ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls', 'xml'}
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 if __name__ == '__main__':
-    # Crear directorio de uploads si no existe
-    os.makedirs('uploads', exist_ok=True)
-    
     # Ejecutar servidor
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de Ruta Crítica (CPM)
+===========================
+
+Implementa el método de la ruta crítica sobre la red de actividades del
+cronograma: orden topológico, pasada hacia adelante, pasada hacia atrás y
+cálculo de holguras total y libre. Todas las etapas son O(V+E), por lo que
+el resultado no depende del orden en que vengan las filas del archivo.
+
+Hay dos núcleos equivalentes: uno escalar que recorre las actividades en orden
+topológico y otro vectorizado que agrupa la red por niveles y calcula todas
+las actividades de un nivel a la vez con `np.maximum.reduceat`. `calcular_cpm`
+elige el vectorizado automáticamente para redes grandes.
+
+`actualizar_actividad` recalcula de forma incremental tras cambiar una sola
+actividad: solo recorre el cono de actividades afectadas y se detiene donde
+las fechas ya no cambian.
+
+Si algunas actividades tienen calendario propio (`grafo.ajuste_fin`), su fin se
+calcula con ese calendario durante la pasada hacia adelante y la pasada hacia
+atrás usa la duración efectiva resultante (fin - inicio).
+"""
+
+import heapq
+from collections import deque
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .schedule_graph import ScheduleGraph
+
+# A partir de este número de actividades se usa el núcleo vectorizado
+UMBRAL_VECTORIZADO = 5000
+
+# Si la red resulta ser casi una cadena (niveles muy estrechos), el coste fijo
+# por nivel de NumPy supera al recorrido escalar y se vuelve a este último
+NIVELES_MINIMOS_VECTORIZADO = 64
+ANCHO_MINIMO_NIVEL = 16
+
+# Máximo de actividades que recorre una actualización incremental antes de
+# recurrir al cálculo completo (que para conos grandes es más rápido)
+LIMITE_PROPAGACION = 2000
+
+
+def orden_topologico(grafo: ScheduleGraph) -> np.ndarray:
+    """
+    Calcula un orden topológico de la red con el algoritmo de Kahn.
+
+    Args:
+        grafo (ScheduleGraph): Red de actividades
+
+    Returns:
+        np.ndarray: Ids de actividades en orden topológico
+
+    Raises:
+        ValueError: Si la red contiene dependencias circulares
+    """
+    n = grafo.n
+    suc_ptr = grafo.suc_ptr.tolist()
+    suc_idx = grafo.suc_idx.tolist()
+    grado = np.diff(grafo.pred_ptr).tolist()
+
+    cola = deque(i for i in range(n) if grado[i] == 0)
+    orden = []
+    while cola:
+        i = cola.popleft()
+        orden.append(i)
+        for k in range(suc_ptr[i], suc_ptr[i + 1]):
+            s = suc_idx[k]
+            grado[s] -= 1
+            if grado[s] == 0:
+                cola.append(s)
+
+    if len(orden) < n:
+        pendientes = [grafo.nombres[i] for i in range(n) if grado[i] > 0]
+        raise ValueError(f"Dependencias circulares detectadas entre: {', '.join(pendientes)}")
+
+    return np.asarray(orden, dtype=np.int32)
+
+
+def calcular_cpm(grafo: ScheduleGraph, metodo: str = 'auto') -> ScheduleGraph:
+    """
+    Ejecuta las pasadas hacia adelante y hacia atrás del método de la ruta crítica.
+
+    Las fechas se expresan en días desde el inicio del proyecto. Una actividad
+    empieza cuando terminan todas sus predecesoras y termina `duración` días
+    después de empezar. Los resultados se guardan en los arreglos del grafo.
+
+    Args:
+        grafo (ScheduleGraph): Red de actividades
+        metodo (str): 'escalar', 'vectorizado' o 'auto' (según UMBRAL_VECTORIZADO)
+
+    Returns:
+        ScheduleGraph: El mismo grafo con inicio/fin tempranos y tardíos y holguras
+    """
+    if metodo == 'auto':
+        metodo = 'vectorizado' if grafo.n >= UMBRAL_VECTORIZADO else 'escalar'
+
+    if metodo == 'vectorizado':
+        niveles = niveles_topologicos(grafo, permitir_abandono=True)
+        if niveles is not None:
+            _cpm_vectorizado(grafo, niveles)
+        else:
+            _cpm_escalar(grafo)
+    elif metodo == 'escalar':
+        _cpm_escalar(grafo)
+    else:
+        raise ValueError(f"Método de cálculo no válido: {metodo}")
+
+    grafo.rango = np.empty(grafo.n, dtype=np.int32)
+    grafo.rango[grafo.orden] = np.arange(grafo.n, dtype=np.int32)
+    return grafo
+
+
+def _cpm_escalar(grafo: ScheduleGraph) -> ScheduleGraph:
+    """Núcleo escalar: recorre las actividades una a una en orden topológico."""
+    n = grafo.n
+    orden = orden_topologico(grafo)
+    grafo.orden = orden
+
+    # Listas nativas: el acceso elemento a elemento es mucho más rápido que en NumPy
+    duracion = grafo.duracion.tolist()
+    pred_ptr = grafo.pred_ptr.tolist()
+    pred_idx = grafo.pred_idx.tolist()
+    suc_ptr = grafo.suc_ptr.tolist()
+    suc_idx = grafo.suc_idx.tolist()
+    orden = orden.tolist()
+
+    propio = grafo.calendario_propio.tolist() if grafo.ajuste_fin is not None else None
+
+    # Pasada hacia adelante
+    inicio = [0] * n
+    fin = [0] * n
+    for i in orden:
+        inicio[i] = max((fin[pred_idx[k]] for k in range(pred_ptr[i], pred_ptr[i + 1])), default=0)
+        if propio is not None and propio[i]:
+            fin[i] = int(grafo.ajuste_fin(np.array([i]), np.array([inicio[i]]))[0])
+        else:
+            fin[i] = inicio[i] + duracion[i]
+
+    fin_proyecto = max(fin, default=0)
+    if propio is not None:
+        duracion = [fin[i] - inicio[i] for i in range(n)]
+
+    # Pasada hacia atrás
+    inicio_tardio = [0] * n
+    fin_tardio = [0] * n
+    for i in reversed(orden):
+        fin_tardio[i] = min((inicio_tardio[suc_idx[k]] for k in range(suc_ptr[i], suc_ptr[i + 1])),
+                            default=fin_proyecto)
+        inicio_tardio[i] = fin_tardio[i] - duracion[i]
+
+    holgura_libre = [
+        min((inicio[suc_idx[k]] for k in range(suc_ptr[i], suc_ptr[i + 1])), default=fin_proyecto) - fin[i]
+        for i in range(n)
+    ]
+
+    grafo.inicio = np.asarray(inicio, dtype=np.int32)
+    grafo.fin = np.asarray(fin, dtype=np.int32)
+    grafo.inicio_tardio = np.asarray(inicio_tardio, dtype=np.int32)
+    grafo.fin_tardio = np.asarray(fin_tardio, dtype=np.int32)
+    grafo.holgura_libre = np.asarray(holgura_libre, dtype=np.int32)
+    return grafo
+
+
+def _rangos_csr(ptr: np.ndarray, nodos: np.ndarray):
+    """
+    Concatena los rangos CSR de varios nodos sin bucles de Python.
+
+    Args:
+        ptr (np.ndarray): Punteros CSR
+        nodos (np.ndarray): Nodos cuyos vecinos se quieren recorrer
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Posiciones de las aristas en el arreglo de
+        índices y longitud del rango de cada nodo
+    """
+    inicios = ptr[nodos]
+    longitudes = ptr[nodos + 1] - inicios
+    total = int(longitudes.sum())
+    desplazamiento = np.cumsum(longitudes) - longitudes
+    posiciones = np.repeat(inicios - desplazamiento, longitudes) + np.arange(total)
+    return posiciones, longitudes
+
+
+def plan_reduccion(ptr: np.ndarray, idx: np.ndarray, nodos: np.ndarray):
+    """
+    Prepara la reducción de los vecinos de un nivel como una serie de operaciones
+    elemento a elemento: los nodos se ordenan por grado descendente y el paso k
+    reúne el k-ésimo vecino de los nodos que lo tienen (siempre un prefijo).
+
+    Args:
+        ptr (np.ndarray): Punteros CSR de la adyacencia a reducir
+        idx (np.ndarray): Índices CSR de la adyacencia a reducir
+        nodos (np.ndarray): Nodos del nivel, todos con al menos un vecino
+
+    Returns:
+        Tuple[np.ndarray, List[np.ndarray]]: Nodos ordenados y vecinos de cada paso
+    """
+    grado = (ptr[nodos + 1] - ptr[nodos]).astype(np.int64)
+    orden = np.argsort(-grado, kind='stable')
+    nodos, grado = nodos[orden], grado[orden]
+    pasos = []
+    for k in range(int(grado[0]) if grado.size else 0):
+        cuantos = int(np.count_nonzero(grado > k))
+        pasos.append(idx[ptr[nodos[:cuantos]] + k])
+    return nodos, pasos
+
+
+def reducir_filas(valores: np.ndarray, pasos, ufunc) -> np.ndarray:
+    """
+    Reduce con `ufunc` las filas de los vecinos de cada nodo según un plan de
+    `plan_reduccion`. Equivale a `ufunc.reduceat(valores[vecinos], axis=0)`,
+    pero cada paso recorre filas contiguas y es bastante más rápido.
+
+    Args:
+        valores (np.ndarray): Matriz con una fila por actividad
+        pasos (List[np.ndarray]): Vecinos de cada paso del plan
+        ufunc: Reducción a aplicar (np.maximum, np.minimum, np.bitwise_or...)
+
+    Returns:
+        np.ndarray: Una fila por nodo del plan, en el orden del plan
+    """
+    acumulado = valores[pasos[0]]
+    for vecinos in pasos[1:]:
+        parcial = acumulado[:len(vecinos)]
+        ufunc(parcial, valores[vecinos], out=parcial)
+    return acumulado
+
+
+def niveles_topologicos(grafo: ScheduleGraph, permitir_abandono: bool = False):
+    """
+    Agrupa las actividades por nivel: nivel 0 sin predecesoras y, en general,
+    cada actividad un nivel por encima de su predecesora más profunda.
+
+    Args:
+        grafo (ScheduleGraph): Red de actividades
+        permitir_abandono (bool): Devolver None si la red es demasiado profunda
+            para que compense procesarla por niveles
+
+    Returns:
+        List[np.ndarray] o None: Ids de las actividades de cada nivel
+
+    Raises:
+        ValueError: Si la red contiene dependencias circulares
+    """
+    n = grafo.n
+    grado = np.diff(grafo.pred_ptr)
+    frontera = np.flatnonzero(grado == 0).astype(np.int32)
+    niveles = []
+    procesadas = 0
+
+    while frontera.size:
+        niveles.append(frontera)
+        procesadas += frontera.size
+
+        if (permitir_abandono and len(niveles) >= NIVELES_MINIMOS_VECTORIZADO
+                and procesadas < ANCHO_MINIMO_NIVEL * len(niveles)):
+            return None
+
+        posiciones, _ = _rangos_csr(grafo.suc_ptr, frontera)
+        sucesoras = grafo.suc_idx[posiciones]
+        np.subtract.at(grado, sucesoras, 1)
+        candidatas = np.unique(sucesoras)
+        frontera = candidatas[grado[candidatas] == 0]
+
+    if procesadas < n:
+        pendientes = [grafo.nombres[i] for i in np.flatnonzero(grado > 0).tolist()]
+        raise ValueError(f"Dependencias circulares detectadas entre: {', '.join(pendientes)}")
+
+    return niveles
+
+
+def _cpm_vectorizado(grafo: ScheduleGraph, niveles) -> ScheduleGraph:
+    """Núcleo vectorizado: calcula cada nivel completo con reducciones de NumPy."""
+    n = grafo.n
+    grafo.orden = np.concatenate(niveles) if niveles else np.zeros(0, dtype=np.int32)
+    duracion = grafo.duracion.astype(np.int64)
+
+    # Pasada hacia adelante: en los niveles >= 1 toda actividad tiene predecesoras,
+    # así que ningún segmento de reduceat queda vacío
+    inicio = np.zeros(n, dtype=np.int64)
+    fin = np.zeros(n, dtype=np.int64)
+    for k, nodos in enumerate(niveles):
+        if k > 0:
+            posiciones, longitudes = _rangos_csr(grafo.pred_ptr, nodos)
+            segmentos = np.cumsum(longitudes) - longitudes
+            inicio[nodos] = np.maximum.reduceat(fin[grafo.pred_idx[posiciones]], segmentos)
+        fin[nodos] = inicio[nodos] + duracion[nodos]
+        if grafo.ajuste_fin is not None:
+            propios = nodos[grafo.calendario_propio[nodos]]
+            if propios.size:
+                fin[propios] = grafo.ajuste_fin(propios, inicio[propios])
+
+    fin_proyecto = int(fin.max()) if n else 0
+    if grafo.ajuste_fin is not None:
+        duracion = fin - inicio
+
+    # Pasada hacia atrás: las actividades sin sucesoras terminan al final del proyecto
+    inicio_tardio = np.zeros(n, dtype=np.int64)
+    fin_tardio = np.full(n, fin_proyecto, dtype=np.int64)
+    for nodos in reversed(niveles):
+        con_sucesoras = nodos[grafo.suc_ptr[nodos + 1] > grafo.suc_ptr[nodos]]
+        if con_sucesoras.size:
+            posiciones, longitudes = _rangos_csr(grafo.suc_ptr, con_sucesoras)
+            segmentos = np.cumsum(longitudes) - longitudes
+            fin_tardio[con_sucesoras] = np.minimum.reduceat(inicio_tardio[grafo.suc_idx[posiciones]], segmentos)
+        inicio_tardio[nodos] = fin_tardio[nodos] - duracion[nodos]
+
+    # Holgura libre: inicio temprano más cercano de las sucesoras menos el fin propio
+    siguiente = np.full(n, fin_proyecto, dtype=np.int64)
+    con_sucesoras = np.flatnonzero(np.diff(grafo.suc_ptr) > 0)
+    if con_sucesoras.size:
+        siguiente[con_sucesoras] = np.minimum.reduceat(inicio[grafo.suc_idx], grafo.suc_ptr[con_sucesoras])
+
+    grafo.inicio = inicio.astype(np.int32)
+    grafo.fin = fin.astype(np.int32)
+    grafo.inicio_tardio = inicio_tardio.astype(np.int32)
+    grafo.fin_tardio = fin_tardio.astype(np.int32)
+    grafo.holgura_libre = (siguiente - fin).astype(np.int32)
+    return grafo
+
+
+def actualizar_actividad(grafo: ScheduleGraph, i: int, duracion: Optional[int] = None,
+                         predecesoras: Optional[Sequence[int]] = None) -> np.ndarray:
+    """
+    Cambia la duración y/o las predecesoras de una actividad y recalcula solo lo necesario.
+
+    El grafo debe haber pasado antes por `calcular_cpm`. Las fechas tempranas se
+    propagan hacia las sucesoras en orden topológico y las tardías hacia las
+    predecesoras; en ambos casos la propagación se corta en cuanto una actividad
+    no cambia.
+
+    Args:
+        grafo (ScheduleGraph): Red ya calculada
+        i (int): Id de la actividad modificada
+        duracion (int, opcional): Nueva duración en días
+        predecesoras (Sequence[int], opcional): Ids de las nuevas predecesoras
+
+    Returns:
+        np.ndarray: Ids de las actividades cuyas fechas tempranas cambiaron (y la
+        propia actividad). Las fechas tardías y holguras de todo el grafo quedan
+        actualizadas.
+
+    Raises:
+        ValueError: Si la duración es negativa o las predecesoras crean un ciclo
+    """
+    if grafo.rango is None:
+        raise ValueError("El cronograma debe calcularse antes de actualizarlo")
+
+    # Toda la validación va antes de modificar el grafo: una edición rechazada
+    # no puede dejarlo distinto del cronograma
+    if duracion is not None and duracion < 0:
+        raise ValueError("La duración no puede ser negativa")
+    nuevas = None
+    if predecesoras is not None:
+        nuevas = list(dict.fromkeys(int(p) for p in predecesoras if int(p) != i))
+        fuera = [p for p in nuevas if not 0 <= p < grafo.n]
+        if fuera:
+            raise ValueError(f"Predecesoras inexistentes: {fuera}")
+    grafo.asegurar_escritura()
+
+    afectadas_atras = {i}
+    if nuevas is not None:
+        anteriores = grafo.predecesoras(i).tolist()
+        # Reordenar antes de tocar la adyacencia; si una arista crea un ciclo se
+        # restaura el orden anterior y el grafo queda como estaba
+        rango, orden = grafo.rango.copy(), grafo.orden.copy()
+        try:
+            for p in nuevas:
+                if grafo.rango[p] > grafo.rango[i]:
+                    _reordenar_para_arista(grafo, p, i)
+        except ValueError:
+            grafo.rango, grafo.orden = rango, orden
+            raise
+        grafo.reemplazar_predecesoras(i, nuevas)
+        afectadas_atras.update(anteriores)
+        afectadas_atras.update(nuevas)
+
+    if duracion is not None:
+        grafo.duracion[i] = duracion
+
+    limite = LIMITE_PROPAGACION
+    inicio_anterior, fin_anterior = grafo.inicio.copy(), grafo.fin.copy()
+    fin_proyecto_anterior = grafo.duracion_total
+
+    # Con calendarios propios la duración efectiva depende del inicio: se recalcula todo
+    cambiadas = _propagar_adelante(grafo, i, limite) if grafo.ajuste_fin is None else None
+    if cambiadas is not None:
+        fin_proyecto = grafo.duracion_total
+        delta = fin_proyecto - fin_proyecto_anterior
+        if delta:
+            # Todas las fechas tardías son "fin del proyecto menos un camino", así
+            # que un cambio del fin del proyecto las desplaza a todas por igual
+            grafo.inicio_tardio += delta
+            grafo.fin_tardio += delta
+        if _propagar_atras(grafo, afectadas_atras, fin_proyecto, limite) is None:
+            cambiadas = None
+
+    if cambiadas is None:
+        # El cono afectado es demasiado grande: recalcular la red completa
+        calcular_cpm(grafo)
+        distintas = (grafo.inicio != inicio_anterior) | (grafo.fin != fin_anterior)
+        distintas[i] = True
+        return np.flatnonzero(distintas).astype(np.int32)
+
+    # Holgura libre: depende del fin propio y del inicio de las sucesoras
+    if delta:
+        sin_sucesoras = np.diff(grafo.suc_ptr) == 0
+        grafo.holgura_libre[sin_sucesoras] = fin_proyecto - grafo.fin[sin_sucesoras]
+    revisar_libre = set(afectadas_atras)
+    for u in cambiadas:
+        revisar_libre.add(u)
+        revisar_libre.update(grafo.predecesoras(u).tolist())
+    for u in revisar_libre:
+        sucesoras = grafo.sucesoras(u)
+        siguiente = int(grafo.inicio[sucesoras].min()) if sucesoras.size else fin_proyecto
+        grafo.holgura_libre[u] = siguiente - int(grafo.fin[u])
+
+    return np.asarray(sorted(set(cambiadas) | {i}), dtype=np.int32)
+
+
+def _reordenar_para_arista(grafo: ScheduleGraph, p: int, i: int) -> None:
+    """
+    Repara el orden topológico antes de añadir la arista p -> i (algoritmo de
+    Pearce-Kelly). Solo se reordenan las actividades cuyo rango está entre el
+    de `i` y el de `p`.
+
+    Raises:
+        ValueError: Si `p` es alcanzable desde `i` (la arista crearía un ciclo)
+    """
+    rango = grafo.rango
+    limite_inf, limite_sup = int(rango[i]), int(rango[p])
+
+    # Descendientes de i dentro de la ventana
+    adelante, pila, vistos = [], [i], {i}
+    while pila:
+        u = pila.pop()
+        adelante.append(u)
+        for s in grafo.sucesoras(u).tolist():
+            if s == p:
+                raise ValueError(
+                    f"La dependencia {grafo.nombres[p]} -> {grafo.nombres[i]} crearía un ciclo"
+                )
+            if s not in vistos and rango[s] <= limite_sup:
+                vistos.add(s)
+                pila.append(s)
+
+    # Ancestros de p dentro de la ventana
+    atras, pila, vistos = [], [p], {p}
+    while pila:
+        u = pila.pop()
+        atras.append(u)
+        for q in grafo.predecesoras(u).tolist():
+            if q not in vistos and rango[q] >= limite_inf:
+                vistos.add(q)
+                pila.append(q)
+
+    # Los ancestros de p pasan delante de los descendientes de i, reutilizando sus rangos
+    atras.sort(key=lambda u: rango[u])
+    adelante.sort(key=lambda u: rango[u])
+    rangos = sorted(int(rango[u]) for u in atras + adelante)
+    for u, r in zip(atras + adelante, rangos):
+        rango[u] = r
+        grafo.orden[r] = u
+
+
+def _propagar_adelante(grafo: ScheduleGraph, origen: int, limite: int):
+    """
+    Recalcula inicio/fin tempranos desde `origen` hacia sus sucesoras.
+    Devuelve las actividades que cambiaron, o None si se supera `limite`.
+    """
+    rango = grafo.rango
+    cola = [(int(rango[origen]), origen)]
+    en_cola = {origen}
+    cambiadas = []
+
+    while cola:
+        _, u = heapq.heappop(cola)
+        en_cola.discard(u)
+        preds = grafo.predecesoras(u)
+        inicio = int(grafo.fin[preds].max()) if preds.size else 0
+        fin = inicio + int(grafo.duracion[u])
+        if inicio == grafo.inicio[u] and fin == grafo.fin[u]:
+            continue
+        fin_cambio = fin != grafo.fin[u]
+        grafo.inicio[u] = inicio
+        grafo.fin[u] = fin
+        cambiadas.append(u)
+        if len(cambiadas) > limite:
+            return None
+        if fin_cambio:
+            for s in grafo.sucesoras(u).tolist():
+                if s not in en_cola:
+                    en_cola.add(s)
+                    heapq.heappush(cola, (int(rango[s]), s))
+
+    return cambiadas
+
+
+def _propagar_atras(grafo: ScheduleGraph, origenes, fin_proyecto: int, limite: int):
+    """
+    Recalcula inicio/fin tardíos desde `origenes` hacia sus predecesoras.
+    Devuelve las actividades que cambiaron, o None si se supera `limite`.
+    """
+    rango = grafo.rango
+    cola = [(-int(rango[u]), u) for u in origenes]
+    heapq.heapify(cola)
+    en_cola = set(origenes)
+    cambiadas = []
+
+    while cola:
+        _, u = heapq.heappop(cola)
+        en_cola.discard(u)
+        sucesoras = grafo.sucesoras(u)
+        fin_tardio = int(grafo.inicio_tardio[sucesoras].min()) if sucesoras.size else fin_proyecto
+        inicio_tardio = fin_tardio - int(grafo.duracion[u])
+        if inicio_tardio == grafo.inicio_tardio[u] and fin_tardio == grafo.fin_tardio[u]:
+            continue
+        inicio_cambio = inicio_tardio != grafo.inicio_tardio[u]
+        grafo.inicio_tardio[u] = inicio_tardio
+        grafo.fin_tardio[u] = fin_tardio
+        cambiadas.append(u)
+        if len(cambiadas) > limite:
+            return None
+        if inicio_cambio:
+            for q in grafo.predecesoras(u).tolist():
+                if q not in en_cola:
+                    en_cola.add(q)
+                    heapq.heappush(cola, (-int(rango[q]), q))
+
+    return cambiadas
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Validación de dependencias
+==========================
+
+Informe estructurado de los problemas de la red de predecesoras:
+
+- ciclos: componentes fuertemente conexas de más de una actividad (algoritmo
+  de Tarjan, O(V+E)), cada una con un ciclo concreto como ejemplo
+- autorreferencias: actividades que se nombran a sí mismas como predecesoras
+- predecesoras inexistentes: nombres que no corresponden a ninguna actividad,
+  con los nombres más parecidos como sugerencia
+- coincidencias aproximadas: referencias que se enlazaron por similitud
+
+Las tres últimas se detectan al construir el ScheduleGraph, así que el
+informe solo recorre la red cuando hay que buscar ciclos.
+"""
+
+from collections import deque
+from typing import Dict, List
+
+import numpy as np
+
+from .schedule_graph import ScheduleGraph
+
+# Similitud mínima para sugerir un nombre a una predecesora inexistente
+UMBRAL_SUGERENCIA = 0.3
+
+
+def componentes_fuertes(grafo: ScheduleGraph) -> List[List[int]]:
+    """
+    Calcula las componentes fuertemente conexas con más de una actividad.
+
+    Versión iterativa del algoritmo de Tarjan sobre la adyacencia de sucesoras.
+
+    Args:
+        grafo (ScheduleGraph): Red de actividades
+
+    Returns:
+        List[List[int]]: Ids de las actividades de cada componente cíclica
+    """
+    n = grafo.n
+    suc_ptr = grafo.suc_ptr.tolist()
+    suc_idx = grafo.suc_idx.tolist()
+
+    indice = [-1] * n
+    bajo = [0] * n
+    en_pila = [False] * n
+    pila = []
+    componentes = []
+    contador = 0
+
+    for raiz in range(n):
+        if indice[raiz] != -1:
+            continue
+        # Cada marco guarda el nodo y la próxima arista por explorar
+        marcos = [(raiz, suc_ptr[raiz])]
+        indice[raiz] = bajo[raiz] = contador
+        contador += 1
+        pila.append(raiz)
+        en_pila[raiz] = True
+
+        while marcos:
+            v, k = marcos[-1]
+            if k < suc_ptr[v + 1]:
+                marcos[-1] = (v, k + 1)
+                w = suc_idx[k]
+                if indice[w] == -1:
+                    indice[w] = bajo[w] = contador
+                    contador += 1
+                    pila.append(w)
+                    en_pila[w] = True
+                    marcos.append((w, suc_ptr[w]))
+                elif en_pila[w] and indice[w] < bajo[v]:
+                    bajo[v] = indice[w]
+                continue
+
+            marcos.pop()
+            if marcos:
+                padre = marcos[-1][0]
+                if bajo[v] < bajo[padre]:
+                    bajo[padre] = bajo[v]
+            if bajo[v] == indice[v]:
+                componente = []
+                while True:
+                    w = pila.pop()
+                    en_pila[w] = False
+                    componente.append(w)
+                    if w == v:
+                        break
+                if len(componente) > 1:
+                    componentes.append(componente[::-1])
+
+    return componentes
+
+
+def ciclo_de_componente(grafo: ScheduleGraph, componente: List[int]) -> List[int]:
+    """
+    Encuentra un ciclo concreto dentro de una componente fuertemente conexa.
+
+    Args:
+        grafo (ScheduleGraph): Red de actividades
+        componente (List[int]): Ids de la componente
+
+    Returns:
+        List[int]: Ids del ciclo, empezando y terminando en la misma actividad
+    """
+    miembros = set(componente)
+    inicio = componente[0]
+    padre = {inicio: None}
+    cola = deque([inicio])
+    while cola:
+        v = cola.popleft()
+        for w in grafo.sucesoras(v).tolist():
+            if w == inicio:
+                camino = [v]
+                while padre[camino[-1]] is not None:
+                    camino.append(padre[camino[-1]])
+                return camino[::-1] + [inicio]
+            if w in miembros and w not in padre:
+                padre[w] = v
+                cola.append(w)
+    return [inicio]
+
+
+def validar_red(grafo: ScheduleGraph, buscar_ciclos: bool = True) -> Dict:
+    """
+    Genera el informe de validación de las dependencias.
+
+    Args:
+        grafo (ScheduleGraph): Red de actividades construida con `desde_listas`
+        buscar_ciclos (bool): Recorrer la red buscando ciclos; puede omitirse si
+            ya se sabe que la red es acíclica (p. ej. porque el CPM terminó)
+
+    Returns:
+        Dict: 'valido' (la red puede programarse), 'ciclos' (actividades y ciclo
+        de ejemplo de cada componente), 'autorreferencias',
+        'predecesoras_inexistentes' (actividad, nombre no encontrado y sugerencias)
+        y 'coincidencias_aproximadas' (actividad, nombre escrito y actividad enlazada)
+    """
+    ciclos = []
+    if buscar_ciclos:
+        for componente in componentes_fuertes(grafo):
+            ciclos.append({
+                'actividades': [grafo.nombres[i] for i in sorted(componente)],
+                'ciclo': [grafo.nombres[i] for i in ciclo_de_componente(grafo, componente)],
+            })
+
+    autorreferencias = [grafo.nombres[i] for i in np.unique(grafo.autorreferencias).tolist()]
+    inexistentes = []
+    for i, nombre in grafo.referencias_inexistentes:
+        sugerencias = [grafo.nombres[j] for j, similitud in grafo.indice.candidatos(nombre)
+                       if similitud >= UMBRAL_SUGERENCIA]
+        inexistentes.append({'actividad': grafo.nombres[i], 'predecesora': nombre, 'sugerencias': sugerencias})
+    aproximadas = [{'actividad': grafo.nombres[i], 'predecesora': nombre, 'resuelta': grafo.nombres[j]}
+                   for i, nombre, j in grafo.referencias_aproximadas]
+
+    return {
+        'valido': not ciclos,
+        'ciclos': ciclos,
+        'autorreferencias': autorreferencias,
+        'predecesoras_inexistentes': inexistentes,
+        'coincidencias_aproximadas': aproximadas,
+    }
+
+
+def describir_ciclos(informe: Dict) -> str:
+    """Resume los ciclos de un informe en una línea, p. ej. 'A -> B -> A; C -> D -> C'."""
+    return '; '.join(' -> '.join(c['ciclo']) for c in informe['ciclos'])
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Importación de MS Project (MSPDI)
+=================================
+
+Lee los archivos XML de MS Project (formato MSPDI, "Guardar como XML") y los
+convierte en la tabla de actividades del scheduler
+[Actividad, Duración, Predecesoras].
+
+El XML se recorre como flujo con `iterparse`: cada tarea se convierte en una
+fila en cuanto se cierra su elemento y después se descarta, igual que los
+bloques de calendarios, recursos y asignaciones, de modo que la memoria no
+crece con el tamaño del archivo sino solo con el número de tareas.
+
+Como el scheduler solo programa actividades con duración, las tareas de
+resumen, los hitos y las tareas nulas no se importan, pero sus vínculos se
+conservan:
+
+- Un vínculo hacia un hito o una tarea nula pasa a sus predecesoras
+- Un vínculo hacia una tarea de resumen pasa a sus tareas finales (las que no
+  preceden a otra dentro del resumen)
+- Las predecesoras de una tarea de resumen se aplican a todas sus subtareas
+
+El scheduler solo maneja vínculos fin-comienzo sin desfase; los demás tipos y
+los desfases se importan como fin-comienzo y se cuentan en el informe.
+"""
+
+import math
+import re
+from datetime import date, datetime
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple, Union
+from xml.etree.ElementTree import iterparse
+
+import pandas as pd
+
+from .table_ingestion import InputError
+
+# Minutos de una jornada si el proyecto no indica MinutesPerDay
+MINUTOS_POR_DIA = 480
+
+# Tipo de vínculo fin-comienzo en MSPDI (0 FF, 1 FC, 2 CF, 3 CC)
+VINCULO_FIN_COMIENZO = 1
+
+# Duraciones ISO 8601 como 'PT16H0M0S' o 'P2DT4H0M0S' (días de jornada)
+PATRON_DURACION_MSPDI = re.compile(
+    r'-?P(?:(\d+(?:\.\d+)?)D)?(?:T(?:(\d+(?:\.\d+)?)H)?(?:(\d+(?:\.\d+)?)M)?(?:(\d+(?:\.\d+)?)S)?)?')
+
+
+def minutos_duracion_mspdi(texto: Optional[str], minutos_por_dia: float = MINUTOS_POR_DIA) -> float:
+    """
+    Convierte una duración de MSPDI en minutos de trabajo.
+
+    Args:
+        texto (str): Duración ISO 8601 ('PT16H0M0S', 'P2DT4H0M0S')
+        minutos_por_dia (float): Minutos de una jornada, para los días
+
+    Returns:
+        float: Minutos (0 si el texto está vacío o no es una duración)
+    """
+    coincidencia = PATRON_DURACION_MSPDI.fullmatch((texto or '').strip())
+    if not coincidencia:
+        return 0.0
+    dias, horas, minutos, segundos = (float(valor) if valor else 0.0 for valor in coincidencia.groups())
+    return dias * minutos_por_dia + horas * 60 + minutos + segundos / 60
+
+
+def leer_mspdi(ruta: Union[str, BinaryIO]) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Lee un archivo MSPDI de MS Project como flujo.
+
+    Las duraciones se pasan a días de jornada (MinutesPerDay del proyecto)
+    redondeando hacia arriba, porque el cronograma se programa por días. Los
+    nombres con comas las cambian por ';' (la coma separa predecesoras) y los
+    nombres repetidos se distinguen con el ID de la tarea.
+
+    Args:
+        ruta (str | BinaryIO): Ruta del archivo .xml o archivo en memoria
+
+    Returns:
+        Tuple[pd.DataFrame, Dict]: Actividades [Actividad, Duración, Predecesoras] e
+        informe con 'fecha_inicio' (fecha de comienzo del proyecto o None),
+        'omitidas' (tareas de resumen, hitos y nulas) y 'vinculos_aproximados'
+        (vínculos de otro tipo o con desfase importados como fin-comienzo)
+
+    Raises:
+        InputError: Si el archivo no es un proyecto MSPDI
+    """
+    minutos_por_dia = float(MINUTOS_POR_DIA)
+    fecha_inicio: Optional[date] = None
+
+    # Datos de cada tarea, en el orden del archivo
+    uids: List[str] = []
+    ids: List[str] = []
+    nombres: List[str] = []
+    duraciones: List[str] = []
+    niveles: List[int] = []
+    resumen: List[bool] = []
+    nulas: List[bool] = []
+    predecesoras: List[List[str]] = []
+    aproximados: List[int] = []
+
+    eventos = iterparse(ruta, events=('start', 'end'))
+    _, raiz = next(eventos)
+    if raiz.tag.rsplit('}', 1)[-1] != 'Project':
+        raise InputError("El archivo XML no es un proyecto de MS Project (MSPDI)")
+
+    # Las etiquetas se comparan completas, con el espacio de nombres de la raíz
+    ns = raiz.tag[:-len('Project')]
+    tarea, vinculo = ns + 'Task', ns + 'PredecessorLink'
+    minutos_dia, comienzo = ns + 'MinutesPerDay', ns + 'StartDate'
+
+    def texto(campos: Dict, nombre: str) -> str:
+        return (campos.get(ns + nombre) or '').strip()
+
+    profundidad = 1
+    coleccion = None
+    for evento, elemento in eventos:
+        if evento == 'start':
+            profundidad += 1
+            if profundidad == 2:
+                coleccion = elemento
+            continue
+
+        profundidad -= 1
+        if profundidad == 2:
+            if elemento.tag == tarea:
+                campos = {hijo.tag: hijo.text for hijo in elemento}
+                vinculos = [{dato.tag: dato.text for dato in hijo} for hijo in elemento.iterfind(vinculo)]
+                uids.append(texto(campos, 'UID'))
+                ids.append(texto(campos, 'ID'))
+                nombres.append(texto(campos, 'Name'))
+                duraciones.append(texto(campos, 'Duration'))
+                niveles.append(int(texto(campos, 'OutlineLevel') or 0))
+                resumen.append(texto(campos, 'Summary') == '1')
+                nulas.append(texto(campos, 'IsNull') == '1')
+                predecesoras.append([texto(v, 'PredecessorUID') for v in vinculos])
+                aproximados.append(sum(int(texto(v, 'Type') or VINCULO_FIN_COMIENZO) != VINCULO_FIN_COMIENZO
+                                       or float(texto(v, 'LinkLag') or 0) != 0 for v in vinculos))
+            # Cada elemento de una colección se descarta al procesarlo
+            coleccion.clear()
+        elif profundidad == 1:
+            # Datos generales del proyecto y colecciones completas
+            if elemento.tag == minutos_dia and elemento.text:
+                minutos_por_dia = float(elemento.text) or minutos_por_dia
+            elif elemento.tag == comienzo and elemento.text:
+                fecha_inicio = datetime.fromisoformat(elemento.text.strip()).date()
+            raiz.clear()
+
+    n = len(uids)
+    dias = [math.ceil(minutos_duracion_mspdi(d, minutos_por_dia) / minutos_por_dia - 1e-9) for d in duraciones]
+    importada = [not resumen[i] and not nulas[i] and dias[i] > 0 for i in range(n)]
+    posicion = {uid: i for i, uid in enumerate(uids)}
+
+    # Tareas de resumen que contienen a cada tarea y fin del rango de subtareas de cada resumen
+    padres: List[List[int]] = []
+    fin_rango = list(range(1, n + 1))
+    abiertos: List[int] = []
+    for i in range(n):
+        while abiertos and niveles[abiertos[-1]] >= niveles[i]:
+            fin_rango[abiertos.pop()] = i
+        padres.append(list(abiertos))
+        if resumen[i]:
+            abiertos.append(i)
+    for j in abiertos:
+        fin_rango[j] = n
+
+    def propias(i: int) -> List[int]:
+        """Predecesoras de la tarea y de sus tareas de resumen, como posiciones."""
+        return [posicion[uid] for k in [i] + padres[i] for uid in predecesoras[k] if uid in posicion]
+
+    def finales(s: int) -> List[int]:
+        """Subtareas de un resumen que no preceden a otra subtarea del mismo resumen."""
+        rango = range(s + 1, fin_rango[s])
+        precedidas = {posicion.get(uid) for k in rango for uid in predecesoras[k]}
+        return [k for k in rango if not resumen[k] and k not in precedidas]
+
+    def origen(i: int) -> Iterator[int]:
+        """Tareas de las que se toman las equivalentes de una tarea no importada."""
+        return iter(finales(i) if resumen[i] else propias(i))
+
+    # Sustituye las tareas no importadas por las importadas equivalentes. El
+    # recorrido usa una pila explícita: las cadenas de hitos o los esquemas muy
+    # profundos superarían el límite de recursión de Python
+    memoria: Dict[int, List[int]] = {}
+
+    def equivalentes(i: int) -> List[int]:
+        if importada[i]:
+            return [i]
+        if i in memoria:
+            return memoria[i]
+
+        # Cada entrada: tarea, origen pendiente y equivalentes acumuladas (en orden, sin repetir)
+        pila = [(i, origen(i), {})]
+        en_curso: Set[int] = {i}
+        while pila:
+            tarea, pendientes, acumuladas = pila[-1]
+            for j in pendientes:
+                if importada[j]:
+                    acumuladas.setdefault(j)
+                elif j in memoria:
+                    acumuladas.update(dict.fromkeys(memoria[j]))
+                elif j in en_curso:
+                    # Vínculo circular entre tareas omitidas: no aporta equivalentes
+                    # y la validación informa los ciclos que queden
+                    continue
+                else:
+                    en_curso.add(j)
+                    pila.append((j, origen(j), {}))
+                    break
+            else:
+                pila.pop()
+                en_curso.discard(tarea)
+                memoria[tarea] = list(acumuladas)
+                if pila:
+                    pila[-1][2].update(acumuladas)
+        return memoria[i]
+
+    # Nombres únicos y sin comas
+    usados: Set[str] = set()
+    nombre_final: Dict[int, str] = {}
+    for i in range(n):
+        if importada[i]:
+            nombre = ' '.join(nombres[i].replace(',', ';').split()) or f"Tarea {ids[i]}"
+            if nombre in usados:
+                nombre = f"{nombre} [{ids[i]}]"
+            usados.add(nombre)
+            nombre_final[i] = nombre
+
+    filas = [i for i in range(n) if importada[i]]
+    df = pd.DataFrame({
+        'Actividad': [nombre_final[i] for i in filas],
+        'Duración': pd.array([dias[i] for i in filas], dtype='int64'),
+        'Predecesoras': [', '.join(nombre_final[k] for k in dict.fromkeys(
+            k for j in propias(i) for k in equivalentes(j)) if k != i) for i in filas]
+    })
+    informe = {
+        'fecha_inicio': fecha_inicio,
+        'omitidas': n - len(filas),
+        'vinculos_aproximados': sum(aproximados[i] for i in filas)
+    }
+    return df, informe
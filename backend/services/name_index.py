@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice de nombres de actividades
+================================
+
+Resuelve referencias a actividades por nombre en tres pasos, construyendo el
+índice una sola vez por cronograma:
+
+1. Coincidencia exacta (sin espacios sobrantes)
+2. Coincidencia normalizada: sin mayúsculas, tildes ni espacios repetidos,
+   de modo que 'Excavacion', 'Excavación' y 'excavación ' son el mismo nombre
+3. Coincidencia aproximada por trigramas de caracteres (coeficiente de Dice)
+   mediante un índice invertido, pensada para nombres generados por Gemini
+
+Los dos primeros pasos son búsquedas en diccionarios; el tercero solo recorre
+las listas de los trigramas de la referencia y se construye bajo demanda.
+"""
+
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+# Similitud mínima (Dice sobre trigramas) para aceptar una coincidencia aproximada
+UMBRAL_APROXIMADO = 0.6
+
+# Los trigramas presentes en más nombres que esto no se usan para proponer
+# candidatos (sí para puntuarlos): acotan el costo de cada búsqueda aproximada
+# en cronogramas muy grandes
+LIMITE_LISTA_TRIGRAMA = 2000
+
+# Candidatos preseleccionados por trigramas poco frecuentes que se puntúan completos
+CANDIDATOS_A_PUNTUAR = 64
+
+EXACTA = 'exacta'
+NORMALIZADA = 'normalizada'
+APROXIMADA = 'aproximada'
+
+
+@lru_cache(maxsize=65536)
+def normalizar_nombre(nombre: str) -> str:
+    """
+    Normaliza un nombre: casefold, sin tildes ni diacríticos y con espacios simples.
+
+    Args:
+        nombre (str): Nombre original
+
+    Returns:
+        str: Nombre normalizado
+    """
+    descompuesto = unicodedata.normalize('NFKD', str(nombre).casefold())
+    sin_marcas = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return ' '.join(sin_marcas.split())
+
+
+def trigramas(texto: str) -> Set[str]:
+    """Trigramas de caracteres de un texto normalizado, con relleno en los bordes."""
+    relleno = f"  {texto} "
+    return {relleno[k:k + 3] for k in range(len(relleno) - 2)}
+
+
+class NameIndex:
+    """
+    Índice nombre -> id de actividad con búsqueda exacta, normalizada y aproximada.
+
+    Si un nombre se repite gana la primera aparición, en los tres niveles.
+    """
+
+    def __init__(self, nombres: Sequence[str]):
+        self.exacto: Dict[str, int] = {}
+        self.normalizado: Dict[str, int] = {}
+        for i, nombre in enumerate(nombres):
+            nombre = str(nombre).strip()
+            self.exacto.setdefault(nombre, i)
+            self.normalizado.setdefault(normalizar_nombre(nombre), i)
+
+        # Índice invertido de trigramas (se construye con la primera búsqueda aproximada)
+        self._invertido: Optional[Dict[str, List[int]]] = None
+        self._gramas: Dict[int, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.exacto)
+
+    def __contains__(self, nombre: str) -> bool:
+        return self.resolver(nombre) is not None
+
+    def _construir_invertido(self) -> None:
+        invertido: Dict[str, List[int]] = {}
+        for normalizado, i in self.normalizado.items():
+            gramas = trigramas(normalizado)
+            self._gramas[i] = gramas
+            for grama in gramas:
+                invertido.setdefault(grama, []).append(i)
+        self._invertido = invertido
+
+    def candidatos(self, nombre: str, limite: int = 3) -> List[Tuple[int, float]]:
+        """
+        Busca las actividades con nombre más parecido por trigramas.
+
+        Args:
+            nombre (str): Nombre buscado
+            limite (int): Número máximo de candidatos
+
+        Returns:
+            List[Tuple[int, float]]: Pares (id, similitud) de mayor a menor similitud
+        """
+        if self._invertido is None:
+            self._construir_invertido()
+
+        gramas = trigramas(normalizar_nombre(nombre))
+        comunes = Counter()
+        frecuentes = False
+        for grama in gramas:
+            lista = self._invertido.get(grama, ())
+            if len(lista) <= LIMITE_LISTA_TRIGRAMA:
+                comunes.update(lista)
+            else:
+                frecuentes = True
+        if not comunes and frecuentes:
+            # Solo trigramas muy frecuentes: se compara con todos los nombres
+            elegidos = list(self._gramas)
+        else:
+            elegidos = [i for i, _ in comunes.most_common(CANDIDATOS_A_PUNTUAR)]
+
+        puntajes = []
+        for i in elegidos:
+            otros = self._gramas[i]
+            compartidos = len(gramas & otros)
+            if compartidos:
+                puntajes.append((i, 2 * compartidos / (len(gramas) + len(otros))))
+        puntajes.sort(key=lambda p: (-p[1], p[0]))
+        return puntajes[:limite]
+
+    def resolver_con_tipo(self, nombre: str, aproximado: bool = True) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Resuelve un nombre indicando cómo se encontró.
+
+        Una coincidencia aproximada solo se acepta si supera UMBRAL_APROXIMADO y
+        no empata con otra actividad.
+
+        Args:
+            nombre (str): Nombre buscado
+            aproximado (bool): Permitir coincidencias por trigramas
+
+        Returns:
+            Tuple[Optional[int], Optional[str]]: Id (o None) y tipo de coincidencia
+        """
+        nombre = str(nombre).strip()
+        i = self.exacto.get(nombre)
+        if i is not None:
+            return i, EXACTA
+
+        i = self.normalizado.get(normalizar_nombre(nombre))
+        if i is not None:
+            return i, NORMALIZADA
+
+        if aproximado and nombre:
+            mejores = self.candidatos(nombre, 2)
+            if mejores and mejores[0][1] >= UMBRAL_APROXIMADO and (len(mejores) == 1 or mejores[1][1] < mejores[0][1]):
+                return mejores[0][0], APROXIMADA
+
+        return None, None
+
+    def resolver(self, nombre: str, aproximado: bool = False) -> Optional[int]:
+        """
+        Devuelve el id de la actividad con ese nombre, o None si no existe.
+
+        Args:
+            nombre (str): Nombre buscado
+            aproximado (bool): Permitir coincidencias por trigramas
+
+        Returns:
+            Optional[int]: Id de la actividad
+        """
+        return self.resolver_con_tipo(nombre, aproximado)[0]
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Caché de lecturas de entradas
+=============================
+
+Guarda el resultado de leer una entrada (archivo o descripción en texto)
+indexado por su contenido: la clave es un SHA-256 de los bytes del archivo o
+del texto normalizado, junto con la versión del analizador y las opciones que
+cambian el resultado (formato, hoja). Volver a enviar el mismo archivo o la
+misma descripción no repite la lectura ni la consulta a Gemini, aunque cambie
+el nombre del archivo.
+
+Las entradas recientes se guardan en memoria (LRU). Opcionalmente se copian en
+una base SQLite para conservarlas entre reinicios y compartirlas entre
+procesos; los valores se guardan con pickle, así que el archivo de caché debe
+ser de confianza.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Iterator, Optional, Union
+
+# Versión de los analizadores de entrada: cambiarla invalida todas las claves
+VERSION_ANALIZADOR = 1
+
+# Lecturas guardadas en memoria
+CAPACIDAD_CACHE = 32
+
+# Lecturas guardadas en disco; las menos usadas se borran al superarlo
+CAPACIDAD_DISCO = 1000
+
+# Bytes leídos por paso al calcular la huella de un archivo
+TAMANO_PASO = 1 << 20
+
+
+def normalizar_texto(texto: str) -> str:
+    """Texto sin espacios al final de cada línea, con saltos '\\n' y sin líneas vacías en los bordes."""
+    lineas = texto.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(linea.rstrip() for linea in lineas).strip('\n')
+
+
+def _huella(partes: tuple):
+    """SHA-256 iniciado con la versión del analizador y las opciones de la lectura."""
+    huella = hashlib.sha256(f"v{VERSION_ANALIZADOR}".encode())
+    for parte in partes:
+        huella.update(b'\x00' + repr(parte).encode())
+    huella.update(b'\x00\x00')
+    return huella
+
+
+def clave_archivo(archivo: Union[str, BinaryIO], *partes) -> str:
+    """
+    Clave de caché del contenido de un archivo.
+
+    Args:
+        archivo (str | BinaryIO): Ruta o archivo binario que permite `seek`
+            (se deja de nuevo al inicio)
+        *partes: Opciones de lectura que cambian el resultado
+
+    Returns:
+        str: SHA-256 en hexadecimal
+    """
+    huella = _huella(('archivo',) + partes)
+    if isinstance(archivo, str):
+        with open(archivo, 'rb') as f:
+            for bloque in iter(lambda: f.read(TAMANO_PASO), b''):
+                huella.update(bloque)
+    else:
+        archivo.seek(0)
+        for bloque in iter(lambda: archivo.read(TAMANO_PASO), b''):
+            huella.update(bloque)
+        archivo.seek(0)
+    return huella.hexdigest()
+
+
+def clave_texto(texto: str, *partes) -> str:
+    """
+    Clave de caché de una descripción en texto (ver `normalizar_texto`).
+
+    Args:
+        texto (str): Descripción del proyecto
+        *partes: Opciones de lectura que cambian el resultado
+
+    Returns:
+        str: SHA-256 en hexadecimal
+    """
+    huella = _huella(('texto',) + partes)
+    huella.update(normalizar_texto(texto).encode('utf-8'))
+    return huella.hexdigest()
+
+
+class ParseCache:
+    """
+    Caché LRU de lecturas indexada por contenido, con copia opcional en SQLite.
+
+    Es segura entre hilos. Los valores se guardan tal cual; quien los use debe
+    copiarlos antes de modificarlos.
+    """
+
+    def __init__(self, capacidad: int = CAPACIDAD_CACHE, ruta_disco: Optional[str] = None,
+                 capacidad_disco: int = CAPACIDAD_DISCO):
+        self.capacidad = capacidad
+        self.ruta_disco = ruta_disco
+        self.capacidad_disco = capacidad_disco
+        self.aciertos = 0
+        self.fallos = 0
+        self._memoria: 'OrderedDict[str, Any]' = OrderedDict()
+        self._candado = threading.Lock()
+        if ruta_disco:
+            directorio = os.path.dirname(os.path.abspath(ruta_disco))
+            os.makedirs(directorio, exist_ok=True)
+            with self._conectar() as conexion:
+                conexion.execute('CREATE TABLE IF NOT EXISTS lecturas '
+                                 '(clave TEXT PRIMARY KEY, valor BLOB NOT NULL, usado REAL NOT NULL)')
+
+    def __len__(self) -> int:
+        return len(self._memoria)
+
+    def __contains__(self, clave: str) -> bool:
+        return clave in self._memoria
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        # Una conexión por operación (sqlite3 no comparte conexiones entre hilos),
+        # confirmada al salir del bloque
+        conexion = sqlite3.connect(self.ruta_disco, timeout=30)
+        try:
+            with conexion:
+                yield conexion
+        finally:
+            conexion.close()
+
+    def _recordar(self, clave: str, valor: Any) -> None:
+        self._memoria[clave] = valor
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.capacidad:
+            self._memoria.popitem(last=False)
+
+    def obtener(self, clave: str) -> Optional[Any]:
+        """
+        Busca una lectura en memoria y, si no está, en disco.
+
+        Args:
+            clave (str): Clave de `clave_archivo` o `clave_texto`
+
+        Returns:
+            Optional[Any]: Valor guardado, o None si no está en la caché
+        """
+        with self._candado:
+            if clave in self._memoria:
+                self._memoria.move_to_end(clave)
+                self.aciertos += 1
+                return self._memoria[clave]
+
+        valor = None
+        if self.ruta_disco:
+            with self._conectar() as conexion:
+                fila = conexion.execute('SELECT valor FROM lecturas WHERE clave = ?', (clave,)).fetchone()
+                if fila is not None:
+                    conexion.execute('UPDATE lecturas SET usado = ? WHERE clave = ?', (time.time(), clave))
+                    valor = pickle.loads(fila[0])
+
+        with self._candado:
+            if valor is None:
+                self.fallos += 1
+            else:
+                self.aciertos += 1
+                self._recordar(clave, valor)
+        return valor
+
+    def guardar(self, clave: str, valor: Any) -> None:
+        """
+        Guarda una lectura en memoria y, si hay ruta de disco, en SQLite.
+
+        Args:
+            clave (str): Clave de `clave_archivo` o `clave_texto`
+            valor (Any): Resultado de la lectura (debe poder serializarse con pickle
+                si se usa disco)
+        """
+        with self._candado:
+            self._recordar(clave, valor)
+
+        if self.ruta_disco:
+            datos = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._conectar() as conexion:
+                conexion.execute('INSERT OR REPLACE INTO lecturas VALUES (?, ?, ?)', (clave, datos, time.time()))
+                conexion.execute('DELETE FROM lecturas WHERE clave IN (SELECT clave FROM lecturas '
+                                 'ORDER BY usado DESC LIMIT -1 OFFSET ?)', (self.capacidad_disco,))
+
+    def limpiar(self) -> None:
+        """Vacía la caché en memoria y en disco."""
+        with self._candado:
+            self._memoria.clear()
+        if self.ruta_disco:
+            with self._conectar() as conexion:
+                conexion.execute('DELETE FROM lecturas')
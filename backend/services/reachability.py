@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Alcanzabilidad entre actividades
+================================
+
+Cierre transitivo de la red guardado como bitsets empaquetados: la fila i es
+un arreglo de palabras uint64 con un bit por actividad, encendido si la
+actividad es sucesora (directa o indirecta) de i. Las filas se calculan nivel
+por nivel en orden topológico inverso con OR de las filas de las sucesoras,
+y consultar si dos actividades son independientes (ninguna alcanza a la otra)
+es O(1).
+
+El mismo cierre permite la reducción transitiva: la arista i -> j sobra si
+i alcanza a otra predecesora de j, porque esa dependencia ya está implícita.
+
+El cierre ocupa n²/8 bytes, por lo que solo se construye hasta LIMITE_CIERRE
+actividades.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .cpm import _rangos_csr, niveles_topologicos, plan_reduccion, reducir_filas
+from .schedule_graph import ScheduleGraph
+
+# Actividades máximas para construir el cierre (20000 -> 50 MB)
+LIMITE_CIERRE = 20000
+
+# Pares (arista, predecesora hermana) evaluados por bloque en la reducción transitiva
+PARES_POR_BLOQUE = 4_000_000
+
+# Bits encendidos de cada valor de un byte, para contar bits sin np.bitwise_count
+BITS_POR_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def contar_bits(palabras: np.ndarray) -> int:
+    """
+    Cuenta los bits encendidos de un arreglo de enteros sin signo.
+
+    Usa `np.bitwise_count` (NumPy >= 2.0) y, si no existe, una tabla por byte.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(palabras).sum())
+    return _contar_bits_por_byte(palabras)
+
+
+def _contar_bits_por_byte(palabras: np.ndarray) -> int:
+    return int(BITS_POR_BYTE[np.ascontiguousarray(palabras).view(np.uint8)].sum(dtype=np.int64))
+
+
+class ReachabilityIndex:
+    """
+    Cierre transitivo de un ScheduleGraph como matriz de bits (n x ceil(n/64) uint64).
+    """
+
+    def __init__(self, grafo: ScheduleGraph):
+        n = grafo.n
+        if n > LIMITE_CIERRE:
+            raise ValueError(f"La red tiene {n} actividades; el cierre transitivo admite hasta {LIMITE_CIERRE}")
+
+        self.n = n
+        self.palabras = (n + 63) // 64
+        descendientes = np.zeros((n, self.palabras), dtype=np.uint64)
+
+        # Sucesoras directas
+        origen = np.repeat(np.arange(n), np.diff(grafo.suc_ptr))
+        destino = grafo.suc_idx.astype(np.int64)
+        np.bitwise_or.at(descendientes, (origen, destino >> 6),
+                         np.left_shift(np.uint64(1), (destino & 63).astype(np.uint64)))
+
+        # Sucesoras indirectas: las de un nivel ya están completas al llegar al anterior
+        for nodos in reversed(niveles_topologicos(grafo)):
+            nodos = nodos[grafo.suc_ptr[nodos + 1] > grafo.suc_ptr[nodos]]
+            if nodos.size:
+                nodos, pasos = plan_reduccion(grafo.suc_ptr, grafo.suc_idx, nodos)
+                descendientes[nodos] |= reducir_filas(descendientes, pasos, np.bitwise_or)
+
+        self.descendientes = descendientes
+        self.suc_ptr = grafo.suc_ptr
+        self.suc_idx = grafo.suc_idx
+
+    def alcanza(self, i: int, j: int) -> bool:
+        """Indica si `j` depende (directa o indirectamente) de `i`."""
+        return bool((int(self.descendientes[i, j >> 6]) >> (j & 63)) & 1)
+
+    def independientes(self, i: int, j: int) -> bool:
+        """Indica si dos actividades pueden ejecutarse a la vez (ninguna alcanza a la otra)."""
+        return i != j and not self.alcanza(i, j) and not self.alcanza(j, i)
+
+    def alcanza_sin_arista(self, i: int, j: int) -> bool:
+        """
+        Indica si `j` sigue dependiendo de `i` aunque se quite la arista directa i -> j,
+        es decir, si alguna otra sucesora de `i` alcanza a `j`.
+        """
+        for s in self.suc_idx[self.suc_ptr[i]:self.suc_ptr[i + 1]].tolist():
+            if s != j and self.alcanza(s, j):
+                return True
+        return False
+
+    def _columna(self, j: int) -> np.ndarray:
+        """Máscara de las actividades que alcanzan a `j` (sus antecesoras)."""
+        return ((self.descendientes[:, j >> 6] >> np.uint64(j & 63)) & np.uint64(1)).astype(bool)
+
+    def _fila(self, i: int) -> np.ndarray:
+        """Máscara de las actividades alcanzables desde `i` (sus sucesoras)."""
+        bits = np.unpackbits(self.descendientes[i].view(np.uint8), bitorder='little')
+        return bits[:self.n].astype(bool)
+
+    def independientes_de(self, i: int) -> np.ndarray:
+        """Ids de las actividades que pueden ejecutarse a la vez que `i`."""
+        mascara = ~(self._fila(i) | self._columna(i))
+        mascara[i] = False
+        return np.flatnonzero(mascara)
+
+    def num_pares_independientes(self) -> int:
+        """Número de pares no ordenados de actividades independientes."""
+        comparables = contar_bits(self.descendientes)
+        return self.n * (self.n - 1) // 2 - comparables
+
+    def pares_independientes(self, limite: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Enumera los pares (i, j), i < j, de actividades independientes.
+
+        Args:
+            limite (int, opcional): Número máximo de pares a devolver
+
+        Returns:
+            List[Tuple[int, int]]: Pares de ids
+        """
+        pares = []
+        for i in range(self.n):
+            otras = self.independientes_de(i)
+            otras = otras[otras > i]
+            if limite is not None:
+                otras = otras[:limite - len(pares)]
+            pares.extend((i, int(j)) for j in otras.tolist())
+            if limite is not None and len(pares) >= limite:
+                break
+        return pares
+
+
+def obtener_alcance(grafo: ScheduleGraph) -> ReachabilityIndex:
+    """
+    Devuelve el cierre transitivo del grafo, construyéndolo solo la primera vez.
+
+    Args:
+        grafo (ScheduleGraph): Red de actividades
+
+    Returns:
+        ReachabilityIndex: Cierre guardado en `grafo.alcance`
+    """
+    if grafo.alcance is None:
+        grafo.alcance = ReachabilityIndex(grafo)
+    return grafo.alcance
+
+
+def aristas_redundantes(grafo: ScheduleGraph) -> np.ndarray:
+    """
+    Marca las dependencias implícitas en otras (reducción transitiva).
+
+    La arista i -> j es redundante si i alcanza a alguna otra predecesora de j.
+    Quitarlas no cambia fechas ni holguras: la restricción sigue cumpliéndose a
+    través del camino más largo.
+
+    Args:
+        grafo (ScheduleGraph): Red de actividades
+
+    Returns:
+        np.ndarray: Máscara booleana alineada con `grafo.pred_idx`
+    """
+    descendientes = obtener_alcance(grafo).descendientes
+    pred_ptr, pred_idx = grafo.pred_ptr, grafo.pred_idx
+    num_aristas = len(pred_idx)
+    redundantes = np.zeros(num_aristas, dtype=bool)
+    if not num_aristas:
+        return redundantes
+
+    # Cada arista se compara con todas las predecesoras de su destino
+    destino = np.repeat(np.arange(grafo.n), np.diff(pred_ptr))
+    pares = np.diff(pred_ptr)[destino]
+    cortes = np.searchsorted(np.cumsum(pares), np.arange(PARES_POR_BLOQUE, int(pares.sum()), PARES_POR_BLOQUE))
+    limites = [0] + np.unique(cortes).tolist() + [num_aristas]
+
+    for a, b in zip(limites[:-1], limites[1:]):
+        if a == b:
+            continue
+        posiciones, longitudes = _rangos_csr(pred_ptr, destino[a:b])
+        arista = np.repeat(np.arange(a, b), longitudes)
+        origen = pred_idx[arista].astype(np.int64)
+        hermana = pred_idx[posiciones].astype(np.int64)
+        # Una actividad nunca se alcanza a sí misma, así que hermana == origen da 0
+        bits = (descendientes[origen, hermana >> 6] >> (hermana & 63).astype(np.uint64)) & np.uint64(1)
+        redundantes[a:b] = np.bincount(arista - a, weights=bits, minlength=b - a) > 0
+
+    return redundantes
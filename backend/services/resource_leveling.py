@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Programación con recursos limitados
+===================================
+
+Esquema serial de generación de cronogramas (serial SGS): las actividades
+elegibles (todas sus predecesoras ya programadas) se toman de una cola de
+prioridad ordenada por inicio tardío del CPM y cada una se coloca en el
+primer instante en que sus predecesoras terminaron y todos sus recursos
+tienen capacidad durante toda su duración.
+
+El uso de cada recurso se guarda como un perfil por día en una matriz de
+NumPy (recursos x horizonte) que crece por duplicación. Buscar el primer
+hueco libre es una operación vectorizada sobre una ventana del perfil:
+ventanas ocupadas -> suma acumulada -> primera ventana de `duración` días
+sin conflictos.
+
+Las demandas son reales (p. ej. 0.1 + 0.2 de una capacidad de 0.3), así que
+las comparaciones con la capacidad admiten un error de redondeo relativo de
+TOLERANCIA_CAPACIDAD.
+"""
+
+import heapq
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .schedule_graph import ScheduleGraph
+
+# Prefijo de las columnas de demanda de recursos (Recurso_<nombre>)
+PREFIJO_RECURSO = 'Recurso_'
+
+# Error de redondeo admitido al comparar uso y capacidad, relativo a la capacidad
+# (con un mínimo absoluto para capacidades menores que 1)
+TOLERANCIA_CAPACIDAD = 1e-9
+
+
+def _tolerancia_capacidad(capacidades: np.ndarray) -> np.ndarray:
+    """Margen de redondeo de cada recurso según su capacidad."""
+    return TOLERANCIA_CAPACIDAD * np.maximum(np.abs(capacidades), 1.0)
+
+
+class PerfilRecursos:
+    """
+    Perfil de uso diario de varios recursos, respaldado por una matriz de NumPy.
+    """
+
+    def __init__(self, capacidades: np.ndarray, horizonte: int = 256):
+        self.capacidades = np.asarray(capacidades, dtype=np.float64)
+        self.tolerancia = _tolerancia_capacidad(self.capacidades)
+        self.uso = np.zeros((len(self.capacidades), max(horizonte, 1)), dtype=np.float64)
+
+    def _asegurar_horizonte(self, hasta: int) -> None:
+        """Duplica el horizonte hasta cubrir el día `hasta` (exclusivo)."""
+        actual = self.uso.shape[1]
+        if hasta <= actual:
+            return
+        nuevo = actual
+        while nuevo < hasta:
+            nuevo *= 2
+        uso = np.zeros((self.uso.shape[0], nuevo), dtype=self.uso.dtype)
+        uso[:, :actual] = self.uso
+        self.uso = uso
+
+    def primer_inicio(self, desde: int, duracion: int, recursos: np.ndarray, demanda: np.ndarray) -> int:
+        """
+        Busca el primer día >= `desde` en que la actividad cabe durante `duracion` días.
+
+        Args:
+            desde (int): Inicio más temprano por precedencias
+            duracion (int): Duración de la actividad
+            recursos (np.ndarray): Índices de los recursos que usa
+            demanda (np.ndarray): Cantidad de cada recurso que usa
+
+        Returns:
+            int: Día de inicio factible
+        """
+        if duracion <= 0 or recursos.size == 0:
+            return desde
+
+        limite = (self.capacidades[recursos] - demanda + self.tolerancia[recursos])[:, None]
+        ventana = max(4 * duracion, 64)
+        while True:
+            self._asegurar_horizonte(desde + ventana + duracion)
+            ocupado = (self.uso[recursos, desde:desde + ventana + duracion - 1] > limite).any(axis=0)
+            acumulado = np.concatenate(([0], np.cumsum(ocupado)))
+            libres = acumulado[duracion:duracion + ventana] == acumulado[:ventana]
+            k = int(np.argmax(libres))
+            if libres[k]:
+                return desde + k
+            desde += ventana
+            ventana *= 2
+
+    def reservar(self, inicio: int, duracion: int, recursos: np.ndarray, demanda: np.ndarray) -> None:
+        """Suma la demanda de la actividad al perfil en [inicio, inicio + duracion)."""
+        if duracion <= 0 or recursos.size == 0:
+            return
+        self._asegurar_horizonte(inicio + duracion)
+        self.uso[recursos, inicio:inicio + duracion] += demanda[:, None]
+
+
+def nivelar_recursos(grafo: ScheduleGraph, demandas: np.ndarray,
+                     capacidades: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Programa la red respetando precedencias y capacidades de recursos (serial SGS).
+
+    El grafo debe haber pasado por `calcular_cpm`: la prioridad de cada
+    actividad es su inicio tardío y las duraciones efectivas se toman del CPM.
+
+    Args:
+        grafo (ScheduleGraph): Red de actividades ya calculada
+        demandas (np.ndarray): Matriz (actividades x recursos) con la demanda diaria
+        capacidades (Sequence[float]): Capacidad diaria de cada recurso
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Inicio y fin de cada actividad en días hábiles
+
+    Raises:
+        ValueError: Si una actividad necesita más de lo que un recurso puede dar
+    """
+    n = grafo.n
+    capacidades = np.asarray(capacidades, dtype=np.float64)
+    demandas = np.asarray(demandas, dtype=np.float64).reshape(n, len(capacidades))
+
+    maximas = capacidades + _tolerancia_capacidad(capacidades)
+    excedidas = np.flatnonzero((demandas > maximas[None, :]).any(axis=1))
+    if excedidas.size:
+        nombres = ', '.join(grafo.nombres[i] for i in excedidas[:10].tolist())
+        raise ValueError(f"Actividades que superan la capacidad de algún recurso: {nombres}")
+
+    # Recursos usados por cada actividad, en formato disperso
+    filas, columnas = np.nonzero(demandas)
+    rec_ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(filas, minlength=n), out=rec_ptr[1:])
+    rec_demanda = demandas[filas, columnas]
+
+    duracion = (grafo.fin - grafo.inicio).astype(np.int64).tolist()
+    prioridad = grafo.inicio_tardio.tolist()
+    pendientes = np.diff(grafo.pred_ptr).tolist()
+    suc_ptr = grafo.suc_ptr.tolist()
+    suc_idx = grafo.suc_idx.tolist()
+
+    perfil = PerfilRecursos(capacidades, horizonte=int(grafo.duracion_total) + 1)
+    inicio = [0] * n
+    fin = [0] * n
+    listo = [0] * n  # fin más tardío de las predecesoras ya programadas
+
+    cola = [(prioridad[i], i) for i in range(n) if pendientes[i] == 0]
+    heapq.heapify(cola)
+    programadas = 0
+
+    while cola:
+        _, i = heapq.heappop(cola)
+        recursos = columnas[rec_ptr[i]:rec_ptr[i + 1]]
+        demanda = rec_demanda[rec_ptr[i]:rec_ptr[i + 1]]
+
+        t = perfil.primer_inicio(listo[i], duracion[i], recursos, demanda)
+        perfil.reservar(t, duracion[i], recursos, demanda)
+        inicio[i] = t
+        fin[i] = t + duracion[i]
+        programadas += 1
+
+        for k in range(suc_ptr[i], suc_ptr[i + 1]):
+            s = suc_idx[k]
+            if fin[i] > listo[s]:
+                listo[s] = fin[i]
+            pendientes[s] -= 1
+            if pendientes[s] == 0:
+                heapq.heappush(cola, (prioridad[s], s))
+
+    if programadas < n:
+        raise ValueError("Dependencias circulares: no se pudieron programar todas las actividades")
+
+    return np.asarray(inicio, dtype=np.int32), np.asarray(fin, dtype=np.int32)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulación de riesgo de Monte Carlo
+===================================
+
+Muestrea duraciones de tres puntos (optimista, más probable, pesimista) con
+distribución PERT o triangular y calcula la pasada hacia adelante y hacia
+atrás de todas las muestras a la vez sobre una matriz (actividades x muestras),
+nivel por nivel. De cada lote se guarda solo la duración del proyecto por
+muestra y cuántas veces cada actividad quedó en la ruta crítica, de modo que
+la memoria depende del tamaño del lote y no del número de muestras.
+
+Los lotes tienen semillas derivadas de una sola `SeedSequence`: el resultado
+es el mismo con o sin pool de procesos.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+
+from .cpm import niveles_topologicos, plan_reduccion, reducir_filas
+from .schedule_graph import ScheduleGraph
+
+# Factores por defecto cuando no hay estimaciones optimista/pesimista
+FACTOR_OPTIMISTA = 0.8
+FACTOR_PESIMISTA = 1.5
+
+# Celdas (muestras x actividades) por lote, para acotar la memoria
+CELDAS_POR_LOTE = 2_000_000
+
+# Muestras a partir de las cuales compensa repartir los lotes en procesos
+UMBRAL_PROCESOS = 20000
+
+DISTRIBUCIONES = ('pert', 'triangular')
+
+# Resolución de la tabla de cuantiles de la beta usada para muestrear PERT
+PUNTOS_CUANTIL = 1024
+
+
+def muestrear_duraciones(rng: np.random.Generator, optimista: np.ndarray, probable: np.ndarray,
+                         pesimista: np.ndarray, muestras: int, distribucion: str = 'pert') -> np.ndarray:
+    """
+    Genera una matriz (actividades x muestras) de duraciones de tres puntos.
+
+    Se muestrea por transformada inversa a partir de uniformes: la triangular
+    tiene cuantil cerrado y la PERT usa una tabla de cuantiles de la beta por
+    cada forma distinta (con los factores por defecto todas comparten una).
+
+    Args:
+        rng (np.random.Generator): Generador de números aleatorios
+        optimista (np.ndarray): Duración optimista de cada actividad
+        probable (np.ndarray): Duración más probable
+        pesimista (np.ndarray): Duración pesimista
+        muestras (int): Número de muestras
+        distribucion (str): 'pert' (beta) o 'triangular'
+
+    Returns:
+        np.ndarray: Duraciones muestreadas (float64)
+    """
+    duraciones = np.repeat(probable.astype(np.float64)[:, None], muestras, axis=1)
+    variables = np.flatnonzero(pesimista > optimista)
+    if not variables.size:
+        return duraciones
+
+    a = optimista[variables, None]
+    m = probable[variables, None]
+    b = pesimista[variables, None]
+    u = rng.random((variables.size, muestras))
+
+    if distribucion == 'pert':
+        formas = np.round(np.hstack([1 + 4 * (m - a) / (b - a), 1 + 4 * (b - m) / (b - a)]), 6)
+        unicas, grupo = np.unique(formas, axis=0, return_inverse=True)
+        plana = np.concatenate([_cuantiles_beta(float(alfa), float(beta)) for alfa, beta in unicas])
+        u *= PUNTOS_CUANTIL
+        k = u.astype(np.intp)
+        np.minimum(k, PUNTOS_CUANTIL - 1, out=k)
+        u -= k  # fracción entre los dos cuantiles vecinos
+        k += (grupo.reshape(-1) * (PUNTOS_CUANTIL + 1))[:, None]
+        izquierda = plana[k]
+        x = plana[k + 1]
+        x -= izquierda
+        x *= u
+        x += izquierda
+    else:
+        corte = (m - a) / (b - a)
+        x = np.where(u < corte, np.sqrt(u * corte), 1 - np.sqrt((1 - u) * (1 - corte)))
+    x *= b - a
+    x += a
+    duraciones[variables] = x
+    return duraciones
+
+
+@lru_cache(maxsize=256)
+def _cuantiles_beta(alfa: float, beta: float) -> np.ndarray:
+    """Cuantiles de la beta(alfa, beta) en PUNTOS_CUANTIL + 1 probabilidades equiespaciadas."""
+    x = np.linspace(0.0, 1.0, 16 * PUNTOS_CUANTIL + 1)
+    densidad = x ** (alfa - 1) * (1 - x) ** (beta - 1)
+    acumulada = np.concatenate(([0.0], np.cumsum(densidad[1:] + densidad[:-1])))
+    acumulada /= acumulada[-1]
+    return np.interp(np.linspace(0.0, 1.0, PUNTOS_CUANTIL + 1), acumulada, x)
+
+
+def _simular_lote(red: dict, semilla: np.random.SeedSequence, muestras: int):
+    """
+    Simula un lote de muestras. Las matrices son (actividades x muestras) para
+    que reunir las filas de las predecesoras lea memoria contigua.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Duración del proyecto por muestra y número de
+        muestras en que cada actividad fue crítica
+    """
+    rng = np.random.default_rng(semilla)
+    duracion = muestrear_duraciones(rng, red['optimista'], red['probable'], red['pesimista'],
+                                    muestras, red['distribucion'])
+    n = duracion.shape[0]
+
+    # Pasada hacia adelante por niveles
+    fin = duracion.copy()
+    for nodos, pasos in red['adelante']:
+        fin[nodos] += reducir_filas(fin, pasos, np.maximum)
+    fin_proyecto = fin.max(axis=0) if n else np.zeros(muestras)
+
+    # Pasada hacia atrás: las actividades sin sucesoras terminan al final del proyecto
+    inicio_tardio = np.empty_like(duracion)
+    holgura = np.empty_like(duracion)
+    for sin_sucesoras, (nodos, pasos) in red['atras']:
+        inicio_tardio[sin_sucesoras] = fin_proyecto - duracion[sin_sucesoras]
+        holgura[sin_sucesoras] = fin_proyecto - fin[sin_sucesoras]
+        if nodos.size:
+            fin_tardio = reducir_filas(inicio_tardio, pasos, np.minimum)
+            holgura[nodos] = fin_tardio - fin[nodos]
+            fin_tardio -= duracion[nodos]
+            inicio_tardio[nodos] = fin_tardio
+
+    holgura -= 1e-9 * (1 + fin_proyecto)
+    criticas = (holgura <= 0).sum(axis=1)
+    return fin_proyecto, criticas
+
+
+# Red del proceso trabajador: se envía una sola vez al crear el pool
+_RED_PROCESO: Optional[dict] = None
+
+
+def _iniciar_proceso(red: dict) -> None:
+    global _RED_PROCESO
+    _RED_PROCESO = red
+
+
+def _simular_lote_en_proceso(semilla: np.random.SeedSequence, muestras: int):
+    return _simular_lote(_RED_PROCESO, semilla, muestras)
+
+
+def simular_riesgo(grafo: ScheduleGraph, muestras: int = 5000,
+                   optimista: Optional[np.ndarray] = None, pesimista: Optional[np.ndarray] = None,
+                   distribucion: str = 'pert', semilla: Optional[int] = None,
+                   procesos: Optional[int] = None) -> Dict:
+    """
+    Simula la duración del proyecto con duraciones inciertas.
+
+    Las duraciones del grafo se usan como valor más probable. Si no se dan
+    estimaciones optimista/pesimista se usan FACTOR_OPTIMISTA y FACTOR_PESIMISTA.
+    Todas las duraciones se interpretan en días hábiles del calendario del proyecto.
+
+    Args:
+        grafo (ScheduleGraph): Red de actividades
+        muestras (int): Número de muestras
+        optimista (np.ndarray, opcional): Duración optimista de cada actividad
+        pesimista (np.ndarray, opcional): Duración pesimista de cada actividad
+        distribucion (str): 'pert' o 'triangular'
+        semilla (int, opcional): Semilla para resultados reproducibles
+        procesos (int, opcional): Procesos para repartir los lotes; solo se usan
+            si hay al menos UMBRAL_PROCESOS muestras
+
+    Returns:
+        Dict: Percentiles P50/P80/P90, media y desviación de la duración del
+        proyecto, probabilidad de cumplir la duración determinista e índice de
+        criticidad (fracción de muestras en la ruta crítica) de cada actividad
+
+    Raises:
+        ValueError: Si los parámetros no son válidos o la red tiene ciclos
+    """
+    if distribucion not in DISTRIBUCIONES:
+        raise ValueError(f"Distribución no soportada: {distribucion}")
+    if muestras < 1:
+        raise ValueError("El número de muestras debe ser positivo")
+
+    probable = grafo.duracion.astype(np.float64)
+    optimista = probable * FACTOR_OPTIMISTA if optimista is None else np.asarray(optimista, dtype=np.float64)
+    pesimista = probable * FACTOR_PESIMISTA if pesimista is None else np.asarray(pesimista, dtype=np.float64)
+    optimista = np.where(np.isnan(optimista), probable * FACTOR_OPTIMISTA, optimista)
+    pesimista = np.where(np.isnan(pesimista), probable * FACTOR_PESIMISTA, pesimista)
+    if (optimista > probable).any() or (pesimista < probable).any() or (optimista < 0).any():
+        raise ValueError("Se requiere 0 <= optimista <= duración <= pesimista en todas las actividades")
+
+    red = {
+        'optimista': optimista, 'probable': probable, 'pesimista': pesimista,
+        'distribucion': distribucion,
+    }
+    niveles = niveles_topologicos(grafo)
+    red['adelante'] = [plan_reduccion(grafo.pred_ptr, grafo.pred_idx, nodos) for nodos in niveles[1:]]
+    red['atras'] = []
+    for nodos in reversed(niveles):
+        tiene = grafo.suc_ptr[nodos + 1] > grafo.suc_ptr[nodos]
+        red['atras'].append((nodos[~tiene], plan_reduccion(grafo.suc_ptr, grafo.suc_idx, nodos[tiene])))
+
+    por_lote = max(1, CELDAS_POR_LOTE // max(grafo.n, 1))
+    tamanos = [min(por_lote, muestras - k) for k in range(0, muestras, por_lote)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+
+    if procesos and procesos > 1 and muestras >= UMBRAL_PROCESOS and len(tamanos) > 1:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso, initargs=(red,)) as pool:
+            resultados = list(pool.map(_simular_lote_en_proceso, semillas, tamanos))
+    else:
+        resultados = [_simular_lote(red, s, t) for s, t in zip(semillas, tamanos)]
+
+    duraciones = np.concatenate([r[0] for r in resultados])
+    criticas = np.sum([r[1] for r in resultados], axis=0)
+
+    p50, p80, p90 = np.percentile(duraciones, [50, 80, 90])
+    determinista = float(grafo.duracion_total) if grafo.rango is not None else None
+    return {
+        'muestras': muestras,
+        'distribucion': distribucion,
+        'p50': float(p50),
+        'p80': float(p80),
+        'p90': float(p90),
+        'media': float(duraciones.mean()),
+        'desviacion': float(duraciones.std()),
+        'determinista': determinista,
+        'prob_cumplir': float((duraciones <= determinista + 1e-9).mean()) if determinista is not None else None,
+        'indice_criticidad': criticas / muestras,
+    }
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Grafo compacto del cronograma
+=============================
+
+Representación interna de la red de actividades basada en arreglos de NumPy.
+Los nombres de las actividades se traducen una sola vez a identificadores
+enteros (int32) y las dependencias se guardan como listas de adyacencia CSR
+(predecesoras y sucesoras), de modo que los motores de cálculo y los
+endpoints no vuelvan a separar el texto de la columna Predecesoras.
+"""
+
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .name_index import APROXIMADA, NameIndex
+
+
+def separar_predecesoras(valor) -> List[str]:
+    """
+    Convierte el texto de la columna Predecesoras en una lista de nombres.
+
+    Args:
+        valor: Valor de la celda (texto separado por comas, vacío o NaN)
+
+    Returns:
+        List[str]: Nombres de las predecesoras, sin espacios sobrantes
+    """
+    texto = str(valor).strip()
+    if not texto or texto.lower() == 'nan':
+        return []
+    return [p.strip() for p in texto.split(',') if p.strip()]
+
+
+def construir_csr(listas: List[List[int]]):
+    """
+    Empaqueta una lista de listas de enteros en formato CSR.
+
+    Args:
+        listas (List[List[int]]): Vecinos de cada nodo
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Punteros (n+1) e índices concatenados
+    """
+    conteos = np.fromiter((len(l) for l in listas), dtype=np.int64, count=len(listas))
+    ptr = np.zeros(len(listas) + 1, dtype=np.int64)
+    np.cumsum(conteos, out=ptr[1:])
+    idx = np.fromiter((j for l in listas for j in l), dtype=np.int32, count=int(ptr[-1]))
+    return ptr, idx
+
+
+def transponer_csr(ptr: np.ndarray, idx: np.ndarray, n: int):
+    """
+    Calcula la adyacencia inversa (sucesoras a partir de predecesoras o viceversa).
+
+    Args:
+        ptr (np.ndarray): Punteros CSR de la adyacencia original
+        idx (np.ndarray): Índices CSR de la adyacencia original
+        n (int): Número de nodos
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Punteros e índices de la adyacencia transpuesta
+    """
+    destino = np.repeat(np.arange(n, dtype=np.int32), np.diff(ptr))
+    orden = np.argsort(idx, kind='stable')
+    ptr_t = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(idx, minlength=n), out=ptr_t[1:])
+    return ptr_t, destino[orden]
+
+
+class ScheduleGraph:
+    """
+    Red de actividades con identificadores enteros y adyacencia CSR.
+
+    Atributos principales:
+    - nombres: nombre de cada actividad (el id es su posición)
+    - duracion: duración en días (int32)
+    - pred_ptr / pred_idx: predecesoras en formato CSR
+    - suc_ptr / suc_idx: sucesoras en formato CSR
+    - inicio, fin, inicio_tardio, fin_tardio: fechas en días desde el inicio
+      del proyecto, calculadas por el motor CPM
+    """
+
+    def __init__(self, nombres: Sequence[str], duracion: Sequence[int],
+                 pred_ptr: np.ndarray, pred_idx: np.ndarray, indice: Optional[NameIndex] = None):
+        self.nombres = [str(nombre) for nombre in nombres]
+        self.duracion = np.asarray(duracion, dtype=np.int32)
+        self.pred_ptr = np.asarray(pred_ptr, dtype=np.int64)
+        self.pred_idx = np.asarray(pred_idx, dtype=np.int32)
+        self.suc_ptr, self.suc_idx = transponer_csr(self.pred_ptr, self.pred_idx, self.n)
+
+        # Índice nombre -> id (si un nombre se repite gana la primera aparición),
+        # construido con la primera búsqueda por nombre si no se recibe
+        self._indice = indice
+
+        # Resultados del cálculo CPM
+        self.inicio = np.zeros(self.n, dtype=np.int32)
+        self.fin = np.zeros(self.n, dtype=np.int32)
+        self.inicio_tardio = np.zeros(self.n, dtype=np.int32)
+        self.fin_tardio = np.zeros(self.n, dtype=np.int32)
+        self.holgura_libre = np.zeros(self.n, dtype=np.int32)
+        self.orden: Optional[np.ndarray] = None   # orden topológico
+        self.rango: Optional[np.ndarray] = None   # posición de cada id en `orden`
+
+        # Actividades con calendario propio: máscara y función que calcula su fin
+        # a partir de (ids, inicio). Si es None la duración se suma directamente.
+        self.calendario_propio: Optional[np.ndarray] = None
+        self.ajuste_fin: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None
+
+        # Cierre transitivo (ReachabilityIndex), calculado bajo demanda
+        self.alcance = None
+
+        # Referencias descartadas al construir la red: (id, nombre) de predecesoras
+        # que no existen e ids de actividades que se nombran a sí mismas
+        self.referencias_inexistentes: List[tuple] = []
+        self.autorreferencias: List[int] = []
+
+        # Referencias resueltas por similitud: (id, nombre escrito, id resuelto)
+        self.referencias_aproximadas: List[tuple] = []
+
+    @classmethod
+    def desde_listas(cls, nombres: Sequence, duraciones: Sequence[int],
+                     predecesoras: Sequence) -> 'ScheduleGraph':
+        """
+        Construye el grafo a partir de columnas con predecesoras por nombre.
+
+        Los nombres se resuelven con un NameIndex: primero exactos, después sin
+        mayúsculas ni tildes y, por último, por similitud de trigramas (anotados
+        en `referencias_aproximadas`). Las referencias a actividades inexistentes
+        y las autorreferencias se descartan, pero quedan anotadas en
+        `referencias_inexistentes` y `autorreferencias` para el informe de validación.
+
+        Args:
+            nombres (Sequence): Nombre de cada actividad
+            duraciones (Sequence[int]): Duración de cada actividad en días
+            predecesoras (Sequence): Texto de predecesoras de cada actividad
+
+        Returns:
+            ScheduleGraph: Grafo construido
+        """
+        nombres = [str(nombre) for nombre in nombres]
+        indice = NameIndex(nombres)
+        resueltos = {}  # cada nombre distinto se resuelve una sola vez
+
+        listas = []
+        inexistentes = []
+        autorreferencias = []
+        aproximadas = []
+        for i, valor in enumerate(predecesoras):
+            ids = {}
+            for nombre in separar_predecesoras(valor):
+                if nombre not in resueltos:
+                    resueltos[nombre] = indice.resolver_con_tipo(nombre)
+                j, tipo = resueltos[nombre]
+                if j is None:
+                    inexistentes.append((i, nombre))
+                elif j == i:
+                    autorreferencias.append(i)
+                else:
+                    ids.setdefault(j)
+                    if tipo == APROXIMADA:
+                        aproximadas.append((i, nombre, j))
+            listas.append(list(ids))
+
+        pred_ptr, pred_idx = construir_csr(listas)
+        grafo = cls(nombres, duraciones, pred_ptr, pred_idx, indice)
+        grafo.referencias_inexistentes = inexistentes
+        grafo.autorreferencias = autorreferencias
+        grafo.referencias_aproximadas = aproximadas
+        return grafo
+
+    @classmethod
+    def desde_dataframe(cls, df: pd.DataFrame) -> 'ScheduleGraph':
+        """
+        Construye el grafo a partir de un DataFrame [Actividad, Duración, Predecesoras].
+
+        Args:
+            df (pd.DataFrame): DataFrame de actividades
+
+        Returns:
+            ScheduleGraph: Grafo construido
+        """
+        predecesoras = df['Predecesoras'].tolist() if 'Predecesoras' in df.columns else [''] * len(df)
+        return cls.desde_listas(
+            df['Actividad'].tolist(),
+            df['Duración'].astype(int).tolist(),
+            predecesoras
+        )
+
+    @property
+    def n(self) -> int:
+        """Número de actividades."""
+        return len(self.nombres)
+
+    @property
+    def indice(self) -> NameIndex:
+        """Índice de nombres de las actividades."""
+        if self._indice is None:
+            self._indice = NameIndex(self.nombres)
+        return self._indice
+
+    @property
+    def num_aristas(self) -> int:
+        """Número de dependencias."""
+        return len(self.pred_idx)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def id_de(self, nombre: str, aproximado: bool = False) -> Optional[int]:
+        """
+        Devuelve el id de una actividad por nombre, o None si no existe.
+        Ignora mayúsculas, tildes y espacios; `aproximado` acepta también nombres parecidos.
+        """
+        return self.indice.resolver(nombre, aproximado)
+
+    def predecesoras(self, i: int) -> np.ndarray:
+        """Ids de las predecesoras de la actividad `i`."""
+        return self.pred_idx[self.pred_ptr[i]:self.pred_ptr[i + 1]]
+
+    def sucesoras(self, i: int) -> np.ndarray:
+        """Ids de las sucesoras de la actividad `i`."""
+        return self.suc_idx[self.suc_ptr[i]:self.suc_ptr[i + 1]]
+
+    def reemplazar_predecesoras(self, i: int, nuevas: Sequence[int]) -> None:
+        """
+        Sustituye las predecesoras de una actividad actualizando ambas adyacencias CSR.
+
+        Solo se desplazan los tramos afectados; no se reconstruye el grafo.
+
+        Args:
+            i (int): Id de la actividad
+            nuevas (Sequence[int]): Ids de sus nuevas predecesoras
+        """
+        anteriores = self.predecesoras(i).tolist()
+        nuevas = list(dict.fromkeys(int(p) for p in nuevas))
+        self.alcance = None
+
+        a, b = int(self.pred_ptr[i]), int(self.pred_ptr[i + 1])
+        self.pred_idx = np.concatenate([self.pred_idx[:a], np.asarray(nuevas, dtype=np.int32), self.pred_idx[b:]])
+        self.pred_ptr[i + 1:] += len(nuevas) - (b - a)
+
+        for p in set(anteriores) - set(nuevas):
+            inicio = int(self.suc_ptr[p])
+            pos = inicio + int(np.flatnonzero(self.sucesoras(p) == i)[0])
+            self.suc_idx = np.delete(self.suc_idx, pos)
+            self.suc_ptr[p + 1:] -= 1
+        for p in set(nuevas) - set(anteriores):
+            self.suc_idx = np.insert(self.suc_idx, int(self.suc_ptr[p + 1]), np.int32(i))
+            self.suc_ptr[p + 1:] += 1
+
+    def asegurar_escritura(self) -> None:
+        """
+        Copia los arreglos de solo lectura antes de modificarlos en el lugar.
+
+        Los grafos cargados de un snapshot usan vistas sobre el archivo mapeado
+        en memoria, compartidas entre procesos; solo se copian al editarlos.
+        """
+        for atributo in ('duracion', 'pred_ptr', 'pred_idx', 'inicio', 'fin', 'inicio_tardio',
+                         'fin_tardio', 'holgura_libre', 'orden', 'rango'):
+            valores = getattr(self, atributo)
+            if valores is not None and not valores.flags.writeable:
+                setattr(self, atributo, valores.copy())
+
+    def corresponde_a(self, df: pd.DataFrame) -> bool:
+        """Indica si el grafo fue construido para las actividades de `df`."""
+        return len(df) == self.n and df['Actividad'].astype(str).tolist() == self.nombres
+
+    @property
+    def holgura_total(self) -> np.ndarray:
+        """Holgura total de cada actividad en días."""
+        return self.inicio_tardio - self.inicio
+
+    @property
+    def critica(self) -> np.ndarray:
+        """Máscara de actividades en la ruta crítica."""
+        return self.holgura_total == 0
+
+    @property
+    def duracion_total(self) -> int:
+        """Duración total del proyecto en días."""
+        return int(self.fin.max()) if self.n else 0
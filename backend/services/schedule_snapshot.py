@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snapshots de cronogramas
+========================
+
+Guarda un cronograma ya calculado en un archivo Arrow IPC con columnas
+tipadas, para volver a cargarlo sin leer la entrada ni programar de nuevo:
+
+- Actividades: id, duración, inicio, fin y holguras como int32, ruta crítica
+  como bool y fechas absolutas como date32 (datetime64 al cargar)
+- Dependencias: columna de listas `predecesoras_ids` (int32), que en Arrow es
+  exactamente la adyacencia CSR del grafo (desplazamientos + ids)
+- Estado del CPM (`cpm_*`): inicio y fin tempranos y tardíos sin nivelar y
+  posición en el orden topológico, para editar actividades sin recalcular
+- Metadatos: fecha de inicio y calendario del proyecto, orden de columnas
+
+Se usa Arrow IPC sin compresión y no Parquet porque así el archivo se puede
+mapear en memoria: al abrirlo, las columnas numéricas del DataFrame apuntan
+directamente a las páginas del archivo (de solo lectura) y nada se decodifica.
+
+Las columnas de texto solo se comparten así con pandas >= 3, cuyo tipo de
+texto por omisión está respaldado por Arrow. Con pandas 1.5 o 2.x (admitidos
+por requirements.txt) `cronograma()` convierte el texto en objetos Python: el
+resultado es el mismo, pero cada proceso tiene su propia copia de los nombres
+y predecesoras, y abrir un snapshot es O(N) en esas columnas.
+
+Requiere pyarrow; si no está instalado, guardar y abrir lanzan ImportError.
+"""
+
+import json
+import os
+from datetime import date
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from .schedule_graph import ScheduleGraph
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    PYARROW_DISPONIBLE = True
+except ImportError:
+    PYARROW_DISPONIBLE = False
+
+# Versión del formato del archivo
+VERSION_SNAPSHOT = 1
+
+# Clave de los metadatos del cronograma en el esquema Arrow
+CLAVE_METADATOS = b'cronograma'
+
+# Columnas del cronograma guardadas como int32
+COLUMNAS_ENTERAS = ('Duración', 'Inicio', 'Fin', 'Holgura_Total', 'Holgura_Libre')
+
+# Columnas del estado del CPM (arreglo del grafo -> columna)
+COLUMNAS_CPM = {
+    'inicio': 'cpm_inicio',
+    'fin': 'cpm_fin',
+    'inicio_tardio': 'cpm_inicio_tardio',
+    'fin_tardio': 'cpm_fin_tardio',
+    'rango': 'cpm_rango'
+}
+
+
+def _requerir_pyarrow() -> None:
+    if not PYARROW_DISPONIBLE:
+        raise ImportError("Los snapshots de cronogramas requieren pyarrow (pip install pyarrow)")
+
+
+def _columna_arrow(serie: pd.Series) -> 'pa.Array':
+    """Columna adicional con el tipo que infiere Arrow, o como texto si mezcla tipos."""
+    try:
+        columna = pa.array(serie, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        columna = pa.array(serie.astype(str).where(serie.notna()), from_pandas=True)
+    # El texto se guarda como large_string, el tipo de las columnas de texto de
+    # pandas, para cargarlo sin convertirlo
+    return columna.cast(pa.large_string()) if pa.types.is_string(columna.type) else columna
+
+
+def guardar_snapshot(ruta: str, df: pd.DataFrame, grafo: ScheduleGraph, fecha_inicio: date,
+                     fechas: Tuple[np.ndarray, np.ndarray], weekmask: str, feriados) -> None:
+    """
+    Escribe un cronograma calculado en un archivo Arrow IPC.
+
+    El archivo se escribe aparte y se reemplaza al final, de modo que los
+    procesos que tengan mapeada una versión anterior la siguen leyendo intacta.
+
+    Args:
+        ruta (str): Archivo de destino (habitualmente .arrow)
+        df (pd.DataFrame): Cronograma de `generar_cronograma`
+        grafo (ScheduleGraph): Grafo calculado por el CPM para `df`
+        fecha_inicio (date): Fecha de inicio del proyecto
+        fechas (Tuple[np.ndarray, np.ndarray]): Fechas absolutas de inicio y fin
+            (datetime64) de cada actividad
+        weekmask (str): Máscara semanal del calendario del proyecto
+        feriados: Feriados del calendario del proyecto (datetime64)
+
+    Raises:
+        ImportError: Si pyarrow no está instalado
+        ValueError: Si el grafo no tiene CPM calculado o no corresponde a `df`
+    """
+    _requerir_pyarrow()
+    if grafo.rango is None or not grafo.corresponde_a(df):
+        raise ValueError("El grafo no corresponde al cronograma o no tiene el CPM calculado")
+
+    columnas = {'id': pa.array(np.arange(grafo.n, dtype=np.int32))}
+    for col in df.columns:
+        if col in COLUMNAS_ENTERAS:
+            columnas[col] = pa.array(df[col].to_numpy(dtype=np.int32))
+        elif col == 'Critica':
+            columnas[col] = pa.array(df[col].to_numpy(dtype=bool))
+        elif col in ('Actividad', 'Predecesoras'):
+            columnas[col] = pa.array(df[col].fillna('').astype(str).tolist(), pa.large_string())
+        else:
+            columnas[col] = _columna_arrow(df[col])
+    columnas['Fecha_Inicio'] = pa.array(np.asarray(fechas[0], dtype='datetime64[D]'), pa.date32())
+    columnas['Fecha_Fin'] = pa.array(np.asarray(fechas[1], dtype='datetime64[D]'), pa.date32())
+    columnas['predecesoras_ids'] = pa.LargeListArray.from_arrays(
+        pa.array(grafo.pred_ptr, pa.int64()), pa.array(grafo.pred_idx, pa.int32()))
+    for atributo, col in COLUMNAS_CPM.items():
+        columnas[col] = pa.array(np.asarray(getattr(grafo, atributo), dtype=np.int32))
+
+    metadatos = {
+        'version': VERSION_SNAPSHOT,
+        'fecha_inicio': fecha_inicio.isoformat(),
+        'weekmask': weekmask,
+        'feriados': [str(f) for f in np.asarray(feriados, dtype='datetime64[D]')],
+        'columnas': [str(c) for c in df.columns]
+    }
+    tabla = pa.table(columnas).replace_schema_metadata({CLAVE_METADATOS: json.dumps(metadatos)})
+
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        with pa.OSFile(temporal, 'wb') as archivo, pa.ipc.new_file(archivo, tabla.schema) as escritor:
+            escritor.write_table(tabla)
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+class ScheduleSnapshot:
+    """
+    Snapshot de cronograma escrito por `guardar_snapshot`, mapeado en memoria.
+
+    Las columnas numéricas y de texto del cronograma y los arreglos del grafo
+    son vistas de solo lectura sobre el archivo, que los procesos que lo abren
+    comparten; `actualizar_actividad` copia los del grafo antes de modificarlos.
+    El grafo solo se arma al pedirlo, porque los nombres de sus actividades sí
+    ocupan memoria propia de cada proceso.
+
+    Atributos:
+    - ruta: archivo del snapshot
+    - metadatos: 'fecha_inicio' (date), 'weekmask', 'feriados' y 'columnas'
+    """
+
+    def __init__(self, ruta: str):
+        """
+        Abre un snapshot.
+
+        Args:
+            ruta (str): Archivo del snapshot
+
+        Raises:
+            ImportError: Si pyarrow no está instalado
+            ValueError: Si el archivo no es un snapshot de cronograma o su versión no es compatible
+        """
+        _requerir_pyarrow()
+        self.ruta = ruta
+        self.tabla = pa.ipc.open_file(pa.memory_map(ruta, 'r')).read_all()
+        metadatos = (self.tabla.schema.metadata or {}).get(CLAVE_METADATOS)
+        if metadatos is None:
+            raise ValueError(f"{ruta} no es un snapshot de cronograma")
+        self.metadatos = json.loads(metadatos)
+        if self.metadatos.get('version') != VERSION_SNAPSHOT:
+            raise ValueError(f"Versión de snapshot no compatible: {self.metadatos.get('version')}")
+        self.metadatos['fecha_inicio'] = date.fromisoformat(self.metadatos['fecha_inicio'])
+
+    def __len__(self) -> int:
+        return self.tabla.num_rows
+
+    def _enteros(self, columna: str) -> np.ndarray:
+        return self.tabla.column(columna).to_numpy()
+
+    def cronograma(self, fechas: bool = True) -> pd.DataFrame:
+        """
+        Cronograma guardado, con sus columnas originales.
+
+        Args:
+            fechas (bool): Agregar Fecha_Inicio y Fecha_Fin (datetime64)
+
+        Returns:
+            pd.DataFrame: Cronograma de solo lectura
+        """
+        columnas = self.metadatos['columnas'] + (['Fecha_Inicio', 'Fecha_Fin'] if fechas else [])
+        return self.tabla.select(columnas).to_pandas(split_blocks=True, date_as_object=False)
+
+    def grafo(self) -> ScheduleGraph:
+        """
+        Grafo del cronograma con el estado del CPM, listo para editar actividades.
+
+        Returns:
+            ScheduleGraph: Grafo nuevo en cada llamada
+        """
+        aristas = self.tabla.column('predecesoras_ids').combine_chunks()
+        grafo = ScheduleGraph(self.tabla.column('Actividad').to_pylist(), self._enteros('Duración'),
+                              aristas.offsets.to_numpy(), aristas.values.to_numpy())
+        for atributo, col in COLUMNAS_CPM.items():
+            setattr(grafo, atributo, self._enteros(col))
+        grafo.holgura_libre = self._enteros('Holgura_Libre')
+        grafo.orden = np.argsort(grafo.rango).astype(np.int32)
+        return grafo
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Almacén compartido de cronogramas
+=================================
+
+Directorio de snapshots de solo lectura (ver `services.schedule_snapshot`),
+un archivo por versión de cada proyecto:
+
+    <directorio>/<proyecto>.v000001.arrow
+    <directorio>/<proyecto>.v000002.arrow
+
+Una versión publicada no se modifica nunca: cada cambio del cronograma se
+publica como versión nueva. Así, varios procesos (los workers de gunicorn)
+pueden mapear en memoria el mismo archivo y compartir sus páginas a través
+de la caché del sistema operativo, en lugar de tener cada uno su propia copia
+del cronograma, y un proceso que todavía use una versión anterior la sigue
+leyendo intacta.
+
+El número de versión se reserva creando el archivo final con un enlace duro,
+que falla si otro proceso ya publicó esa versión. Las versiones antiguas se
+borran al publicar; en POSIX los procesos que las tengan mapeadas las siguen
+leyendo hasta soltarlas.
+
+Costo de escritura: cada publicación escribe el snapshot completo, así que
+cada cambio (también un PATCH de una sola actividad) cuesta O(N) de E/S en el
+cronograma, además de que los demás procesos vuelven a abrir la versión nueva.
+El almacén está pensado para cronogramas que se editan a ritmo humano; para
+cambios masivos conviene aplicarlos todos y publicar una sola vez.
+"""
+
+import os
+import re
+import threading
+from typing import Callable, List, Optional
+
+# Versiones de cada proyecto que se conservan en el directorio
+VERSIONES_CONSERVADAS = 3
+
+# Nombres de proyecto admitidos (también evitan salir del directorio)
+PATRON_PROYECTO = re.compile(r'[\w-]+')
+
+# Archivo de una versión: <proyecto>.v<versión>.arrow
+PATRON_ARCHIVO = re.compile(r'(?P<proyecto>[\w-]+)\.v(?P<version>\d+)\.arrow')
+
+
+class ScheduleStore:
+    """
+    Snapshots de cronogramas versionados en un directorio compartido entre procesos.
+
+    El almacén solo gestiona los archivos; quien publica recibe la ruta donde
+    escribir el snapshot y quien lee abre la ruta de la versión que necesita.
+    """
+
+    def __init__(self, directorio: str, versiones_conservadas: int = VERSIONES_CONSERVADAS):
+        self.directorio = os.path.abspath(directorio)
+        self.versiones_conservadas = max(1, versiones_conservadas)
+        os.makedirs(self.directorio, exist_ok=True)
+
+    @staticmethod
+    def _validar_proyecto(proyecto: str) -> None:
+        if not PATRON_PROYECTO.fullmatch(proyecto):
+            raise ValueError(f"Nombre de proyecto no válido: {proyecto}")
+
+    def ruta(self, proyecto: str, version: int) -> str:
+        """
+        Ruta del archivo de una versión de un proyecto.
+
+        Raises:
+            ValueError: Si el nombre del proyecto tiene caracteres no admitidos
+        """
+        self._validar_proyecto(proyecto)
+        return os.path.join(self.directorio, f"{proyecto}.v{version:06d}.arrow")
+
+    def versiones(self, proyecto: str) -> List[int]:
+        """Versiones publicadas de un proyecto, de la más antigua a la más reciente."""
+        versiones = []
+        with os.scandir(self.directorio) as entradas:
+            for entrada in entradas:
+                coincidencia = PATRON_ARCHIVO.fullmatch(entrada.name)
+                if coincidencia and coincidencia['proyecto'] == proyecto:
+                    versiones.append(int(coincidencia['version']))
+        return sorted(versiones)
+
+    def version_actual(self, proyecto: str) -> Optional[int]:
+        """Última versión publicada de un proyecto, o None si no tiene ninguna."""
+        versiones = self.versiones(proyecto)
+        return versiones[-1] if versiones else None
+
+    def publicar(self, proyecto: str, escribir: Callable[[str], None]) -> int:
+        """
+        Publica una nueva versión de un proyecto.
+
+        Args:
+            proyecto (str): Nombre del proyecto (letras, dígitos, '_' y '-')
+            escribir (Callable[[str], None]): Función que escribe el snapshot en la
+                ruta recibida (p. ej. `AIBuilderScheduler.guardar_cronograma`)
+
+        Returns:
+            int: Número de la versión publicada
+
+        Raises:
+            ValueError: Si el nombre del proyecto tiene caracteres no admitidos
+        """
+        self._validar_proyecto(proyecto)
+        temporal = os.path.join(self.directorio, f".{proyecto}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            escribir(temporal)
+            version = (self.version_actual(proyecto) or 0) + 1
+            while True:
+                try:
+                    os.link(temporal, self.ruta(proyecto, version))
+                    break
+                except FileExistsError:
+                    # Otro proceso publicó esa versión al mismo tiempo
+                    version += 1
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+        self._purgar(proyecto, version)
+        return version
+
+    def _purgar(self, proyecto: str, version: int) -> None:
+        for anterior in self.versiones(proyecto):
+            if anterior <= version - self.versiones_conservadas:
+                try:
+                    os.remove(self.ruta(proyecto, anterior))
+                except OSError:
+                    # Ya borrada por otro proceso, o mapeada en un sistema que no
+                    # permite borrarla (Windows): se reintenta en la próxima publicación
+                    pass
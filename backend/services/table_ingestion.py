@@ -0,0 +1,647 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ingesta de tablas de actividades
+================================
+
+Normaliza tablas de actividades (CSV o Excel) al formato estándar
+[Actividad, Duración, Predecesoras, ...]: mapeo de nombres de columnas,
+conversión numérica y descarte de filas sin duración válida.
+
+Los CSV y las hojas .xlsx se leen por bloques: cada bloque se normaliza por
+separado y sus columnas numéricas se copian en arreglos tipados que crecen
+por duplicación (las de texto se guardan ya filtradas y se concatenan una sola
+vez al final). Así la memoria pico es el resultado más un bloque, sin
+importar el tamaño del archivo, y solo se conservan las columnas que se usan.
+Los libros de Excel se abren en modo de solo lectura y solo se recorre la
+hoja elegida, fila a fila.
+
+Todas las lecturas aceptan una ruta o un archivo binario en memoria (p. ej. el
+flujo de un archivo subido); en ese caso el formato se detecta por la firma de
+los primeros bytes y no hace falta guardar nada en disco.
+
+Antes de leer un CSV se examinan solo sus primeros KB para decidir la
+codificación, el separador y el encabezado; con eso se elige el lector y el
+archivo se recorre una sola vez.
+
+Las duraciones ('12,5 días') y fechas en español ('13 julio 2026 8:00 a. m.')
+del formato Nombre/Duracion/Comienzo/Fin se convierten por columnas, con
+patrones compilados una sola vez y el mes traducido con un mapeo vectorizado.
+Como en estas exportaciones los valores se repiten mucho, solo se parsea cada
+texto distinto una vez.
+"""
+
+import codecs
+import csv
+import io
+import os
+import re
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, TextIO, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from .resource_leveling import PREFIJO_RECURSO
+
+# Nombres de columna aceptados (ya en minúsculas) -> nombre estándar
+MAPEO_COLUMNAS = {
+    'actividad': 'Actividad',
+    'tarea': 'Actividad',
+    'task': 'Actividad',
+    'nombre': 'Actividad',
+    'duracion': 'Duración',
+    'duration': 'Duración',
+    'dias': 'Duración',
+    'predecesoras': 'Predecesoras',
+    'predecessors': 'Predecesoras',
+    'dependencias': 'Predecesoras',
+    'calendario': 'Calendario',
+    'calendar': 'Calendario',
+    'optimista': 'Optimista',
+    'optimistic': 'Optimista',
+    'pesimista': 'Pesimista',
+    'pessimistic': 'Pesimista'
+}
+
+# Columnas de demanda de recursos en el archivo: recurso_<nombre>
+PREFIJO_COLUMNA_RECURSO = 'recurso_'
+
+COLUMNAS_REQUERIDAS = ('Actividad', 'Duración')
+COLUMNAS_TEXTO = ('Actividad', 'Predecesoras', 'Calendario')
+COLUMNAS_OPCIONALES = ('Calendario', 'Optimista', 'Pesimista')
+
+# Opciones de lectura de los CSV exportados
+OPCIONES_CSV = dict(encoding='utf-8', sep=',', quotechar='"', skipinitialspace=True, doublequote=True)
+
+# Firmas de los formatos binarios: .xlsx es un ZIP y .xls un documento OLE2
+FIRMA_XLSX = b'PK\x03\x04'
+FIRMA_XLS = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+# Bytes del inicio de un archivo en memoria que se examinan para detectar su formato
+BYTES_FIRMA = 64
+
+# Bytes del inicio de un CSV que se examinan para elegir cómo leerlo
+BYTES_MUESTRA = 64 * 1024
+
+# Separadores alternativos a la coma (p. ej. ';' en exportaciones de Excel en español)
+SEPARADORES_ALTERNATIVOS = (';', '\t', '|')
+
+# Ruta de un archivo o archivo binario ya abierto
+Origen = Union[str, BinaryIO]
+
+# Filas por bloque al leer un CSV
+FILAS_POR_BLOQUE = 100_000
+
+# Duraciones como '5 días' o '12,5 dias'
+PATRON_DURACION_DIAS = re.compile(r'(\d+(?:[.,]\d+)?)\s*d[ií]as?', re.IGNORECASE)
+
+# Fechas como '13 julio 2026 8:00 a. m.'
+PATRON_FECHA_ESPANOL = re.compile(r'(\d{1,2})\s+(\w+)\s+(\d{4})\s+(\d{1,2}):(\d{2})\s+(a\.|p\.)\s+m\.')
+
+MESES = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
+    'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
+    'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
+}
+
+
+class InputError(ValueError):
+    """
+    Entrada legible pero no válida (hoja inexistente, columnas requeridas que
+    faltan, XML que no es un proyecto). A diferencia de un archivo ilegible, se
+    informa al usuario en lugar de reemplazarla por el proyecto de ejemplo.
+    """
+
+
+def posicion_hoja(hoja: Optional[Union[str, int]], nombres: Sequence[str]) -> int:
+    """
+    Posición de una hoja de Excel elegida por nombre o posición.
+
+    Args:
+        hoja (str | int, opcional): Nombre o posición de la hoja (por defecto la primera)
+        nombres (Sequence[str]): Nombres de las hojas del libro
+
+    Returns:
+        int: Posición de la hoja
+
+    Raises:
+        InputError: Si la hoja no existe (el mensaje lista las disponibles)
+    """
+    if hoja is None:
+        return 0
+    if isinstance(hoja, int):
+        if not -len(nombres) <= hoja < len(nombres):
+            raise InputError(f"El archivo no tiene la hoja {hoja}; hojas disponibles: {', '.join(nombres)}")
+        return hoja % len(nombres)
+    if hoja not in nombres:
+        raise InputError(f"Hoja '{hoja}' no encontrada; hojas disponibles: {', '.join(nombres)}")
+    return list(nombres).index(hoja)
+
+def normalizar_encabezado(columnas: Sequence) -> List[str]:
+    """Nombres de columna sin espacios sobrantes y en minúsculas."""
+    return [str(c).strip().lower() for c in columnas]
+
+
+def columnas_destino(columnas: Sequence[str]) -> Dict[str, str]:
+    """
+    Decide qué columnas del archivo se usan y con qué nombre estándar.
+
+    Args:
+        columnas (Sequence[str]): Encabezado ya normalizado
+
+    Returns:
+        Dict[str, str]: Columna del archivo -> columna estándar (si varias columnas
+        corresponden al mismo nombre estándar gana la primera)
+
+    Raises:
+        InputError: Si falta alguna columna requerida
+    """
+    destino = {}
+    usados = set()
+    for columna in columnas:
+        if columna in MAPEO_COLUMNAS:
+            nombre = MAPEO_COLUMNAS[columna]
+        elif columna.startswith(PREFIJO_COLUMNA_RECURSO) and len(columna) > len(PREFIJO_COLUMNA_RECURSO):
+            nombre = PREFIJO_RECURSO + columna[len(PREFIJO_COLUMNA_RECURSO):]
+        else:
+            continue
+        if nombre not in usados:
+            destino[columna] = nombre
+            usados.add(nombre)
+
+    for col in COLUMNAS_REQUERIDAS:
+        if col not in usados:
+            raise InputError(f"Columna '{col}' no encontrada en el archivo")
+    return destino
+
+
+def normalizar_tabla(df: pd.DataFrame, destino: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Lleva una tabla (o un bloque de ella) al formato estándar.
+
+    Args:
+        df (pd.DataFrame): Tabla con el encabezado ya normalizado
+        destino (Dict[str, str], opcional): Resultado de `columnas_destino`
+
+    Returns:
+        pd.DataFrame: Columnas Actividad, Duración, Predecesoras, las opcionales
+        presentes y las Recurso_<nombre>, solo con filas de duración positiva
+
+    Raises:
+        InputError: Si falta alguna columna requerida
+    """
+    if destino is None:
+        destino = columnas_destino(df.columns)
+    df = df[list(destino)].rename(columns=destino)
+
+    if 'Predecesoras' not in df.columns:
+        df['Predecesoras'] = ''
+    df['Predecesoras'] = df['Predecesoras'].fillna('').astype(str)
+    df['Duración'] = pd.to_numeric(df['Duración'], errors='coerce')
+
+    recursos = [c for c in df.columns if c.startswith(PREFIJO_RECURSO)]
+    for col in recursos:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    for col in ('Optimista', 'Pesimista'):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    columnas = ['Actividad', 'Duración', 'Predecesoras']
+    columnas += [c for c in COLUMNAS_OPCIONALES if c in df.columns]
+    columnas += recursos
+    return df.loc[df['Duración'] > 0, columnas]
+
+
+class ColumnBuffer:
+    """
+    Arreglo tipado que crece por duplicación para acumular una columna por bloques.
+
+    Si un bloque llega con un tipo más amplio (p. ej. float tras bloques int) el
+    arreglo se promueve, de modo que el tipo final es el de leer todo de una vez.
+    """
+
+    def __init__(self, dtype=np.float64, capacidad: int = 1024):
+        self.datos = np.empty(max(capacidad, 1), dtype=dtype)
+        self.n = 0
+
+    def agregar(self, valores: np.ndarray) -> None:
+        """Copia `valores` al final del arreglo, duplicando la capacidad si hace falta."""
+        fin = self.n + len(valores)
+        dtype = np.result_type(self.datos.dtype, valores.dtype)
+        if fin > len(self.datos) or dtype != self.datos.dtype:
+            capacidad = len(self.datos)
+            while capacidad < fin:
+                capacidad *= 2
+            datos = np.empty(capacidad, dtype=dtype)
+            datos[:self.n] = self.datos[:self.n]
+            self.datos = datos
+        self.datos[self.n:fin] = valores
+        self.n = fin
+
+    def valores(self) -> np.ndarray:
+        """Arreglo con los valores acumulados, sin la capacidad sobrante."""
+        return self.datos[:self.n].copy()
+
+
+def abrir_en_memoria(datos: Union[bytes, bytearray, BinaryIO]) -> BinaryIO:
+    """
+    Prepara un archivo recibido en memoria para leerlo.
+
+    Los bytes se envuelven en un BytesIO y los flujos que no permiten volver al
+    inicio (como una conexión) se leen completos una vez; los demás se usan tal cual.
+
+    Args:
+        datos (bytes | BinaryIO): Contenido del archivo o archivo binario abierto
+
+    Returns:
+        BinaryIO: Archivo binario que permite `seek`
+    """
+    if isinstance(datos, (bytes, bytearray)):
+        return io.BytesIO(datos)
+    if not (hasattr(datos, 'seekable') and datos.seekable()):
+        return io.BytesIO(datos.read())
+    return datos
+
+
+def rebobinar(origen: Origen) -> Origen:
+    """Vuelve al inicio un archivo en memoria (las rutas se devuelven sin cambios)."""
+    if not isinstance(origen, str):
+        origen.seek(0)
+    return origen
+
+
+def detectar_formato(archivo: BinaryIO) -> str:
+    """
+    Detecta el formato de un archivo en memoria por la firma de sus primeros bytes.
+
+    Args:
+        archivo (BinaryIO): Archivo binario que permite `seek`
+
+    Returns:
+        str: 'xlsx', 'xls', 'xml' (texto que empieza con '<') o 'csv' (cualquier
+        otro texto)
+    """
+    firma = rebobinar(archivo).read(BYTES_FIRMA)
+    rebobinar(archivo)
+    if firma.startswith(FIRMA_XLSX):
+        return 'xlsx'
+    if firma.startswith(FIRMA_XLS):
+        return 'xls'
+    texto = firma[len(codecs.BOM_UTF8):] if firma.startswith(codecs.BOM_UTF8) else firma
+    if texto.lstrip().startswith(b'<'):
+        return 'xml'
+    return 'csv'
+
+
+def formato_archivo(origen: Origen) -> str:
+    """Formato de un archivo: por la extensión si es una ruta y por su firma si está en memoria."""
+    if isinstance(origen, str):
+        return os.path.splitext(origen)[1].lower().lstrip('.')
+    return detectar_formato(origen)
+
+
+def _detectar_codificacion(muestra: bytes) -> str:
+    """UTF-8 (con o sin BOM) si la muestra lo es; si no, cp1252 o, en último caso, latin-1."""
+    if muestra.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    for codificacion in ('utf-8', 'cp1252'):
+        try:
+            # Decodificador incremental: la muestra puede cortar un carácter al final
+            codecs.getincrementaldecoder(codificacion)().decode(muestra, final=False)
+            return codificacion
+        except UnicodeDecodeError:
+            pass
+    return 'latin-1'
+
+
+def olfatear_csv(ruta: Origen) -> Dict:
+    """
+    Examina el inicio de un CSV sin parsearlo completo.
+
+    Solo se leen BYTES_MUESTRA bytes: con ellos se decide la codificación, el
+    separador (la coma salvo que el encabezado no tenga ninguna y sí otro de
+    SEPARADORES_ALTERNATIVOS) y el encabezado, omitiendo líneas vacías iniciales.
+
+    Args:
+        ruta (str | BinaryIO): Ruta del archivo CSV o archivo en memoria
+
+    Returns:
+        Dict: 'opciones' (OPCIONES_CSV con la codificación y el separador detectados,
+        para pandas) y 'encabezado' (nombres de columna normalizados)
+    """
+    if isinstance(ruta, str):
+        with open(ruta, 'rb') as f:
+            muestra = f.read(BYTES_MUESTRA)
+    else:
+        muestra = rebobinar(ruta).read(BYTES_MUESTRA)
+        rebobinar(ruta)
+
+    codificacion = _detectar_codificacion(muestra)
+    texto = codecs.getincrementaldecoder(codificacion)(errors='replace').decode(muestra, final=False)
+    primera = next((linea for linea in texto.splitlines() if linea.strip()), '')
+    separador = ','
+    if ',' not in primera:
+        separador = max(SEPARADORES_ALTERNATIVOS, key=primera.count)
+        if not primera.count(separador):
+            separador = ','
+
+    opciones = dict(OPCIONES_CSV, encoding=codificacion, sep=separador)
+    lector = csv.reader(io.StringIO(texto), **_dialecto(opciones))
+    encabezado = next((fila for fila in lector if any(campo.strip() for campo in fila)), [])
+    return {'opciones': opciones, 'encabezado': normalizar_encabezado(encabezado)}
+
+
+def _dialecto(opciones: Dict) -> Dict:
+    """Opciones de lectura de pandas traducidas al módulo csv."""
+    return dict(delimiter=opciones['sep'], quotechar=opciones['quotechar'],
+                skipinitialspace=opciones['skipinitialspace'], doublequote=opciones['doublequote'])
+
+
+@contextmanager
+def _abrir_texto(ruta: Origen, codificacion: str) -> Iterator[TextIO]:
+    """Abre una ruta o un archivo en memoria como texto, sin cerrar el archivo en memoria al salir."""
+    if isinstance(ruta, str):
+        with open(ruta, encoding=codificacion, newline='') as texto:
+            yield texto
+    else:
+        texto = io.TextIOWrapper(rebobinar(ruta), encoding=codificacion, newline='')
+        try:
+            yield texto
+        finally:
+            texto.detach()
+
+
+def leer_primera_columna_csv(ruta: Origen, opciones: Optional[Dict] = None) -> List[str]:
+    """
+    Lee el primer campo de cada fila de datos de un CSV con el módulo csv.
+
+    Sirve para los formatos que guardan la fila completa entre comillas en la
+    primera columna: se obtiene el texto sin construir un DataFrame.
+
+    Args:
+        ruta (str | BinaryIO): Ruta del archivo CSV o archivo en memoria
+        opciones (Dict, opcional): Opciones de `olfatear_csv`; por defecto OPCIONES_CSV
+
+    Returns:
+        List[str]: Primer campo de cada fila no vacía después del encabezado
+    """
+    opciones = opciones or OPCIONES_CSV
+    with _abrir_texto(ruta, opciones['encoding']) as texto:
+        lector = csv.reader(texto, **_dialecto(opciones))
+        for fila in lector:
+            if any(campo.strip() for campo in fila):
+                break
+        return [fila[0] for fila in lector if fila and fila[0]]
+
+
+def _columnas_a_leer(originales: Sequence) -> Tuple[Dict[str, str], Dict, List[int]]:
+    """
+    Columnas del archivo que se usan.
+
+    Returns:
+        Tuple[Dict[str, str], Dict, List[int]]: Resultado de `columnas_destino`,
+        nombre original -> nombre normalizado de las columnas a leer (la primera si
+        se repiten) y sus posiciones
+    """
+    encabezado = normalizar_encabezado(originales)
+    destino = columnas_destino(encabezado)
+    nombres = {}
+    posiciones = []
+    for k, (original, columna) in enumerate(zip(originales, encabezado)):
+        if columna in destino and columna not in nombres.values():
+            nombres[original] = columna
+            posiciones.append(k)
+    return destino, nombres, posiciones
+
+
+def _acumular_bloques(bloques: Iterable[pd.DataFrame], destino: Dict[str, str],
+                      filas_por_bloque: int = FILAS_POR_BLOQUE) -> pd.DataFrame:
+    """
+    Normaliza cada bloque y acumula sus columnas: las numéricas en ColumnBuffer y
+    las de texto como series ya filtradas que se concatenan una vez al final.
+
+    Args:
+        bloques (Iterable[pd.DataFrame]): Bloques con el encabezado ya normalizado
+        destino (Dict[str, str]): Resultado de `columnas_destino`
+        filas_por_bloque (int): Capacidad inicial de los arreglos
+
+    Returns:
+        pd.DataFrame: Tabla en formato estándar (ver `normalizar_tabla`)
+    """
+    numericas: Dict[str, ColumnBuffer] = {}
+    textos: Dict[str, List[pd.Series]] = {}
+    columnas = None
+    for bloque in bloques:
+        bloque = normalizar_tabla(bloque, destino)
+        if columnas is None:
+            columnas = list(bloque.columns)
+            for col in columnas:
+                if col in COLUMNAS_TEXTO:
+                    textos[col] = []
+                else:
+                    numericas[col] = ColumnBuffer(bloque[col].dtype, filas_por_bloque)
+        for col in columnas:
+            if col in textos:
+                textos[col].append(bloque[col])
+            else:
+                numericas[col].agregar(bloque[col].to_numpy())
+
+    if columnas is None:
+        return normalizar_tabla(pd.DataFrame(columns=list(destino)), destino)
+
+    datos = {}
+    for col in columnas:
+        if col in textos:
+            datos[col] = pd.concat(textos[col], ignore_index=True) if textos[col] else pd.Series([], dtype=str)
+        else:
+            datos[col] = numericas[col].valores()
+    return pd.DataFrame(datos)
+
+
+def leer_csv_por_bloques(ruta: Origen, filas_por_bloque: int = FILAS_POR_BLOQUE,
+                         opciones: Optional[Dict] = None) -> pd.DataFrame:
+    """
+    Lee un CSV de actividades por bloques con memoria acotada.
+
+    Solo se parsean las columnas reconocidas; las de texto se leen como texto
+    para que todos los bloques tengan el mismo tipo.
+
+    Args:
+        ruta (str | BinaryIO): Ruta del archivo CSV o archivo en memoria
+        filas_por_bloque (int): Filas leídas en cada bloque
+        opciones (Dict, opcional): Opciones de `olfatear_csv`; por defecto OPCIONES_CSV
+
+    Returns:
+        pd.DataFrame: Tabla en formato estándar (ver `normalizar_tabla`)
+
+    Raises:
+        InputError: Si falta alguna columna requerida
+    """
+    opciones = opciones or OPCIONES_CSV
+    destino, nombres, _ = _columnas_a_leer(list(pd.read_csv(rebobinar(ruta), nrows=0, **opciones).columns))
+    usadas = list(nombres)
+    texto = {o: str for o in usadas if destino[nombres[o]] in COLUMNAS_TEXTO}
+
+    bloques = pd.read_csv(rebobinar(ruta), usecols=usadas, dtype=texto, chunksize=filas_por_bloque, **opciones)
+    return _acumular_bloques((bloque.rename(columns=nombres) for bloque in bloques), destino, filas_por_bloque)
+
+
+def filas_hoja_excel(ruta: Origen, hoja: Optional[Union[str, int]] = None) -> Iterator[tuple]:
+    """
+    Recorre las filas de una hoja de Excel sin cargar el libro completo.
+
+    El libro se abre en modo de solo lectura de openpyxl, que lee la hoja como
+    un flujo; las demás hojas no se procesan. Las filas vacías del inicio se
+    omiten, de modo que la primera fila entregada es el encabezado.
+
+    Args:
+        ruta (str | BinaryIO): Ruta del archivo .xlsx o archivo en memoria
+        hoja (str | int, opcional): Nombre o posición de la hoja (por defecto la primera)
+
+    Yields:
+        tuple: Valores de cada fila
+
+    Raises:
+        InputError: Si la hoja no existe
+    """
+    libro = load_workbook(rebobinar(ruta), read_only=True, data_only=True, keep_links=False)
+    try:
+        hoja_excel = libro.worksheets[posicion_hoja(hoja, libro.sheetnames)]
+
+        filas = hoja_excel.iter_rows(values_only=True)
+        for fila in filas:
+            if any(valor is not None for valor in fila):
+                yield fila
+                break
+        yield from filas
+    finally:
+        libro.close()
+
+
+def leer_encabezado_excel(ruta: Origen, hoja: Optional[Union[str, int]] = None) -> List[str]:
+    """Lee solo el encabezado de una hoja de Excel y lo devuelve normalizado."""
+    filas = filas_hoja_excel(ruta, hoja)
+    try:
+        return normalizar_encabezado(next(filas, ()))
+    finally:
+        filas.close()
+
+
+def leer_excel_por_bloques(ruta: Origen, hoja: Optional[Union[str, int]] = None,
+                           filas_por_bloque: int = FILAS_POR_BLOQUE) -> pd.DataFrame:
+    """
+    Lee una hoja de Excel de actividades por bloques con memoria acotada.
+
+    Las filas se toman del flujo de `filas_hoja_excel` y de cada una solo se
+    conservan las columnas reconocidas; las de texto se convierten a texto igual
+    que en `leer_csv_por_bloques`.
+
+    Args:
+        ruta (str | BinaryIO): Ruta del archivo .xlsx o archivo en memoria
+        hoja (str | int, opcional): Nombre o posición de la hoja (por defecto la primera)
+        filas_por_bloque (int): Filas acumuladas en cada bloque
+
+    Returns:
+        pd.DataFrame: Tabla en formato estándar (ver `normalizar_tabla`)
+
+    Raises:
+        InputError: Si la hoja no existe o falta alguna columna requerida
+    """
+    filas = filas_hoja_excel(ruta, hoja)
+    try:
+        destino, nombres, posiciones = _columnas_a_leer(next(filas, ()))
+        columnas = list(nombres.values())
+        texto = [c for c in columnas if destino[c] in COLUMNAS_TEXTO]
+        ultima = max(posiciones) + 1
+
+        def bloques():
+            lote = []
+            for fila in filas:
+                # Las filas pueden venir más cortas que el encabezado
+                if len(fila) < ultima:
+                    fila = fila + (None,) * (ultima - len(fila))
+                lote.append([fila[k] for k in posiciones])
+                if len(lote) >= filas_por_bloque:
+                    yield _bloque_excel(lote, columnas, texto)
+                    lote = []
+            if lote:
+                yield _bloque_excel(lote, columnas, texto)
+
+        return _acumular_bloques(bloques(), destino, filas_por_bloque)
+    finally:
+        filas.close()
+
+
+def _bloque_excel(lote: List[list], columnas: List[str], texto: List[str]) -> pd.DataFrame:
+    """DataFrame de un bloque de filas de Excel con las columnas de texto como texto."""
+    bloque = pd.DataFrame(lote, columns=columnas)
+    for col in texto:
+        bloque[col] = bloque[col].astype(str).where(bloque[col].notna())
+    return bloque
+
+
+def extraer_duraciones_dias(valores: Sequence) -> np.ndarray:
+    """
+    Extrae las duraciones en días de una columna de texto como '12,5 días'.
+
+    Solo se aceptan los valores que contienen 'día' (con tilde, sin importar
+    mayúsculas); la coma decimal se admite igual que el punto.
+
+    Args:
+        valores (Sequence): Textos de duración
+
+    Returns:
+        np.ndarray: Duraciones (float64), NaN donde no hay duración válida
+    """
+    codigos, unicos = _factorizar(valores)
+    serie = pd.Series(unicos, dtype=str)
+    numero = serie.str.extract(PATRON_DURACION_DIAS, expand=False).str.replace(',', '.', regex=False)
+    numero = numero.where(serie.str.lower().str.contains('día', regex=False))
+    duraciones = pd.to_numeric(numero).to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.append(duraciones, np.nan)[codigos]
+
+
+def parsear_fechas_espanol(valores: Sequence) -> np.ndarray:
+    """
+    Convierte una columna de fechas 'DD mes YYYY H:MM a./p. m.' a datetime64.
+
+    Args:
+        valores (Sequence): Textos de fecha
+
+    Returns:
+        np.ndarray: Fechas (datetime64[m]); NaT si el texto no tiene el formato,
+        el mes no existe o la fecha u hora no son válidas (p. ej. 31 de febrero)
+    """
+    codigos, unicos = _factorizar(valores)
+    partes = pd.Series(unicos, dtype=str).str.extract(PATRON_FECHA_ESPANOL)
+    mes = partes[1].str.lower().map(MESES).to_numpy(dtype=np.float64, na_value=np.nan)
+    numeros = partes[[0, 2, 3, 4]].apply(pd.to_numeric).to_numpy(dtype=np.float64, na_value=np.nan)
+    dia, anio, hora, minuto = numeros.T
+
+    # 12 a. m. es medianoche y 12 p. m. mediodía
+    tarde = (partes[5] == 'p.').to_numpy(dtype=bool, na_value=False)
+    hora = np.where(tarde & (hora != 12), hora + 12, np.where(~tarde & (hora == 12), 0, hora))
+
+    validas = ~np.isnan(mes) & ~np.isnan(numeros).any(axis=1)
+    validas &= (anio >= 1) & (dia >= 1) & (hora <= 23) & (minuto <= 59)
+    # Una posición extra en NaT para los valores faltantes (código -1)
+    fechas = np.full(len(partes) + 1, np.datetime64('NaT'), dtype='datetime64[m]')
+    if not validas.any():
+        return fechas[codigos]
+
+    anio, mes, dia = anio[validas].astype(np.int64), mes[validas].astype(np.int64), dia[validas].astype(np.int64)
+    inicio_mes = ((anio - 1970) * 12 + mes - 1).astype('datetime64[M]')
+    fecha = inicio_mes.astype('datetime64[D]') + (dia - 1)
+    # Un día fuera del mes (31 de febrero) pasaría al mes siguiente
+    existe = fecha.astype('datetime64[M]') == inicio_mes
+    minutos = (hora[validas] * 60 + minuto[validas]).astype(np.int64)
+    fechas[:-1][validas] = np.where(existe, fecha.astype('datetime64[m]') + minutos, np.datetime64('NaT'))
+    return fechas[codigos]
+
+
+def _factorizar(valores: Sequence):
+    """Códigos de cada valor y valores distintos; los faltantes tienen código -1."""
+    codigos, unicos = pd.factorize(pd.Series(valores, dtype=object))
+    return codigos, np.asarray(unicos, dtype=object)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Extracción de actividades de texto
+==================================
+
+Reconoce líneas como "Muros — 8 días (después de Estructura)" en
+descripciones de proyecto en lenguaje natural.
+
+Los documentos largos se procesan como un flujo: las líneas se agrupan en
+lotes a medida que se leen del texto y, si el texto es grande, los lotes se
+reparten en un pool de procesos manteniendo solo unos pocos en vuelo. Los
+resultados se entregan en el orden original de las líneas, igual que en la
+ruta secuencial que se usa para textos pequeños.
+"""
+
+import io
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+# Líneas por lote enviado a un proceso
+LINEAS_POR_LOTE = 5000
+
+# Caracteres a partir de los cuales compensa repartir el texto en procesos
+UMBRAL_PROCESOS = 2_000_000
+
+# Lotes en vuelo por proceso: acota la memoria sin dejar procesos ociosos
+LOTES_POR_PROCESO = 2
+
+# Formatos de línea, en orden de prioridad, con los signos que cada uno necesita
+# en la línea para poder coincidir
+_NOMBRE = r'[A-Za-zÁÉÍÓÚáéíóúñÑ\s]'
+_PATRONES_ACTIVIDAD = [(re.compile(patron, re.IGNORECASE), requisitos) for patron, requisitos in [
+    # Formato: "Actividad — X días (después de Predecesora)"
+    (rf'(\d+\.\s*)?(?P<actividad>{_NOMBRE}+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?\s*\(despu[eé]s de\s+(?P<predecesora>{_NOMBRE}+)\)',
+     ('guion', 'parentesis', 'despues')),
+
+    # Formato: "Actividad - X días después de Predecesora"
+    (rf'(\d+\.\s*)?(?P<actividad>{_NOMBRE}+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?\s+despu[eé]s de\s+(?P<predecesora>{_NOMBRE}+)',
+     ('guion', 'despues')),
+
+    # Formato: "Actividad: X días después de Predecesora"
+    (rf'(\d+\.\s*)?(?P<actividad>{_NOMBRE}+?)\s*:\s*(?P<duracion>\d+)\s*d[ií]as?\s+despu[eé]s de\s+(?P<predecesora>{_NOMBRE}+)',
+     ('dos_puntos', 'despues')),
+
+    # Formato: "Actividad: X días (Predecesora)"
+    (rf'(\d+\.\s*)?(?P<actividad>{_NOMBRE}+?)\s*:\s*(?P<duracion>\d+)\s*d[ií]as?\s*\((?P<predecesora>{_NOMBRE}+)\)',
+     ('dos_puntos', 'parentesis')),
+
+    # Formato: "Actividad — X días (Predecesora)"
+    (rf'(\d+\.\s*)?(?P<actividad>{_NOMBRE}+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?\s*\((?P<predecesora>{_NOMBRE}+)\)',
+     ('guion', 'parentesis')),
+
+    # Formato: "Actividad — X días: Predecesora"
+    (rf'(\d+\.\s*)?(?P<actividad>{_NOMBRE}+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?\s*:\s*(?P<predecesora>{_NOMBRE}+)',
+     ('guion', 'dos_puntos')),
+
+    # Formato: "Actividad: X días Predecesora" (sin paréntesis)
+    (rf'(\d+\.\s*)?(?P<actividad>{_NOMBRE}+?)\s*:\s*(?P<duracion>\d+)\s*d[ií]as?\s+(?P<predecesora>{_NOMBRE}+?)(?:\s|$)',
+     ('dos_puntos',)),
+
+    # Formato: "Actividad - X días"
+    (rf'(\d+\.\s*)?(?P<actividad>{_NOMBRE}+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?',
+     ('guion',)),
+
+    # Formato: "Actividad: X días"
+    (rf'(\d+\.\s*)?(?P<actividad>{_NOMBRE}+?)\s*:\s*(?P<duracion>\d+)\s*d[ií]as?',
+     ('dos_puntos',)),
+]]
+
+# Todos los formatos contienen "<número> día(s)"
+_PREFILTRO_ACTIVIDAD = re.compile(r'\d\s*d[ií]a', re.IGNORECASE)
+
+
+def extraer_actividad(linea: str) -> Optional[Dict]:
+    """
+    Extrae actividad, duración y predecesora de una línea.
+
+    Args:
+        linea (str): Línea de texto sin espacios sobrantes
+
+    Returns:
+        Optional[Dict]: Diccionario con Actividad, Duración y Predecesoras, o None
+    """
+    # Ningún formato aplica si la línea no tiene "<número> día(s)"
+    if not _PREFILTRO_ACTIVIDAD.search(linea):
+        return None
+
+    # Signos presentes en la línea; un patrón solo se prueba si están todos los suyos
+    plegada = linea.casefold()
+    presentes = {
+        'guion': '-' in linea or '–' in linea or '—' in linea,
+        'dos_puntos': ':' in linea,
+        'parentesis': '(' in linea,
+        'despues': 'despu' in plegada,
+    }
+
+    # Los patrones se prueban en orden de prioridad; gana el primero que encuentre algo
+    for patron, requisitos in _PATRONES_ACTIVIDAD:
+        if not all(presentes[r] for r in requisitos):
+            continue
+        match = patron.search(linea)
+        if match:
+            return {
+                'Actividad': match.group('actividad').strip(),
+                'Duración': int(match.group('duracion')),
+                'Predecesoras': (match.groupdict().get('predecesora') or '').strip()
+            }
+
+    return None
+
+
+def extraer_lote(lineas: List[str]) -> List[Dict]:
+    """Extrae las actividades de un lote de líneas, en orden."""
+    actividades = []
+    for linea in lineas:
+        linea = linea.strip()
+        if linea:
+            actividad = extraer_actividad(linea)
+            if actividad:
+                actividades.append(actividad)
+    return actividades
+
+
+def lotes_de_lineas(texto: str, lineas_por_lote: int = LINEAS_POR_LOTE) -> Iterator[List[str]]:
+    """Recorre el texto por líneas (separadas por '\\n') y las agrupa en lotes."""
+    lote = []
+    for linea in io.StringIO(texto, newline='\n'):
+        lote.append(linea)
+        if len(lote) >= lineas_por_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def iterar_actividades(texto: str, procesos: Optional[int] = None,
+                       lineas_por_lote: int = LINEAS_POR_LOTE) -> Iterator[Dict]:
+    """
+    Extrae las actividades de un texto línea por línea, en el orden del texto.
+
+    Args:
+        texto (str): Descripción del proyecto
+        procesos (int, opcional): Procesos del pool (por defecto, uno por CPU); con 1,
+            o si el texto tiene menos de UMBRAL_PROCESOS caracteres, todo se procesa
+            en el proceso actual
+        lineas_por_lote (int): Líneas por lote
+
+    Yields:
+        Dict: Actividad extraída (Actividad, Duración, Predecesoras)
+    """
+    procesos = procesos or os.cpu_count() or 1
+    lotes = lotes_de_lineas(texto, lineas_por_lote)
+
+    if procesos <= 1 or len(texto) < UMBRAL_PROCESOS:
+        for lote in lotes:
+            yield from extraer_lote(lote)
+        return
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        # Ventana de lotes en vuelo; se consumen en orden de envío
+        pendientes = deque()
+        for lote in lotes:
+            pendientes.append(pool.submit(extraer_lote, lote))
+            if len(pendientes) >= procesos * LOTES_POR_PROCESO:
+                yield from pendientes.popleft().result()
+        while pendientes:
+            yield from pendientes.popleft().result()
+
+
+def extraer_actividades(texto: str, procesos: Optional[int] = None) -> List[Dict]:
+    """Lista de las actividades de `iterar_actividades`."""
+    return list(iterar_actividades(texto, procesos))
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Calendarios laborales
+=====================
+
+Aritmética de días hábiles vectorizada sobre `numpy.busday_offset` y
+`numpy.busday_count`. Un calendario se define por una máscara semanal
+('1111100' = lunes a viernes) y una lista de feriados.
+
+Los calendarios son inmutables y se guardan en caché por (máscara, feriados),
+de modo que todos los proyectos que usan el mismo conjunto de feriados
+nacionales comparten una sola instancia. Los conjuntos de feriados pueden
+registrarse por nombre con `registrar_feriados`.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+# Máscara por defecto: todos los días son laborables (comportamiento original)
+SEMANA_COMPLETA = '1111111'
+
+# Conjuntos de feriados registrados por nombre (p. ej. feriados nacionales)
+_FERIADOS_REGISTRADOS: Dict[str, Tuple[np.datetime64, ...]] = {}
+
+
+class WorkCalendar:
+    """
+    Calendario laboral con máscara semanal y feriados.
+
+    Las fechas se manejan como `datetime64[D]`; todas las operaciones aceptan
+    arreglos y se resuelven en una sola llamada de NumPy.
+    """
+
+    def __init__(self, weekmask: str, feriados: Tuple[np.datetime64, ...]):
+        self.weekmask = weekmask
+        self.feriados = feriados
+        self._calendario = np.busdaycalendar(weekmask=weekmask, holidays=list(feriados))
+
+    @property
+    def todos_laborables(self) -> bool:
+        """Indica si el calendario no descarta ningún día."""
+        return self.weekmask == SEMANA_COMPLETA and not self.feriados
+
+    def ajustar(self, fechas):
+        """Mueve cada fecha al siguiente día laborable (o la deja si ya lo es)."""
+        return np.busday_offset(fechas, 0, roll='forward', busdaycal=self._calendario)
+
+    def sumar(self, fechas, dias):
+        """Suma `dias` días hábiles a cada fecha, empezando en un día laborable."""
+        return np.busday_offset(fechas, dias, roll='forward', busdaycal=self._calendario)
+
+    def contar(self, desde, hasta):
+        """Cuenta los días hábiles en el intervalo [desde, hasta)."""
+        return np.busday_count(desde, hasta, busdaycal=self._calendario)
+
+    def __repr__(self) -> str:
+        return f"WorkCalendar(weekmask='{self.weekmask}', feriados={len(self.feriados)})"
+
+
+def registrar_feriados(nombre: str, fechas: Iterable) -> None:
+    """
+    Registra un conjunto de feriados con nombre para compartirlo entre proyectos.
+
+    Args:
+        nombre (str): Nombre del conjunto (p. ej. 'nacional')
+        fechas (Iterable): Fechas en formato 'YYYY-MM-DD' o date
+    """
+    _FERIADOS_REGISTRADOS[nombre] = _normalizar_feriados(fechas)
+
+
+def _normalizar_feriados(fechas: Iterable) -> Tuple[np.datetime64, ...]:
+    """Convierte fechas a una tupla ordenada y sin duplicados de datetime64[D]."""
+    valores = np.unique(np.asarray([np.datetime64(f, 'D') for f in fechas], dtype='datetime64[D]'))
+    return tuple(valores)
+
+
+def obtener_calendario(weekmask: str = SEMANA_COMPLETA,
+                       feriados: Optional[Union[str, Iterable]] = None) -> WorkCalendar:
+    """
+    Devuelve el calendario para una máscara y un conjunto de feriados.
+
+    Args:
+        weekmask (str): Máscara semanal de 7 caracteres, de lunes a domingo
+        feriados (str o Iterable, opcional): Nombre de un conjunto registrado o lista de fechas
+
+    Returns:
+        WorkCalendar: Instancia compartida del calendario
+
+    Raises:
+        ValueError: Si la máscara no es válida o el conjunto de feriados no existe
+    """
+    if len(weekmask) != 7 or set(weekmask) - {'0', '1'} or '1' not in weekmask:
+        raise ValueError(f"Máscara semanal no válida: {weekmask}")
+
+    if feriados is None:
+        conjunto = ()
+    elif isinstance(feriados, str):
+        if feriados not in _FERIADOS_REGISTRADOS:
+            raise ValueError(f"Conjunto de feriados no registrado: {feriados}")
+        conjunto = _FERIADOS_REGISTRADOS[feriados]
+    else:
+        conjunto = _normalizar_feriados(feriados)
+
+    return _calendario_en_cache(weekmask, conjunto)
+
+
+@lru_cache(maxsize=64)
+def _calendario_en_cache(weekmask: str, feriados: Tuple[np.datetime64, ...]) -> WorkCalendar:
+    return WorkCalendar(weekmask, feriados)
+
+
+def fines_con_calendarios(inicio: np.ndarray, duracion: np.ndarray, calendario_ids: np.ndarray,
+                          calendarios, proyecto: WorkCalendar, ancla: np.datetime64) -> np.ndarray:
+    """
+    Calcula el fin (en días hábiles del proyecto) de actividades con calendario propio.
+
+    El inicio se traduce a fecha con el calendario del proyecto, la duración se
+    suma con el calendario de cada actividad y la fecha de fin se vuelve a
+    expresar en días hábiles del proyecto (redondeando al siguiente día hábil).
+
+    Args:
+        inicio (np.ndarray): Inicio de cada actividad en días hábiles del proyecto
+        duracion (np.ndarray): Duración de cada actividad en días hábiles propios
+        calendario_ids (np.ndarray): Índice del calendario de cada actividad
+        calendarios (Sequence[WorkCalendar]): Calendarios referenciados por los índices
+        proyecto (WorkCalendar): Calendario del proyecto
+        ancla (np.datetime64): Primer día hábil del proyecto
+
+    Returns:
+        np.ndarray: Fin de cada actividad en días hábiles del proyecto
+    """
+    fin = np.empty(len(inicio), dtype=np.int64)
+    for k in np.unique(calendario_ids).tolist():
+        grupo = calendario_ids == k
+        fechas_inicio = proyecto.sumar(ancla, inicio[grupo])
+        fechas_fin = calendarios[k].sumar(fechas_inicio, duracion[grupo])
+        fin[grupo] = proyecto.contar(ancla, fechas_fin)
+    return fin
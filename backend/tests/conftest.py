@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""Configuración común de las pruebas: importa el backend como lo hace app.py."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los parámetros de la API
+===================================
+
+Los parámetros opcionales del cuerpo JSON se convierten al tipo esperado y un
+valor no válido se responde con 400, no con 500 ni con un valor por omisión.
+Un error de lectura o de parámetros no devuelve el informe de validación del
+cronograma anterior.
+"""
+
+import io
+
+import pytest
+
+import app as aplicacion
+from ai_builder_scheduler import AIBuilderScheduler
+
+CSV = 'Actividad,Duracion,Predecesoras\nA,3,\nB,2,A\nC,4,"A,B"\n'
+
+
+@pytest.fixture
+def cliente(tmp_path):
+    aplicacion.scheduler = AIBuilderScheduler()
+    ruta = tmp_path / 'obra.csv'
+    ruta.write_text(CSV, encoding='utf-8')
+    cliente = aplicacion.app.test_client()
+    cliente.ruta_csv = str(ruta)
+    return cliente
+
+
+def _cargar(cliente, **opciones):
+    return cliente.post('/api/process', json={'input': cliente.ruta_csv, **opciones})
+
+
+@pytest.mark.parametrize('workers', [1, '1', 2.0])
+def test_riesgos_con_workers_validos(cliente, workers):
+    assert _cargar(cliente).status_code == 200
+
+    respuesta = cliente.post('/api/analyze-risks',
+                             json={'samples': '200', 'seed': 7, 'workers': workers, 'ai': False})
+
+    assert respuesta.status_code == 200
+    assert respuesta.get_json()['simulation']['samples'] == 200
+
+
+@pytest.mark.parametrize('cuerpo', [
+    {'workers': 'cuatro'},
+    {'workers': 0},
+    {'workers': 1.5},
+    {'workers': True},
+    {'workers': [2]},
+    {'samples': None},
+    {'samples': 'mil'},
+    {'seed': 'x'},
+])
+def test_riesgos_con_parametros_invalidos_devuelve_400(cliente, cuerpo):
+    assert _cargar(cliente).status_code == 200
+
+    respuesta = cliente.post('/api/analyze-risks', json={'samples': 200, 'ai': False, **cuerpo})
+
+    assert respuesta.status_code == 400
+    assert 'entero' in respuesta.get_json()['error']
+
+
+@pytest.mark.parametrize('reduce, eliminadas', [
+    (None, 0), (True, 1), (False, 0), ('true', 1), ('false', 0), ('Sí', 1), ('no', 0), (1, 1), (0, 0),
+])
+def test_process_interpreta_reduce(cliente, reduce, eliminadas):
+    opciones = {} if reduce is None else {'reduce': reduce}
+
+    respuesta = _cargar(cliente, **opciones)
+
+    assert respuesta.status_code == 200
+    assert len(respuesta.get_json()['removed_dependencies']) == eliminadas
+
+
+@pytest.mark.parametrize('reduce', ['quizás', 2, [True]])
+def test_process_con_reduce_invalido_devuelve_400(cliente, reduce):
+    respuesta = _cargar(cliente, reduce=reduce)
+
+    assert respuesta.status_code == 400
+    assert 'reduce' in respuesta.get_json()['error']
+
+
+@pytest.mark.parametrize('reduce, estado, eliminadas', [('false', 200, 0), ('true', 200, 1), ('quizás', 400, None)])
+def test_upload_interpreta_reduce_igual_que_process(cliente, reduce, estado, eliminadas):
+    with open(cliente.ruta_csv, 'rb') as archivo:
+        respuesta = cliente.post('/api/upload', data={'file': (archivo, 'obra.csv'), 'reduce': reduce})
+
+    assert respuesta.status_code == estado
+    if eliminadas is not None:
+        assert len(respuesta.get_json()['removed_dependencies']) == eliminadas
+
+
+CSV_CICLICO = 'Actividad,Duracion,Predecesoras\nA,3,C\nB,2,A\nC,4,B\n'
+
+
+def _subir(cliente, contenido, nombre, **campos):
+    return cliente.post('/api/upload', data={'file': (io.BytesIO(contenido), nombre), **campos})
+
+
+@pytest.mark.parametrize('contenido, nombre, campos', [
+    (b'<?xml version="1.0"?><Otro/>', 'obra.xml', {}),
+    (CSV.encode('utf-8'), 'obra.csv', {'reduce': 'quizás'}),
+])
+def test_error_de_lectura_no_arrastra_la_validacion_anterior(cliente, contenido, nombre, campos):
+    ciclico = _subir(cliente, CSV_CICLICO.encode('utf-8'), 'ciclico.csv')
+    assert ciclico.status_code == 400
+    assert ciclico.get_json()['validation']['cycles']
+
+    respuesta = _subir(cliente, contenido, nombre, **campos)
+
+    assert respuesta.status_code == 400
+    assert respuesta.get_json().get('validation') is None
+
+
+def test_process_con_reduce_invalido_no_arrastra_la_validacion_anterior(cliente, tmp_path):
+    ruta = tmp_path / 'ciclico.csv'
+    ruta.write_text(CSV_CICLICO, encoding='utf-8')
+    assert cliente.post('/api/process', json={'input': str(ruta)}).get_json()['validation']['cycles']
+
+    respuesta = _cargar(cliente, reduce='quizás')
+
+    assert respuesta.status_code == 400
+    assert respuesta.get_json().get('validation') is None
+
+
+@pytest.mark.parametrize('duracion', [2.7, True, 'dos', [2]])
+def test_patch_con_duracion_no_entera_devuelve_400(cliente, duracion):
+    assert _cargar(cliente).status_code == 200
+
+    respuesta = cliente.patch('/api/activities/B', json={'duration': duracion})
+
+    assert respuesta.status_code == 400
+    assert 'duration' in respuesta.get_json()['error']
+    assert aplicacion.scheduler.df_actividades['Duración'].tolist() == [3, 2, 4]
+
+
+@pytest.mark.parametrize('duracion', [5, '5', 5.0])
+def test_patch_con_duracion_entera(cliente, duracion):
+    assert _cargar(cliente).status_code == 200
+
+    respuesta = cliente.patch('/api/activities/B', json={'duration': duracion})
+
+    assert respuesta.status_code == 200
+    assert aplicacion.scheduler.df_actividades['Duración'].tolist() == [3, 5, 4]
+
+
+class _GeminiFalso:
+    def __init__(self):
+        self.llamadas = 0
+
+    def analizar_riesgos_proyecto(self, actividades):
+        self.llamadas += 1
+        return {'riesgos': []}
+
+
+@pytest.mark.parametrize('ai, llamadas', [(None, 1), (True, 1), ('true', 1), (False, 0), ('false', 0), ('no', 0), ('0', 0)])
+def test_riesgos_interpreta_ai(cliente, monkeypatch, ai, llamadas):
+    from services import gemini_service
+    gemini = _GeminiFalso()
+    monkeypatch.setattr(gemini_service, 'get_gemini_service', lambda: gemini)
+    assert _cargar(cliente).status_code == 200
+    opciones = {} if ai is None else {'ai': ai}
+
+    respuesta = cliente.post('/api/analyze-risks', json={'samples': 200, **opciones})
+
+    assert respuesta.status_code == 200
+    assert gemini.llamadas == llamadas
+    assert ('risk_analysis' in respuesta.get_json()) == bool(llamadas)
+
+
+def test_riesgos_con_ai_invalido_devuelve_400(cliente):
+    assert _cargar(cliente).status_code == 200
+
+    respuesta = cliente.post('/api/analyze-risks', json={'samples': 200, 'ai': 'quizás'})
+
+    assert respuesta.status_code == 400
+    assert "'ai'" in respuesta.get_json()['error']
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del motor CPM
+=====================
+
+Paridad entre el núcleo escalar y el vectorizado por niveles: ambos deben dar
+las mismas fechas tempranas y tardías y las mismas holguras en redes
+aleatorias alrededor de UMBRAL_VECTORIZADO y en los casos borde.
+"""
+
+import numpy as np
+import pytest
+
+from services.cpm import (UMBRAL_VECTORIZADO, _cpm_escalar, _cpm_vectorizado, calcular_cpm,
+                          niveles_topologicos)
+from services.schedule_graph import ScheduleGraph, construir_csr
+
+
+def _grafo(duraciones, listas) -> ScheduleGraph:
+    ptr, idx = construir_csr(listas)
+    return ScheduleGraph([f"A{i}" for i in range(len(duraciones))], duraciones, ptr, idx)
+
+
+def _dag_aleatorio(n: int, semilla: int, max_predecesoras: int = 4) -> ScheduleGraph:
+    """DAG con ids desordenados respecto al orden topológico y niveles anchos."""
+    rng = np.random.default_rng(semilla)
+    permutacion = rng.permutation(n)
+    listas = [[] for _ in range(n)]
+    for posicion in range(1, n):
+        k = int(rng.integers(0, max_predecesoras + 1))
+        # Predecesoras entre las posiciones anteriores cercanas: niveles anchos y profundos
+        desde = max(0, posicion - 200)
+        anteriores = rng.integers(desde, posicion, size=k)
+        listas[permutacion[posicion]] = sorted({int(permutacion[p]) for p in anteriores})
+    return _grafo(rng.integers(0, 30, size=n), listas)
+
+
+def _resultados(grafo: ScheduleGraph) -> dict:
+    return {
+        'inicio': grafo.inicio.copy(),
+        'fin': grafo.fin.copy(),
+        'inicio_tardio': grafo.inicio_tardio.copy(),
+        'fin_tardio': grafo.fin_tardio.copy(),
+        'holgura_total': grafo.holgura_total.copy(),
+        'holgura_libre': grafo.holgura_libre.copy()
+    }
+
+
+def _assert_paridad(grafo: ScheduleGraph) -> None:
+    _cpm_escalar(grafo)
+    escalar = _resultados(grafo)
+    niveles = niveles_topologicos(grafo)
+    assert niveles is not None
+    _cpm_vectorizado(grafo, niveles)
+    vectorizado = _resultados(grafo)
+    for clave, valores in escalar.items():
+        np.testing.assert_array_equal(vectorizado[clave], valores, err_msg=clave)
+
+
+@pytest.mark.parametrize('n', [UMBRAL_VECTORIZADO - 1, UMBRAL_VECTORIZADO, UMBRAL_VECTORIZADO + 1])
+def test_paridad_alrededor_del_umbral(n):
+    _assert_paridad(_dag_aleatorio(n, semilla=n))
+
+
+@pytest.mark.parametrize('semilla', range(5))
+def test_paridad_redes_pequenas(semilla):
+    _assert_paridad(_dag_aleatorio(300, semilla, max_predecesoras=8))
+
+
+def test_auto_coincide_con_escalar_por_encima_del_umbral():
+    grafo = _dag_aleatorio(UMBRAL_VECTORIZADO + 500, semilla=7)
+    calcular_cpm(grafo, 'escalar')
+    escalar = _resultados(grafo)
+    calcular_cpm(grafo)
+    for clave, valores in _resultados(grafo).items():
+        np.testing.assert_array_equal(valores, escalar[clave], err_msg=clave)
+
+
+def test_grafo_vacio():
+    grafo = _grafo([], [])
+    _assert_paridad(grafo)
+    calcular_cpm(grafo)
+    assert grafo.duracion_total == 0
+
+
+def test_un_solo_nodo():
+    grafo = _grafo([5], [[]])
+    _assert_paridad(grafo)
+    assert grafo.fin.tolist() == [5]
+    assert grafo.holgura_total.tolist() == [0]
+
+
+def test_componentes_desconectadas():
+    # Cadena 0 -> 1 -> 2 (10 días), par 3 -> 4 (4 días) y actividad aislada 5
+    grafo = _grafo([3, 4, 3, 2, 2, 1], [[], [0], [1], [], [3], []])
+    _assert_paridad(grafo)
+    assert grafo.fin.tolist() == [3, 7, 10, 2, 4, 1]
+    assert grafo.holgura_total.tolist() == [0, 0, 0, 6, 6, 9]
+    assert grafo.holgura_libre.tolist() == [0, 0, 0, 0, 6, 9]
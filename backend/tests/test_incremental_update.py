@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la actualización incremental de actividades
+======================================================
+
+Una edición rechazada no debe modificar el grafo: las ediciones válidas
+posteriores tienen que seguir coincidiendo con un cálculo completo.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_builder_scheduler import AIBuilderScheduler
+from services.cpm import actualizar_actividad, calcular_cpm
+from services.schedule_graph import ScheduleGraph
+
+
+def _cronograma() -> AIBuilderScheduler:
+    scheduler = AIBuilderScheduler()
+    df = pd.DataFrame({
+        'Actividad': ['A', 'B', 'C', 'D'],
+        'Duración': [3, 4, 5, 2],
+        'Predecesoras': ['', 'A', 'A', 'B']
+    })
+    scheduler.df_actividades = scheduler.generar_cronograma(df)
+    return scheduler
+
+
+def _recalcular(df: pd.DataFrame) -> ScheduleGraph:
+    return calcular_cpm(ScheduleGraph.desde_dataframe(df))
+
+
+def _assert_coincide_con_calculo_completo(scheduler: AIBuilderScheduler) -> None:
+    df = scheduler.df_actividades
+    grafo = _recalcular(df)
+    np.testing.assert_array_equal(df['Inicio'].to_numpy(), grafo.inicio)
+    np.testing.assert_array_equal(df['Fin'].to_numpy(), grafo.fin)
+    np.testing.assert_array_equal(scheduler.grafo.pred_idx, grafo.pred_idx)
+
+
+def test_duracion_negativa_no_modifica_predecesoras():
+    scheduler = _cronograma()
+    with pytest.raises(ValueError):
+        scheduler.actualizar_actividad('D', -1, 'C')
+    _assert_coincide_con_calculo_completo(scheduler)
+
+    scheduler.actualizar_actividad('A', 10)
+    _assert_coincide_con_calculo_completo(scheduler)
+
+
+def test_ciclo_rechazado_conserva_orden_y_adyacencia():
+    scheduler = _cronograma()
+    grafo = scheduler.grafo
+    rango, ptr, idx = grafo.rango.copy(), grafo.pred_ptr.copy(), grafo.pred_idx.copy()
+    with pytest.raises(ValueError):
+        scheduler.actualizar_actividad('A', None, 'D')
+    np.testing.assert_array_equal(grafo.rango, rango)
+    np.testing.assert_array_equal(grafo.pred_ptr, ptr)
+    np.testing.assert_array_equal(grafo.pred_idx, idx)
+
+    scheduler.actualizar_actividad('C', 1, 'B')
+    _assert_coincide_con_calculo_completo(scheduler)
+
+
+def test_predecesora_fuera_de_rango():
+    grafo = _recalcular(_cronograma().df_actividades)
+    with pytest.raises(ValueError):
+        actualizar_actividad(grafo, 3, 1, [7])
+    assert grafo.duracion[3] == 2
+
+
+def test_patch_rechazado_no_altera_el_cronograma():
+    import app as aplicacion
+
+    aplicacion.scheduler = _cronograma()
+    cliente = aplicacion.app.test_client()
+    respuesta = cliente.patch('/api/activities/D', json={'duration': -1, 'predecessors': 'C'})
+    assert respuesta.status_code == 400
+
+    respuesta = cliente.patch('/api/activities/A', json={'duration': 8})
+    assert respuesta.status_code == 200
+    _assert_coincide_con_calculo_completo(aplicacion.scheduler)
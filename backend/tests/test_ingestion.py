@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la lectura de archivos
+=================================
+
+Un archivo legible pero no válido se informa como error; solo un archivo
+ilegible se reemplaza por el proyecto de ejemplo.
+"""
+
+import io
+
+import pytest
+from openpyxl import Workbook
+
+from ai_builder_scheduler import AIBuilderScheduler
+from services.table_ingestion import InputError
+
+
+def _libro() -> bytes:
+    libro = Workbook()
+    hoja = libro.active
+    hoja.title = 'Datos'
+    hoja.append(['Actividad', 'Duracion', 'Predecesoras'])
+    hoja.append(['A', 3, ''])
+    hoja.append(['B', 2, 'A'])
+    libro.create_sheet('Notas')
+    datos = io.BytesIO()
+    libro.save(datos)
+    return datos.getvalue()
+
+
+@pytest.mark.parametrize('hoja', ['NoExiste', 5])
+def test_hoja_inexistente(hoja):
+    with pytest.raises(InputError, match='hojas disponibles: Datos, Notas'):
+        AIBuilderScheduler().leer_entrada(_libro(), hoja=hoja)
+
+
+def test_hoja_por_nombre():
+    df = AIBuilderScheduler().leer_entrada(_libro(), hoja='Datos')
+    assert df['Actividad'].tolist() == ['A', 'B']
+
+
+def test_xml_que_no_es_mspdi():
+    with pytest.raises(InputError):
+        AIBuilderScheduler().leer_entrada(b'<?xml version="1.0"?><Otro/>')
+
+
+def test_upload_con_hoja_inexistente_devuelve_400():
+    import app as aplicacion
+
+    aplicacion.scheduler = AIBuilderScheduler()
+    respuesta = aplicacion.app.test_client().post(
+        '/api/upload', data={'file': (io.BytesIO(_libro()), 'obra.xlsx'), 'sheet': 'NoExiste'})
+    assert respuesta.status_code == 400
+    assert 'Datos, Notas' in respuesta.get_json()['error']
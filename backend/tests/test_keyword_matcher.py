@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la búsqueda de palabras clave
+========================================
+
+`primeras_apariciones` busca por subcadenas con vocabularios pequeños y con el
+autómata con vocabularios grandes; las dos rutas deben dar el mismo resultado.
+"""
+
+import random
+
+import pytest
+
+from ai_builder_scheduler import AIBuilderScheduler
+from services import keyword_matcher
+from services.keyword_matcher import UMBRAL_AUTOMATA, KeywordAutomaton
+
+
+def _por_ruta(automata: KeywordAutomaton, texto: str, umbral: int, monkeypatch) -> dict:
+    monkeypatch.setattr(keyword_matcher, 'UMBRAL_AUTOMATA', umbral)
+    return automata.primeras_apariciones(texto)
+
+
+@pytest.mark.parametrize('semilla', range(20))
+def test_subcadenas_y_automata_coinciden(semilla, monkeypatch):
+    azar = random.Random(semilla)
+    # Alfabeto corto: muchas palabras solapadas, prefijos comunes y empates de posición
+    def palabra():
+        return ''.join(azar.choice('abcá') for _ in range(azar.randint(1, 4)))
+
+    vocabulario = {f"t{k}": [palabra() for _ in range(azar.randint(1, 3))] for k in range(azar.randint(1, 8))}
+    texto = ''.join(azar.choice('abcáAÁ ') for _ in range(azar.randint(0, 60)))
+    automata = KeywordAutomaton(vocabulario)
+
+    subcadenas = _por_ruta(automata, texto, len(automata.palabras) + 1, monkeypatch)
+    por_automata = _por_ruta(automata, texto, 0, monkeypatch)
+
+    assert list(subcadenas.items()) == list(por_automata.items())
+
+
+def test_empates_en_orden_del_vocabulario(monkeypatch):
+    automata = KeywordAutomaton({'muros': ['muros'], 'muro': ['muro'], 'mu': ['mu']})
+
+    for umbral in (0, 100):
+        assert list(_por_ruta(automata, 'Muros de carga', umbral, monkeypatch)) == ['muros', 'muro', 'mu']
+
+
+def test_vocabulario_del_scheduler_usa_subcadenas():
+    scheduler = AIBuilderScheduler()
+    assert len(scheduler.automata_actividades.palabras) < UMBRAL_AUTOMATA
+
+    actividades = scheduler._procesar_por_patrones("Pintura final, luego excavación y columnas")
+
+    assert [a['Actividad'] for a in actividades] == ['Acabados', 'Excavacion', 'Estructura']
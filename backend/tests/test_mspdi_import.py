@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la importación de MS Project XML
+===========================================
+
+Las tareas omitidas (hitos, resúmenes, nulas) se sustituyen por las tareas
+importadas equivalentes sin recursión: una cadena de miles de hitos o un
+esquema con miles de niveles no debe agotar la pila de Python.
+"""
+
+import io
+import sys
+
+from services.mspdi_import import leer_mspdi
+
+NS = 'http://schemas.microsoft.com/project'
+
+
+def _tarea(uid, nombre, horas, nivel=1, resumen=False, predecesoras=()):
+    vinculos = ''.join(f'<PredecessorLink><PredecessorUID>{p}</PredecessorUID><Type>1</Type></PredecessorLink>'
+                       for p in predecesoras)
+    return (f'<Task><UID>{uid}</UID><ID>{uid}</ID><Name>{nombre}</Name>'
+            f'<Duration>PT{horas}H0M0S</Duration><OutlineLevel>{nivel}</OutlineLevel>'
+            f'<Summary>{int(resumen)}</Summary>{vinculos}</Task>')
+
+
+def _proyecto(tareas) -> io.BytesIO:
+    return io.BytesIO(f'<?xml version="1.0"?><Project xmlns="{NS}"><MinutesPerDay>480</MinutesPerDay>'
+                      f'<Tasks>{"".join(tareas)}</Tasks></Project>'.encode('utf-8'))
+
+
+def _predecesoras(df):
+    return dict(zip(df['Actividad'], df['Predecesoras']))
+
+
+def test_cadena_de_hitos_mas_larga_que_el_limite_de_recursion():
+    n = sys.getrecursionlimit() * 3
+    tareas = [_tarea(1, 'Inicio obra', 8)]
+    tareas += [_tarea(k, f'Hito {k}', 0, predecesoras=[k - 1]) for k in range(2, n + 2)]
+    tareas.append(_tarea(n + 2, 'Entrega', 16, predecesoras=[n + 1]))
+
+    df, informe = leer_mspdi(_proyecto(tareas))
+
+    assert _predecesoras(df) == {'Inicio obra': '', 'Entrega': 'Inicio obra'}
+    assert informe['omitidas'] == n
+
+
+def test_esquema_mas_profundo_que_el_limite_de_recursion():
+    niveles = sys.getrecursionlimit() + 500
+    tareas = [_tarea(1, 'Replanteo', 8)]
+    # Resumen 2 contiene a 3, que contiene a 4, ...; la hoja es la última subtarea
+    tareas += [_tarea(k, f'Fase {k}', 8, nivel=k - 1, resumen=True) for k in range(2, niveles + 2)]
+    tareas.append(_tarea(niveles + 2, 'Excavación', 8, nivel=niveles + 1, predecesoras=[1]))
+    tareas.append(_tarea(niveles + 3, 'Cimentación', 8, predecesoras=[2]))
+
+    df, _ = leer_mspdi(_proyecto(tareas))
+
+    assert _predecesoras(df) == {'Replanteo': '', 'Excavación': 'Replanteo', 'Cimentación': 'Excavación'}
+
+
+def test_hitos_en_ciclo_no_aportan_predecesoras():
+    tareas = [
+        _tarea(1, 'A', 8),
+        _tarea(2, 'Hito X', 0, predecesoras=[1, 3]),
+        _tarea(3, 'Hito Y', 0, predecesoras=[2]),
+        _tarea(4, 'B', 8, predecesoras=[3]),
+        _tarea(5, 'C', 8, predecesoras=[2, 4]),
+    ]
+
+    df, _ = leer_mspdi(_proyecto(tareas))
+
+    assert _predecesoras(df) == {'A': '', 'B': 'A', 'C': 'A, B'}
+
+
+def test_orden_de_las_equivalentes():
+    tareas = [
+        _tarea(1, 'A', 8),
+        _tarea(2, 'B', 8),
+        _tarea(3, 'C', 8),
+        _tarea(4, 'Hito 1', 0, predecesoras=[2, 1]),
+        _tarea(5, 'Hito 2', 0, predecesoras=[3, 1]),
+        _tarea(6, 'D', 8, predecesoras=[4, 5]),
+    ]
+
+    df, _ = leer_mspdi(_proyecto(tareas))
+
+    assert _predecesoras(df)['D'] == 'B, A, C'
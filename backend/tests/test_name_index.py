@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del índice de nombres
+=============================
+
+Además de los resultados se cuentan las operaciones: las referencias exactas y
+normalizadas no deben recorrer los nombres del cronograma y una búsqueda
+aproximada solo puntúa un número acotado de candidatos, sea cual sea su tamaño
+(ver también medir_resolucion_nombres.py en la raíz del repositorio).
+"""
+
+from services.name_index import (
+    APROXIMADA, CANDIDATOS_A_PUNTUAR, EXACTA, NORMALIZADA, NameIndex
+)
+
+
+class _ConteoLecturas(dict):
+    """Diccionario que cuenta las lecturas por clave."""
+
+    lecturas = 0
+
+    def __getitem__(self, clave):
+        self.lecturas += 1
+        return super().__getitem__(clave)
+
+
+def _nombres(v):
+    return [f"Excavación bloque {i}" for i in range(v)]
+
+
+def test_resuelve_exacta_normalizada_y_aproximada():
+    indice = NameIndex(['Excavación', 'Cimentación', 'Muros de contención'])
+
+    assert indice.resolver_con_tipo('Excavación') == (0, EXACTA)
+    assert indice.resolver_con_tipo('  CIMENTACION ') == (1, NORMALIZADA)
+    assert indice.resolver_con_tipo('Muros de contencion zona') == (2, APROXIMADA)
+    assert indice.resolver_con_tipo('Pintura') == (None, None)
+
+
+def test_referencias_exactas_y_normalizadas_no_recorren_los_nombres():
+    nombres = _nombres(20000)
+    indice = NameIndex(nombres)
+
+    for nombre in nombres[::97]:
+        assert indice.resolver(nombre) == nombres.index(nombre)
+        assert indice.resolver(nombre.upper().replace('Ó', 'O')) == nombres.index(nombre)
+
+    # Ninguna referencia necesitó el índice de trigramas
+    assert indice._invertido is None
+
+
+def test_busqueda_aproximada_puntua_candidatos_acotados():
+    for v in (1000, 20000):
+        indice = NameIndex(_nombres(v))
+        indice._construir_invertido()
+        indice._gramas = _ConteoLecturas(indice._gramas)
+
+        i, tipo = indice.resolver_con_tipo('Excavacion blqoue 517')
+
+        assert (i, tipo) == (517, APROXIMADA)
+        assert indice._gramas.lecturas <= CANDIDATOS_A_PUNTUAR
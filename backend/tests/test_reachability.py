@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del cierre transitivo
+=============================
+
+El conteo de pares independientes no depende de `np.bitwise_count`, que solo
+existe desde NumPy 2.0.
+"""
+
+import numpy as np
+
+from services import reachability
+from services.reachability import ReachabilityIndex, _contar_bits_por_byte
+from services.schedule_graph import ScheduleGraph, construir_csr
+
+
+def test_conteo_por_byte_coincide_con_unpackbits():
+    palabras = np.random.default_rng(0).integers(0, 2**63, size=(37, 3), dtype=np.uint64)
+    esperado = int(np.unpackbits(palabras.view(np.uint8)).sum())
+    assert _contar_bits_por_byte(palabras) == esperado
+    assert reachability.contar_bits(palabras) == esperado
+
+
+def test_pares_independientes_sin_bitwise_count(monkeypatch):
+    # 0 -> 1 -> 3 y 0 -> 2: solo 1 y 2, y 2 y 3, pueden ir a la vez
+    ptr, idx = construir_csr([[], [0], [0], [1]])
+    indice = ReachabilityIndex(ScheduleGraph(['A', 'B', 'C', 'D'], [1, 1, 1, 1], ptr, idx))
+    assert indice.num_pares_independientes() == 2
+
+    monkeypatch.delattr(np, 'bitwise_count', raising=False)
+    assert indice.num_pares_independientes() == 2
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la nivelación de recursos
+====================================
+
+Las demandas reales se suman con error de redondeo (0.1 + 0.2 no es 0.3 en
+coma flotante): llenar un recurso exactamente hasta su capacidad no debe
+contarse como exceso.
+"""
+
+import numpy as np
+import pytest
+
+from services.cpm import calcular_cpm
+from services.resource_leveling import PerfilRecursos, nivelar_recursos
+from services.schedule_graph import ScheduleGraph, construir_csr
+
+
+def _grafo(duraciones, listas) -> ScheduleGraph:
+    ptr, idx = construir_csr(listas)
+    grafo = ScheduleGraph([f"A{i}" for i in range(len(duraciones))], duraciones, ptr, idx)
+    calcular_cpm(grafo)
+    return grafo
+
+
+def test_actividades_que_llenan_la_capacidad_en_paralelo():
+    grafo = _grafo([2, 2], [[], []])
+
+    inicio, fin = nivelar_recursos(grafo, np.array([[0.1], [0.2]]), [0.3])
+
+    assert inicio.tolist() == [0, 0]
+    assert fin.tolist() == [2, 2]
+
+
+def test_demanda_con_redondeo_igual_a_la_capacidad():
+    grafo = _grafo([3], [[]])
+
+    inicio, fin = nivelar_recursos(grafo, np.array([[0.1 + 0.2]]), [0.3])
+
+    assert (inicio.tolist(), fin.tolist()) == ([0], [3])
+
+
+def test_suma_de_muchas_demandas_pequenas():
+    perfil = PerfilRecursos(np.array([1.0]))
+    recurso = np.array([0])
+    for _ in range(9):
+        perfil.reservar(0, 5, recurso, np.array([0.1]))
+
+    # Nueve reservas de 0.1 suman 0.8999999999999999: la décima cabe, la undécima no
+    assert perfil.primer_inicio(0, 5, recurso, np.array([0.1])) == 0
+    perfil.reservar(0, 5, recurso, np.array([0.1]))
+    assert perfil.primer_inicio(0, 5, recurso, np.array([0.1])) == 5
+
+
+def test_un_exceso_real_se_sigue_detectando():
+    grafo = _grafo([2, 2], [[], []])
+
+    inicio, _ = nivelar_recursos(grafo, np.array([[0.2], [0.2]]), [0.3])
+    assert sorted(inicio.tolist()) == [0, 2]
+
+    with pytest.raises(ValueError, match='superan la capacidad'):
+        nivelar_recursos(_grafo([1], [[]]), np.array([[0.3001]]), [0.3])
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los snapshots de cronogramas
+=======================================
+
+Guardar y volver a cargar un cronograma conserva tipos, estado del CPM y
+calendario; un cronograma cargado (mapeado en memoria, de solo lectura)
+admite ediciones igual que uno recién calculado.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc
+import pytest
+
+from ai_builder_scheduler import AIBuilderScheduler
+from services.cpm import calcular_cpm
+from services.schedule_graph import ScheduleGraph
+from services.schedule_snapshot import (CLAVE_METADATOS, COLUMNAS_CPM, COLUMNAS_ENTERAS, VERSION_SNAPSHOT,
+                                        ScheduleSnapshot)
+
+
+def _cronograma() -> AIBuilderScheduler:
+    scheduler = AIBuilderScheduler()
+    scheduler.configurar_fecha_inicio('2025-03-03')
+    scheduler.configurar_calendario('1111110', ['2025-03-05'])
+    df = pd.DataFrame({
+        'Actividad': ['Excavación', 'Cimentación', 'Muros', 'Techos', 'Acabados'],
+        'Duración': [3, 4, 5, 2, 6],
+        'Predecesoras': ['', 'Excavación', 'Cimentación', 'Muros', 'Cimentación, Techos']
+    })
+    scheduler.df_actividades = scheduler.generar_cronograma(df)
+    return scheduler
+
+
+@pytest.fixture
+def guardado(tmp_path):
+    scheduler = _cronograma()
+    ruta = str(tmp_path / 'obra.arrow')
+    scheduler.guardar_cronograma(ruta)
+    return scheduler, ruta
+
+
+def _reescribir_metadatos(ruta: str, destino: str, cambiar) -> None:
+    tabla = ScheduleSnapshot(ruta).tabla
+    metadatos = dict(tabla.schema.metadata)
+    cambiar(metadatos)
+    tabla = tabla.replace_schema_metadata(metadatos)
+    with pa.OSFile(destino, 'wb') as archivo, pa.ipc.new_file(archivo, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+
+
+def test_ida_y_vuelta_conserva_tipos_y_valores(guardado):
+    original, ruta = guardado
+    cargado = AIBuilderScheduler()
+
+    df = cargado.cargar_cronograma(ruta)
+
+    pd.testing.assert_frame_equal(df, original.df_actividades, check_dtype=False)
+    assert list(df.columns) == list(original.df_actividades.columns)
+    for col in COLUMNAS_ENTERAS:
+        assert df[col].dtype == np.int32, col
+    assert df['Critica'].dtype == bool
+    assert cargado.fecha_inicio == original.fecha_inicio
+    assert cargado.calendario.weekmask == original.calendario.weekmask
+    np.testing.assert_array_equal(cargado.calendario.feriados, original.calendario.feriados)
+    pd.testing.assert_frame_equal(cargado.materializar_fechas(df)[['Fecha_Inicio', 'Fecha_Fin']],
+                                  original.materializar_fechas(original.df_actividades)[['Fecha_Inicio', 'Fecha_Fin']],
+                                  check_dtype=False)
+
+
+def test_fechas_absolutas_y_columnas_del_archivo(guardado):
+    original, ruta = guardado
+    snapshot = ScheduleSnapshot(ruta)
+
+    tipos = {campo.name: campo.type for campo in snapshot.tabla.schema}
+    assert tipos['Fecha_Inicio'] == pa.date32()
+    assert tipos['predecesoras_ids'] == pa.large_list(pa.int32())
+    assert all(tipos[col] == pa.int32() for col in COLUMNAS_CPM.values())
+    fechas = snapshot.cronograma()
+    esperadas = original.materializar_fechas(original.df_actividades)
+    np.testing.assert_array_equal(fechas['Fecha_Fin'].to_numpy(dtype='datetime64[D]'),
+                                  esperadas['Fecha_Fin'].to_numpy(dtype='datetime64[D]'))
+
+
+def test_grafo_restaura_estado_del_cpm_y_orden(guardado):
+    original, ruta = guardado
+    esperado = original.grafo
+
+    grafo = ScheduleSnapshot(ruta).grafo()
+
+    np.testing.assert_array_equal(grafo.pred_ptr, esperado.pred_ptr)
+    np.testing.assert_array_equal(grafo.pred_idx, esperado.pred_idx)
+    for atributo in list(COLUMNAS_CPM) + ['holgura_libre']:
+        np.testing.assert_array_equal(getattr(grafo, atributo), getattr(esperado, atributo), err_msg=atributo)
+    # El orden se reconstruye a partir del rango y es un orden topológico
+    np.testing.assert_array_equal(grafo.orden[grafo.rango], np.arange(grafo.n))
+    for i in range(grafo.n):
+        for p in grafo.pred_idx[grafo.pred_ptr[i]:grafo.pred_ptr[i + 1]]:
+            assert grafo.rango[p] < grafo.rango[i]
+
+
+def test_version_no_compatible(guardado, tmp_path):
+    _, ruta = guardado
+    destino = str(tmp_path / 'futuro.arrow')
+
+    def otra_version(metadatos):
+        datos = json.loads(metadatos[CLAVE_METADATOS])
+        datos['version'] = VERSION_SNAPSHOT + 1
+        metadatos[CLAVE_METADATOS] = json.dumps(datos)
+    _reescribir_metadatos(ruta, destino, otra_version)
+
+    with pytest.raises(ValueError, match='no compatible'):
+        AIBuilderScheduler().cargar_cronograma(destino)
+
+
+def test_arrow_que_no_es_snapshot(guardado, tmp_path):
+    _, ruta = guardado
+    destino = str(tmp_path / 'ajeno.arrow')
+    _reescribir_metadatos(ruta, destino, lambda metadatos: metadatos.pop(CLAVE_METADATOS))
+
+    with pytest.raises(ValueError, match='no es un snapshot'):
+        ScheduleSnapshot(destino)
+
+
+def test_editar_un_cronograma_cargado(guardado):
+    original, ruta = guardado
+    cargado = AIBuilderScheduler()
+    cargado.cargar_cronograma(ruta)
+    assert not cargado.df_actividades['Inicio'].to_numpy().flags.writeable
+
+    cargado.actualizar_actividad('Cimentación', 7)
+    cargado.actualizar_actividad('Acabados', None, 'Muros')
+    original.actualizar_actividad('Cimentación', 7)
+    original.actualizar_actividad('Acabados', None, 'Muros')
+
+    for col in ('Inicio', 'Fin', 'Holgura_Total', 'Holgura_Libre', 'Critica'):
+        assert cargado.df_actividades[col].tolist() == original.df_actividades[col].tolist(), col
+    completo = calcular_cpm(ScheduleGraph.desde_dataframe(cargado.df_actividades))
+    np.testing.assert_array_equal(cargado.df_actividades['Fin'].to_numpy(), completo.fin)
+    # El archivo mapeado no cambió
+    assert ScheduleSnapshot(ruta).cronograma()['Fin'].tolist() == _cronograma().df_actividades['Fin'].tolist()
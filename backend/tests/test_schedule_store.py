@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del almacén compartido de cronogramas
+=============================================
+
+Varios schedulers sobre el mismo directorio hacen de workers: uno publica y
+los demás sincronizan. También se simulan las carreras entre procesos
+(otro publicador reserva la misma versión, una versión se borra entre
+listarla y abrirla).
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from ai_builder_scheduler import AIBuilderScheduler
+from services.schedule_store import VERSIONES_CONSERVADAS, ScheduleStore
+
+
+def _escribir(contenido: str):
+    def escribir(ruta):
+        with open(ruta, 'w') as archivo:
+            archivo.write(contenido)
+    return escribir
+
+
+def _leer(ruta: str) -> str:
+    with open(ruta) as archivo:
+        return archivo.read()
+
+
+def _worker(directorio) -> AIBuilderScheduler:
+    scheduler = AIBuilderScheduler()
+    scheduler.configurar_almacen(str(directorio), 'obra')
+    return scheduler
+
+
+def _con_cronograma(scheduler: AIBuilderScheduler) -> AIBuilderScheduler:
+    df = pd.DataFrame({
+        'Actividad': ['A', 'B', 'C'],
+        'Duración': [3, 4, 5],
+        'Predecesoras': ['', 'A', 'B']
+    })
+    scheduler.df_actividades = scheduler.generar_cronograma(df)
+    return scheduler
+
+
+@pytest.mark.parametrize('proyecto', ['../fuera', 'con espacio', 'a/b', '', 'obra.v1'])
+def test_nombre_de_proyecto_no_valido(tmp_path, proyecto):
+    almacen = ScheduleStore(str(tmp_path))
+
+    with pytest.raises(ValueError, match='Nombre de proyecto'):
+        almacen.ruta(proyecto, 1)
+    with pytest.raises(ValueError, match='Nombre de proyecto'):
+        almacen.publicar(proyecto, _escribir('x'))
+    with pytest.raises(ValueError, match='Nombre de proyecto'):
+        AIBuilderScheduler().configurar_almacen(str(tmp_path), proyecto)
+    assert os.listdir(tmp_path) == []
+
+
+def test_publicar_numera_versiones_y_conserva_las_ultimas(tmp_path):
+    almacen = ScheduleStore(str(tmp_path))
+    otro = ScheduleStore(str(tmp_path))
+
+    versiones = [almacen.publicar('obra', _escribir(f"v{k}")) for k in range(1, 6)]
+    otro.publicar('otra-obra', _escribir('otra'))
+
+    assert versiones == [1, 2, 3, 4, 5]
+    assert almacen.versiones('obra') == list(range(6 - VERSIONES_CONSERVADAS, 6))
+    assert almacen.version_actual('obra') == 5
+    assert _leer(almacen.ruta('obra', 5)) == 'v5'
+    # Los proyectos no se purgan entre sí y no quedan temporales
+    assert almacen.versiones('otra-obra') == [1]
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [f"obra.v{v:06d}.arrow" for v in (3, 4, 5)] + ['otra-obra.v000001.arrow'])
+
+
+def test_versiones_conservadas_configurables(tmp_path):
+    almacen = ScheduleStore(str(tmp_path), versiones_conservadas=1)
+    for k in range(3):
+        almacen.publicar('obra', _escribir(str(k)))
+
+    assert almacen.versiones('obra') == [3]
+    assert ScheduleStore(str(tmp_path), versiones_conservadas=0).versiones_conservadas == 1
+
+
+def test_colision_con_otro_publicador_toma_la_version_siguiente(tmp_path):
+    almacen = ScheduleStore(str(tmp_path))
+    almacen.publicar('obra', _escribir('v1'))
+
+    def escribir_mientras_otro_publica(ruta):
+        # Otro proceso publica la versión 2 después de que esta publicación empezó
+        _escribir('del otro proceso')(almacen.ruta('obra', 2))
+        _escribir('propia')(ruta)
+
+    original = almacen.version_actual
+    # La versión actual se consulta antes de que el otro proceso publique
+    almacen.version_actual = lambda proyecto: 1
+    try:
+        version = almacen.publicar('obra', escribir_mientras_otro_publica)
+    finally:
+        almacen.version_actual = original
+
+    assert version == 3
+    assert _leer(almacen.ruta('obra', 2)) == 'del otro proceso'
+    assert _leer(almacen.ruta('obra', 3)) == 'propia'
+
+
+def test_escritura_fallida_no_publica_ni_deja_temporales(tmp_path):
+    almacen = ScheduleStore(str(tmp_path))
+
+    def escribir_a_medias(ruta):
+        _escribir('incompleto')(ruta)
+        raise OSError('disco lleno')
+
+    with pytest.raises(OSError):
+        almacen.publicar('obra', escribir_a_medias)
+    assert almacen.version_actual('obra') is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_publicar_sincronizar_editar_y_republicar(tmp_path):
+    primero = _con_cronograma(_worker(tmp_path))
+    segundo = _worker(tmp_path)
+
+    assert primero.publicar_cronograma() == 1
+    assert segundo.sincronizar_cronograma() is True
+    assert segundo.sincronizar_cronograma() is False
+    assert segundo.df_actividades['Fin'].tolist() == [3, 7, 12]
+
+    # PATCH en el segundo worker sobre el cronograma mapeado, publicado para el primero
+    segundo.actualizar_actividad('B', 10)
+    assert segundo.publicar_cronograma() == 2
+    assert primero.sincronizar_cronograma() is True
+    assert primero.df_actividades['Fin'].tolist() == [3, 13, 18]
+    assert primero.version_cargada == segundo.version_cargada == 2
+
+
+def test_sincronizar_reintenta_si_la_version_se_borro(tmp_path):
+    publicador = _con_cronograma(_worker(tmp_path))
+    publicador.almacen.versiones_conservadas = 1
+    lector = _worker(tmp_path)
+    publicador.publicar_cronograma()
+    publicador.actualizar_actividad('A', 1)
+    publicador.publicar_cronograma()
+    assert lector.almacen.versiones('obra') == [2]
+
+    # El lector lista la versión 1 justo antes de que la purguen
+    listadas = iter([1, 2])
+    lector.almacen.version_actual = lambda proyecto: next(listadas)
+
+    assert lector.sincronizar_cronograma() is True
+    assert lector.version_cargada == 2
+    assert lector.df_actividades['Fin'].tolist() == [1, 5, 10]
+
+
+def test_sin_almacen_no_publica_ni_sincroniza():
+    scheduler = _con_cronograma(AIBuilderScheduler())
+
+    assert scheduler.publicar_cronograma() is None
+    assert scheduler.sincronizar_cronograma() is False
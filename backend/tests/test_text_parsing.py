@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la extracción de actividades de texto
+================================================
+
+La ruta por lotes en el pool de procesos debe dar exactamente el mismo
+resultado, en el mismo orden, que la ruta secuencial en el proceso actual.
+"""
+
+import pandas as pd
+import pytest
+
+import ai_builder_scheduler as modulo_scheduler
+from ai_builder_scheduler import AIBuilderScheduler
+from services import text_parsing
+from services.text_parsing import extraer_actividades, iterar_actividades
+
+FORMATOS = [
+    "Muro {n} — {d} días (después de Muro {p})",
+    "Losa {n}: {d} días",
+    "Columna {n} - {d} dias",
+    "Nota sin duración para el muro {n}",
+    "",
+]
+
+
+def _letras(i: int) -> str:
+    """Nombre solo con letras (los patrones no aceptan dígitos en los nombres)."""
+    letras = ''
+    while True:
+        i, resto = divmod(i, 26)
+        letras = chr(ord('a') + resto) + letras
+        if not i:
+            return letras
+
+
+def _especificacion(lineas: int) -> str:
+    return '\n'.join(FORMATOS[i % len(FORMATOS)].format(n=_letras(i), d=i % 9 + 1, p=_letras(max(i - 1, 0)))
+                     for i in range(lineas))
+
+
+@pytest.fixture
+def pool_siempre(monkeypatch):
+    """Reparte en procesos cualquier texto, por pequeño que sea."""
+    monkeypatch.setattr(text_parsing, 'UMBRAL_PROCESOS', 0)
+
+
+def test_lotes_en_procesos_igual_que_secuencial(pool_siempre):
+    texto = _especificacion(10000)
+
+    secuencial = extraer_actividades(texto, procesos=1)
+    por_lotes = list(iterar_actividades(texto, procesos=2, lineas_por_lote=700))
+
+    assert len(secuencial) == 6000
+    assert por_lotes == secuencial
+
+
+def test_scheduler_da_el_mismo_dataframe_con_y_sin_procesos(pool_siempre, monkeypatch):
+    monkeypatch.setattr(modulo_scheduler, 'GEMINI_AVAILABLE', False)
+    texto = _especificacion(10000)
+
+    serial = AIBuilderScheduler()
+    serial.procesos_texto = 1
+    paralelo = AIBuilderScheduler()
+    paralelo.procesos_texto = 2
+
+    pd.testing.assert_frame_equal(paralelo._procesar_texto_natural(texto),
+                                  serial._procesar_texto_natural(texto))
+
+
+def test_texto_sin_actividades(pool_siempre):
+    texto = _especificacion(0) + "\n\nSolo notas del proyecto\n"
+
+    assert extraer_actividades(texto, procesos=2) == extraer_actividades(texto, procesos=1) == []
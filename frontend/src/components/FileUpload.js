@@ -29,7 +29,9 @@ const FileUpload = ({ onUpload }) => {
     accept: {
       'text/csv': ['.csv'],
       'application/vnd.ms-excel': ['.xls'],
-      'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': ['.xlsx']
+      'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': ['.xlsx'],
+      'application/xml': ['.xml'],
+      'text/xml': ['.xml']
     },
     multiple: false,
     maxSize: 10 * 1024 * 1024 // 10MB
@@ -88,7 +90,7 @@ const FileUpload = ({ onUpload }) => {
               
               <div className="flex items-center space-x-2 text-sm text-gray-500">
                 <File className="h-4 w-4" />
-                <span>CSV, XLS, XLSX (máx. 10MB)</span>
+                <span>CSV, XLS, XLSX, XML de MS Project (máx. 10MB)</span>
               </div>
             </>
           )}
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Medición de la búsqueda de palabras clave
+=========================================
+
+Compara las dos rutas de `KeywordAutomaton.primeras_apariciones` según el
+tamaño del vocabulario:
+
+- subcadenas: un `str.find` por palabra clave (en C, pero V pasadas sobre el texto)
+- autómata: una sola pasada de Aho-Corasick (en Python, un paso por carácter)
+
+El cruce entre ambas fija UMBRAL_AUTOMATA en services/keyword_matcher.py. Las
+palabras del vocabulario sintético casi nunca aparecen en el texto, que es el
+peor caso para las subcadenas (cada búsqueda recorre el texto completo).
+
+Uso:
+    python medir_palabras_clave.py [palabras ...]
+"""
+
+import random
+import sys
+import time
+
+from backend.services import keyword_matcher
+from backend.services.keyword_matcher import KeywordAutomaton
+
+LETRAS = 'abcdefghijklmnopqrstuvwxyzáéíóúñ'
+REPETICIONES = 5
+
+
+def generar_palabra(azar: random.Random) -> str:
+    return ''.join(azar.choice(LETRAS) for _ in range(azar.randint(4, 12)))
+
+
+def cronometrar(automata: KeywordAutomaton, texto: str, umbral: int):
+    """Tiempo medio de `primeras_apariciones` con UMBRAL_AUTOMATA = umbral."""
+    anterior = keyword_matcher.UMBRAL_AUTOMATA
+    keyword_matcher.UMBRAL_AUTOMATA = umbral
+    try:
+        inicio = time.perf_counter()
+        for _ in range(REPETICIONES):
+            resultado = automata.primeras_apariciones(texto)
+        return resultado, (time.perf_counter() - inicio) / REPETICIONES
+    finally:
+        keyword_matcher.UMBRAL_AUTOMATA = anterior
+
+
+def medir(palabras: int, texto: str, azar: random.Random) -> None:
+    vocabulario = {f"tipo_{k}": [generar_palabra(azar) for _ in range(4)] for k in range(max(palabras // 4, 1))}
+    # Algunas palabras del vocabulario sí aparecen en el texto
+    texto = ' '.join([texto] + [azar.choice(lista) for lista in list(vocabulario.values())[:5]])
+    automata = KeywordAutomaton(vocabulario)
+
+    por_subcadenas, t_subcadenas = cronometrar(automata, texto, sys.maxsize)
+    por_automata, t_automata = cronometrar(automata, texto, 0)
+
+    elegida = 'autómata' if len(automata.palabras) >= keyword_matcher.UMBRAL_AUTOMATA else 'subcadenas'
+    print(f"{len(automata.palabras):>7} palabras | subcadenas: {t_subcadenas * 1e3:8.2f} ms"
+          f" | autómata: {t_automata * 1e3:8.2f} ms | ruta elegida: {elegida:<10}"
+          f" | iguales: {'sí' if por_subcadenas == por_automata else 'NO'}")
+
+
+if __name__ == "__main__":
+    tamanos = [int(v) for v in sys.argv[1:]] or [28, 64, 128, 256, 1000, 4000]
+    azar = random.Random(1)
+    texto = ' '.join(generar_palabra(azar) for _ in range(4000))
+
+    print("=" * 80)
+    print(f"PALABRAS CLAVE EN UN TEXTO DE {len(texto):,} CARACTERES (UMBRAL_AUTOMATA = "
+          f"{keyword_matcher.UMBRAL_AUTOMATA})")
+    print("=" * 80)
+    for v in tamanos:
+        medir(v, texto, azar)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Medición del parser de filas CSV con comillas anidadas
+======================================================
+
+Compara `AIBuilderScheduler._parsear_filas_csv_especiales` (csv.reader para las
+filas simples y un tokenizador compilado para el resto) con el parser anterior,
+que recorría cada fila carácter a carácter, y comprueba que ambos devuelven los
+mismos campos.
+
+Uso:
+    python medir_parser_csv.py [filas ...]
+"""
+
+import random
+import sys
+import time
+
+from ai_builder_scheduler import AIBuilderScheduler
+
+
+def parsear_fila_caracter_a_caracter(fila_str: str) -> list:
+    """Parser anterior: un recorrido carácter a carácter por fila."""
+    campos = []
+    actual = ""
+    dentro_comillas = False
+
+    i = 0
+    while i < len(fila_str):
+        char = fila_str[i]
+
+        if char == '"':
+            if i + 1 < len(fila_str) and fila_str[i + 1] == '"':
+                actual += '"'
+                i += 2
+                continue
+            else:
+                dentro_comillas = not dentro_comillas
+                i += 1
+                continue
+
+        if char == ',' and not dentro_comillas:
+            campos.append(actual.strip())
+            actual = ""
+            i += 1
+            continue
+
+        actual += char
+        i += 1
+
+    if actual:
+        campos.append(actual.strip())
+
+    return campos
+
+
+def generar_filas(n: int, semilla: int = 3) -> list:
+    """Filas como las del CSV de MS Project: la mayoría simples, algunas con comillas internas."""
+    azar = random.Random(semilla)
+    filas = []
+    for i in range(n):
+        nombre = f"Actividad {i}"
+        if azar.random() < 0.1:
+            nombre = f'Muro ""tipo {i % 7}"", eje B'
+        filas.append(f'"{i + 1}","{nombre}",{azar.randint(1, 30)} días,'
+                     f'"lun 3/02/25","vie 7/02/25","{max(i, 1)}FC+2 días",')
+    return filas
+
+
+def medir(n: int) -> None:
+    filas = generar_filas(n)
+    scheduler = AIBuilderScheduler()
+
+    inicio = time.perf_counter()
+    anteriores = [parsear_fila_caracter_a_caracter(fila) for fila in filas]
+    t_anterior = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    actuales = scheduler._parsear_filas_csv_especiales(filas)
+    t_actual = time.perf_counter() - inicio
+
+    iguales = sum(a == b for a, b in zip(anteriores, actuales))
+    print(f"{n:>8} filas | carácter a carácter: {t_anterior:7.3f} s | actual: {t_actual:7.3f} s"
+          f" | x{t_anterior / max(t_actual, 1e-9):5.1f} | filas iguales: {iguales}/{n}")
+
+
+if __name__ == "__main__":
+    tamanos = [int(n) for n in sys.argv[1:]] or [1000, 10000, 100000]
+    print("=" * 80)
+    print("PARSER DE FILAS CSV CON COMILLAS ANIDADAS")
+    print("=" * 80)
+    for n in tamanos:
+        medir(n)
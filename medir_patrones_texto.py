@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Medición de los patrones de líneas de actividad
+===============================================
+
+Compara `services.text_parsing.extraer_lote` (patrones compilados una vez,
+prefiltro "<número> día" y solo los patrones cuyos signos están en la línea)
+con el bucle anterior, que probaba los nueve patrones con `re.search` sobre
+cada línea, y comprueba que ambos extraen las mismas actividades.
+
+La especificación sintética (10 000 líneas por defecto) mezcla los nueve
+formatos con líneas que el prefiltro descarta sin probar ningún patrón
+(títulos, notas y párrafos sin duración); sus tiempos se informan aparte.
+
+Uso:
+    python medir_patrones_texto.py [líneas ...]
+"""
+
+import random
+import re
+import sys
+import time
+
+from backend.services.text_parsing import _PREFILTRO_ACTIVIDAD, extraer_lote
+
+# Patrones del bucle anterior, en su orden de prioridad
+PATRONES_ANTERIORES = [
+    r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?\s*\(despu[eé]s de\s+(?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+)\)',
+    r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?\s+despu[eé]s de\s+(?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+)',
+    r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*:\s*(?P<duracion>\d+)\s*d[ií]as?\s+despu[eé]s de\s+(?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+)',
+    r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*:\s*(?P<duracion>\d+)\s*d[ií]as?\s*\((?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+)\)',
+    r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?\s*\((?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+)\)',
+    r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?\s*:\s*(?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+)',
+    r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*:\s*(?P<duracion>\d+)\s*d[ií]as?\s+(?P<predecesora>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)(?:\s|$)',
+    r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*[-–—]\s*(?P<duracion>\d+)\s*d[ií]as?',
+    r'(\d+\.\s*)?(?P<actividad>[A-Za-zÁÉÍÓÚáéíóúñÑ\s]+?)\s*:\s*(?P<duracion>\d+)\s*d[ií]as?',
+]
+
+# Líneas con actividad, una por formato
+FORMATOS = [
+    "{n}. {a} — {d} días (después de {p})",
+    "{a} - {d} días después de {p}",
+    "{a}: {d} dias después de {p}",
+    "{a}: {d} días ({p})",
+    "{a} – {d} días ({p})",
+    "{a} — {d} días: {p}",
+    "{a}: {d} días {p}",
+    "{a} - {d} día",
+    "{a}: {d} días",
+]
+
+# Líneas que el prefiltro descarta (no tienen "<número> día")
+SIN_DURACION = [
+    "PROYECTO DE VIVIENDA UNIFAMILIAR EN DOS NIVELES",
+    "Nota: la {a} se coordina con la supervisión de obra y el proveedor",
+    "El contratista entregará planos de taller de la {a} antes de iniciar los trabajos de la {p}",
+    "Etapa {n} - {a}",
+]
+
+ACTIVIDADES = ['Excavación', 'Cimentación', 'Muros de carga', 'Losa de entrepiso', 'Instalaciones eléctricas',
+               'Plomería', 'Techos', 'Acabados', 'Pintura exterior', 'Revestimientos']
+
+
+def extraer_actividad_anterior(linea: str):
+    """Bucle anterior: los nueve patrones con re.search, en orden de prioridad."""
+    for patron in PATRONES_ANTERIORES:
+        match = re.search(patron, linea, re.IGNORECASE)
+        if match:
+            predecesora = match.group('predecesora').strip() if 'predecesora' in match.groupdict() and match.group('predecesora') else ''
+            return {
+                'Actividad': match.group('actividad').strip(),
+                'Duración': int(match.group('duracion')),
+                'Predecesoras': predecesora
+            }
+    return None
+
+
+def extraer_lote_anterior(lineas):
+    actividades = []
+    for linea in lineas:
+        linea = linea.strip()
+        if linea:
+            actividad = extraer_actividad_anterior(linea)
+            if actividad:
+                actividades.append(actividad)
+    return actividades
+
+
+def generar_lineas(n: int, semilla: int = 5) -> list:
+    """Mitad de líneas con actividad (los nueve formatos) y mitad sin duración."""
+    azar = random.Random(semilla)
+    lineas = []
+    for i in range(n):
+        plantillas = FORMATOS if i % 2 == 0 else SIN_DURACION
+        a, p = azar.sample(ACTIVIDADES, 2)
+        lineas.append(azar.choice(plantillas).format(n=i + 1, a=a, p=p, d=azar.randint(1, 30)))
+    return lineas
+
+
+def cronometrar(funcion, lineas):
+    inicio = time.perf_counter()
+    resultado = funcion(lineas)
+    return resultado, time.perf_counter() - inicio
+
+
+def medir(n: int) -> None:
+    lineas = generar_lineas(n)
+    descartadas = [linea for linea in lineas if not _PREFILTRO_ACTIVIDAD.search(linea)]
+
+    anteriores, t_anterior = cronometrar(extraer_lote_anterior, lineas)
+    actuales, t_actual = cronometrar(extraer_lote, lineas)
+    _, t_anterior_descartadas = cronometrar(extraer_lote_anterior, descartadas)
+    _, t_actual_descartadas = cronometrar(extraer_lote, descartadas)
+
+    print(f"{n:>7} líneas | anterior: {t_anterior:7.3f} s | actual: {t_actual:7.3f} s"
+          f" | x{t_anterior / max(t_actual, 1e-9):5.1f} | {len(actuales)} actividades,"
+          f" iguales: {'sí' if anteriores == actuales else 'NO'}")
+    print(f"{'':>7}   de ellas {len(descartadas)} sin duración (prefiltro) | anterior:"
+          f" {t_anterior_descartadas:7.3f} s | actual: {t_actual_descartadas:7.3f} s")
+
+
+if __name__ == "__main__":
+    tamanos = [int(n) for n in sys.argv[1:]] or [10000]
+    print("=" * 80)
+    print("PATRONES DE LÍNEAS DE ACTIVIDAD: BUCLE ANTERIOR VS. BANCO COMPILADO")
+    print("=" * 80)
+    for n in tamanos:
+        medir(n)
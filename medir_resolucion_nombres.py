@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Medición de la resolución de predecesoras por nombre
+====================================================
+
+Compara el índice de nombres (`services.name_index.NameIndex`) con la búsqueda
+lineal que recorre todas las actividades por cada referencia, sobre cronogramas
+sintéticos de V actividades con E referencias (exactas, con otra capitalización
+o tildes y con errores de tipeo).
+
+Además del tiempo se cuentan las comparaciones de nombres: la búsqueda lineal
+hace del orden de E·V, el índice resuelve las referencias exactas y normalizadas
+con una consulta a un diccionario cada una (O(E)) y solo puntúa un número acotado
+de candidatos para las aproximadas.
+
+Uso:
+    python medir_resolucion_nombres.py [V ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from services.name_index import (  # noqa: E402
+    CANDIDATOS_A_PUNTUAR, UMBRAL_APROXIMADO, NameIndex, normalizar_nombre, trigramas
+)
+
+PALABRAS = ['Excavación', 'Cimentación', 'Muro', 'Losa', 'Columna', 'Instalación',
+            'Eléctrica', 'Hidráulica', 'Acabados', 'Pintura', 'Nivel', 'Torre', 'Bloque']
+
+
+def generar_nombres(v: int, semilla: int = 7) -> list:
+    """Nombres únicos de actividades con palabras del dominio y un número."""
+    azar = random.Random(semilla)
+    return [f"{azar.choice(PALABRAS)} {azar.choice(PALABRAS)} {i}" for i in range(v)]
+
+
+def generar_referencias(nombres: list, semilla: int = 11) -> list:
+    """Una referencia por actividad: exacta, normalizable o con un error de tipeo."""
+    azar = random.Random(semilla)
+    referencias = []
+    for nombre in nombres:
+        tipo = azar.random()
+        if tipo < 0.6:
+            referencias.append(nombre)
+        elif tipo < 0.9:
+            referencias.append(f"  {nombre.upper()} ")
+        else:
+            k = azar.randrange(len(nombre) - 1)
+            referencias.append(nombre[:k] + nombre[k + 1] + nombre[k] + nombre[k + 2:])
+    return referencias
+
+
+def resolver_lineal(nombres: list, referencias: list):
+    """Resuelve cada referencia recorriendo todos los nombres (O(E·V))."""
+    normalizados = [normalizar_nombre(n) for n in nombres]
+    gramas = None
+    comparaciones = 0
+    resultado = []
+    for referencia in referencias:
+        buscado = normalizar_nombre(referencia.strip())
+        encontrado = None
+        for i, normalizado in enumerate(normalizados):
+            comparaciones += 1
+            if normalizado == buscado:
+                encontrado = i
+                break
+        if encontrado is None:
+            if gramas is None:
+                gramas = [trigramas(n) for n in normalizados]
+            propios = trigramas(buscado)
+            puntajes = []
+            for i, otros in enumerate(gramas):
+                comparaciones += 1
+                puntajes.append((-2 * len(propios & otros) / (len(propios) + len(otros)), i))
+            puntajes.sort()
+            if -puntajes[0][0] >= UMBRAL_APROXIMADO and (len(puntajes) == 1 or puntajes[1][0] > puntajes[0][0]):
+                encontrado = puntajes[0][1]
+        resultado.append(encontrado)
+    return resultado, comparaciones
+
+
+def resolver_indice(nombres: list, referencias: list):
+    """Resuelve cada referencia con NameIndex contando los nombres que puntúa."""
+    indice = NameIndex(nombres)
+    resultado = []
+    comparaciones = 0
+    for referencia in referencias:
+        i, tipo = indice.resolver_con_tipo(referencia)
+        # Consulta a diccionario, o como mucho CANDIDATOS_A_PUNTUAR nombres puntuados
+        comparaciones += 1 if tipo != 'aproximada' and i is not None else CANDIDATOS_A_PUNTUAR
+        resultado.append(i)
+    return resultado, comparaciones
+
+
+def medir(v: int) -> None:
+    nombres = generar_nombres(v)
+    referencias = generar_referencias(nombres)
+    normalizar_nombre.cache_clear()
+
+    inicio = time.perf_counter()
+    lineal, comparaciones_lineal = resolver_lineal(nombres, referencias)
+    t_lineal = time.perf_counter() - inicio
+
+    normalizar_nombre.cache_clear()
+    inicio = time.perf_counter()
+    indexado, comparaciones_indice = resolver_indice(nombres, referencias)
+    t_indice = time.perf_counter() - inicio
+
+    iguales = sum(a == b for a, b in zip(lineal, indexado))
+    print(f"V=E={v:>6} | lineal: {t_lineal:8.3f} s, {comparaciones_lineal:>12,} comparaciones"
+          f" | índice: {t_indice:7.3f} s, <= {comparaciones_indice:>9,}"
+          f" | x{t_lineal / max(t_indice, 1e-9):6.1f} | mismas resoluciones: {iguales}/{v}")
+
+
+if __name__ == "__main__":
+    tamanos = [int(v) for v in sys.argv[1:]] or [500, 2000, 5000]
+    print("=" * 80)
+    print("RESOLUCIÓN DE PREDECESORAS POR NOMBRE")
+    print("=" * 80)
+    for v in tamanos:
+        medir(v)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Medición de la extracción de actividades de texto por lotes
+===========================================================
+
+Mide `services.text_parsing` sobre especificaciones sintéticas (10 000 líneas
+por defecto) en tres modos y comprueba que los tres extraen las mismas
+actividades en el mismo orden:
+
+- secuencial: todas las líneas en el proceso actual (procesos=1)
+- por defecto: la ruta que elige el módulo según UMBRAL_PROCESOS
+- pool: lotes de LINEAS_POR_LOTE líneas en un pool de procesos, forzado aunque
+  el texto no llegue al umbral
+
+El pool solo compensa con varias CPU y textos grandes; por debajo de
+UMBRAL_PROCESOS el costo de arrancar los procesos supera al del análisis.
+
+Uso:
+    python medir_texto_por_lotes.py [líneas ...] [--procesos N]
+"""
+
+import os
+import sys
+import time
+
+from backend.services import text_parsing
+
+FORMATOS = [
+    "Muro {n} — {d} días (después de Muro {p})",
+    "Losa {n}: {d} días",
+    "Columna {n} - {d} dias",
+    "Nota sin duración para el muro {n}",
+    "",
+]
+
+
+def letras(i: int) -> str:
+    """Nombre solo con letras (los patrones no aceptan dígitos en los nombres)."""
+    resultado = ''
+    while True:
+        i, resto = divmod(i, 26)
+        resultado = chr(ord('a') + resto) + resultado
+        if not i:
+            return resultado
+
+
+def generar_especificacion(lineas: int) -> str:
+    return '\n'.join(FORMATOS[i % len(FORMATOS)].format(n=letras(i), d=i % 9 + 1, p=letras(max(i - 1, 0)))
+                     for i in range(lineas))
+
+
+def cronometrar(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - inicio
+
+
+def medir(lineas: int, procesos: int) -> None:
+    texto = generar_especificacion(lineas)
+
+    secuencial, t_secuencial = cronometrar(lambda: text_parsing.extraer_actividades(texto, 1))
+    por_defecto, t_defecto = cronometrar(lambda: text_parsing.extraer_actividades(texto, procesos))
+
+    umbral = text_parsing.UMBRAL_PROCESOS
+    text_parsing.UMBRAL_PROCESOS = 0
+    try:
+        pool, t_pool = cronometrar(lambda: text_parsing.extraer_actividades(texto, procesos))
+    finally:
+        text_parsing.UMBRAL_PROCESOS = umbral
+
+    iguales = secuencial == por_defecto == pool
+    print(f"{lineas:>9} líneas ({len(texto) / 1e6:5.1f} MB) | secuencial: {t_secuencial:7.3f} s"
+          f" | por defecto: {t_defecto:7.3f} s | pool de {procesos}: {t_pool:7.3f} s"
+          f" | {len(secuencial)} actividades, iguales: {'sí' if iguales else 'NO'}")
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    procesos = os.cpu_count() or 1
+    if '--procesos' in argumentos:
+        k = argumentos.index('--procesos')
+        procesos = int(argumentos[k + 1])
+        del argumentos[k:k + 2]
+    tamanos = [int(n) for n in argumentos] or [10000, 100000]
+
+    print("=" * 80)
+    print(f"EXTRACCIÓN DE ACTIVIDADES DE TEXTO ({os.cpu_count()} CPU)")
+    print("=" * 80)
+    for n in tamanos:
+        medir(n, procesos)